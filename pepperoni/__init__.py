@@ -46,7 +46,8 @@ def logger(name=None, **kwargs):
     name : str
         The name of the logger that must be created or returned.
     **kwargs
-        The keyword arguments that used for logger configuration.
+        The keyword arguments that used for logger configuration. Argument
+        `weak` is used only when the new logger is created.
 
     Returns
     -------
@@ -54,12 +55,13 @@ def logger(name=None, **kwargs):
         The `Logger` object.
     """
     name = name or py_file
+    weak = kwargs.pop('weak', False)
     if all_loggers.get(name) is not None:
         if len(kwargs) > 0:
             all_loggers[name].configure(**kwargs)
         return all_loggers[name]
     else:
-        return Logger(name=name, **kwargs)
+        return Logger(name=name, weak=weak, **kwargs)
 
 
 __logger = logger(file=False, console=True, debug=True)
@@ -0,0 +1,189 @@
+"""Bridge between built-in logging module and pepperoni."""
+
+import logging
+import sys
+import traceback
+
+from .record import Record
+
+
+# Names of the record parameters that can not be forms from `extra`.
+reserved = frozenset(('logger', 'rectype', 'message', 'error', 'format',
+                      'error_format', 'origin', 'timestamp'))
+
+
+def to_rectype(level):
+    """Get pepperoni record type for the built-in logging level.
+
+    Parameters
+    ----------
+    level : int
+        The level of built-in logging e.g. `logging.INFO`.
+
+    Returns
+    -------
+    rectype : str
+        The key of the record type.
+    """
+    if level >= logging.CRITICAL:
+        return 'critical'
+    elif level >= logging.ERROR:
+        return 'error'
+    elif level >= logging.WARNING:
+        return 'warning'
+    elif level >= logging.INFO:
+        return 'info'
+    else:
+        return 'debug'
+
+
+def escape(message):
+    """Protect the message from the formatting with record forms."""
+    return message.replace('{', '{{').replace('}', '}}')
+
+
+class Handler(logging.Handler):
+    """Handler that sends built-in logging records to pepperoni logger.
+
+    Records of third-party libraries are converted directly to pepperoni
+    records and written to the outputs of the logger. Information already
+    captured by built-in logging like path, function and thread names is
+    reused, so frames are not walked for the second time. The name of the
+    built-in logger is used as the `logname` form and the time when the
+    record was created is kept.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+    level : int, optional
+        The minimum level of built-in logging records that are handled.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object which outputs are used.
+    """
+
+    def __init__(self, logger, level=logging.NOTSET):
+        super().__init__(level=level)
+        self.logger = logger
+        pass
+
+    def emit(self, record):
+        """Convert built-in logging record and write it to the outputs.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The record that must be written.
+        """
+        try:
+            rectype = to_rectype(record.levelno)
+            if self.logger.filters.get(rectype, True) is True:
+                message = record.getMessage()
+                if record.exc_info:
+                    exception = traceback.format_exception(*record.exc_info)
+                    message = f'{message}\n{"".join(exception)}'
+                origin = (record.pathname, record.funcName, record.threadName)
+                timestamp = int(record.created * 1000000000)
+                new = Record(self.logger, rectype, escape(message),
+                             origin=origin, timestamp=timestamp)
+                new.logname = record.name
+                self.logger.write(new)
+        except Exception:
+            self.handleError(record)
+        pass
+
+
+class Adapter():
+    """Interface of built-in logging logger over pepperoni logger.
+
+    Can be passed to the code which expects `logging.Logger` object, so all
+    its messages come to pepperoni outputs. Note that error methods of the
+    adapter only write records and never break the execution or count the
+    errors of the logger. Items of `extra` are passed to the record as
+    keyword arguments, except the ones named as the record parameters. Like
+    in built-in logging the message is not formatted with them.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` object to which messages are sent.
+    """
+
+    def __init__(self, logger):
+        self.logger = logger
+        pass
+
+    def __repr__(self):
+        """Get this Adapter string representation."""
+        return f'<Adapter "{self.logger.name}">'
+
+    @property
+    def name(self):
+        """Get the name of the logger."""
+        return self.logger.name
+
+    def isEnabledFor(self, level):
+        """Check whether records of the level are not filtered."""
+        return self.logger.filters.get(to_rectype(level), True)
+
+    def log(self, level, msg, *args, exc_info=None, extra=None, **kwargs):
+        """Send record with the built-in logging level to the logger."""
+        rectype = to_rectype(level)
+        if self.logger.filters.get(rectype, True) is True:
+            message = msg % args if args else str(msg)
+            if exc_info:
+                if isinstance(exc_info, BaseException) is True:
+                    exc_info = (type(exc_info), exc_info,
+                                exc_info.__traceback__)
+                elif isinstance(exc_info, tuple) is False:
+                    exc_info = sys.exc_info()
+                exception = traceback.format_exception(*exc_info)
+                message = f'{message}\n{"".join(exception)}'
+            forms = {}
+            if isinstance(extra, dict) is True:
+                forms = {key: value for key, value in extra.items()
+                         if key not in reserved}
+            self.logger.record(rectype, escape(message), **forms)
+        pass
+
+    def debug(self, msg, *args, **kwargs):
+        """Send DEBUG record to the logger."""
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+        pass
+
+    def info(self, msg, *args, **kwargs):
+        """Send INFO record to the logger."""
+        self.log(logging.INFO, msg, *args, **kwargs)
+        pass
+
+    def warning(self, msg, *args, **kwargs):
+        """Send WARNING record to the logger."""
+        self.log(logging.WARNING, msg, *args, **kwargs)
+        pass
+
+    warn = warning
+
+    def error(self, msg, *args, **kwargs):
+        """Send ERROR record to the logger."""
+        self.log(logging.ERROR, msg, *args, **kwargs)
+        pass
+
+    def exception(self, msg, *args, exc_info=True, **kwargs):
+        """Send ERROR record with the current exception to the logger."""
+        self.log(logging.ERROR, msg, *args, exc_info=exc_info, **kwargs)
+        pass
+
+    def critical(self, msg, *args, **kwargs):
+        """Send CRITICAL record to the logger."""
+        self.log(logging.CRITICAL, msg, *args, **kwargs)
+        pass
+
+    fatal = critical
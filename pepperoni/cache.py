@@ -1,3 +1,81 @@
 """Cache for global module-level variables."""
 
-all_loggers = {}
+import collections.abc
+import contextvars
+import types
+import weakref
+
+
+class Registry(collections.abc.MutableMapping):
+    """Registry of loggers by their names.
+
+    Loggers are kept by strong references by default, so they can be taken
+    by name at any time. Ephemeral loggers, e.g. created per job, can be
+    kept by weak references, so they are freed when application does not
+    use them anymore.
+    """
+
+    def __init__(self):
+        self._strong = {}
+        self._weak = weakref.WeakValueDictionary()
+        pass
+
+    def __getitem__(self, name):
+        """Get logger by name."""
+        try:
+            return self._strong[name]
+        except KeyError:
+            return self._weak[name]
+
+    def __setitem__(self, name, logger):
+        """Keep logger by strong reference."""
+        self._weak.pop(name, None)
+        self._strong[name] = logger
+        pass
+
+    def __delitem__(self, name):
+        """Forget logger."""
+        if self._strong.pop(name, None) is None:
+            del self._weak[name]
+        pass
+
+    def __iter__(self):
+        """Iterate over the names of live loggers."""
+        return iter(list(self._strong) + list(self._weak))
+
+    def __len__(self):
+        """Get number of live loggers."""
+        return len(self._strong) + len(self._weak)
+
+    def values(self):
+        """Get list of live loggers."""
+        return list(self._strong.values()) + list(self._weak.values())
+
+    def register(self, logger, weak=False):
+        """Add logger to the registry.
+
+        Parameters
+        ----------
+        logger : Logger
+            The logger that must be added.
+        weak : bool, optional
+            The argument is used to keep logger by weak reference.
+        """
+        if weak is True:
+            self._strong.pop(logger.name, None)
+            self._weak[logger.name] = logger
+        else:
+            self[logger.name] = logger
+        pass
+
+
+all_loggers = Registry()
+
+# Fields bound to the current execution context. Value is always an immutable
+# mapping, so it is shared by records without copying.
+context = contextvars.ContextVar('context',
+                                default=types.MappingProxyType({}))
+
+# Names of all fields that were ever bound. Record templates can refer to
+# them even in the contexts where they are not bound.
+bound = set()
@@ -0,0 +1,149 @@
+"""Decoder of the binary logging files.
+
+Usage: python -m pepperoni.decode [--format FORMAT] [--json] PATH
+"""
+
+import argparse
+import json
+import struct
+import sys
+
+from .formatter import Formatter
+from .record import clock
+from .utils import read_varint, unzigzag
+
+
+magic = b'PPBIN001'
+
+
+class Forms(dict):
+    """Forms of the decoded record, unknown forms are empty strings."""
+
+    def __missing__(self, key):
+        """Get empty string for unknown form."""
+        return ''
+
+
+def decode(path):
+    """Read records from the binary logging file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the binary file.
+
+    Yields
+    ------
+    record : dict
+        Record with the forms: timestamp, isodate, msdate, utcdate, logname,
+        rectype, flname, objname, thread, message and all arguments. Reading
+        stops at the last complete record if the file is cut e.g. after the
+        crash.
+    """
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    strings = {}
+    timestamp = 0
+    position = 0
+    while position < len(data):
+        if data.startswith(magic, position):
+            # New logging session starts with empty strings table.
+            strings = {}
+            timestamp = 0
+            position += len(magic)
+            continue
+        # Entry cut by the crash is the end of the file.
+        try:
+            tag = data[position:position+1]
+            position += 1
+            if tag == b'S':
+                id, position = read_varint(data, position)
+                length, position = read_varint(data, position)
+                position += length
+                if position > len(data):
+                    return
+                string = data[position-length:position]
+                strings[id] = string.decode('utf-8')
+            elif tag == b'R':
+                delta, position = read_varint(data, position)
+                timestamp += unzigzag(delta)
+                ids = []
+                for i in range(7):
+                    id, position = read_varint(data, position)
+                    ids.append(id)
+                (logname, rectype, template, flname, objname, thread,
+                 count) = ids
+                arguments = {}
+                for i in range(count):
+                    name, position = read_varint(data, position)
+                    code = data[position:position+1]
+                    position += 1
+                    if code == b'n':
+                        value = None
+                    elif code == b'b':
+                        value = data[position] == 1
+                        position += 1
+                    elif code == b'i':
+                        value, position = read_varint(data, position)
+                        value = unzigzag(value)
+                    elif code == b'f':
+                        value, = struct.unpack_from('<d', data, position)
+                        position += 8
+                    else:
+                        length, position = read_varint(data, position)
+                        value = data[position:position+length]
+                        position += length
+                        value = value.decode('utf-8')
+                    arguments[strings[name]] = value
+                forms = {'timestamp': timestamp,
+                         'isodate': clock.isodate(timestamp),
+                         'msdate': clock.msdate(timestamp),
+                         'utcdate': clock.utcdate(timestamp),
+                         'logname': strings[logname],
+                         'rectype': strings[rectype],
+                         'flname': strings[flname],
+                         'objname': strings[objname],
+                         'thread': strings[thread]}
+                if position > len(data):
+                    return
+                template = strings[template]
+                try:
+                    message = template.format_map({**forms, **arguments})
+                except (KeyError, IndexError, ValueError):
+                    message = template
+                yield {**arguments, **forms, 'message': message}
+            else:
+                raise ValueError(f'unknown entry at position {position-1}')
+        except (IndexError, KeyError, UnicodeDecodeError, struct.error):
+            return
+
+
+def main(args=None):
+    """Print records of the binary logging file as text or JSON."""
+    parser = argparse.ArgumentParser(prog='python -m pepperoni.decode',
+                                     description='Decode binary log file.')
+    parser.add_argument('path', help='path to the binary file')
+    parser.add_argument('--format', help='record template')
+    parser.add_argument('--json', action='store_true',
+                        help='print records as JSON lines')
+    args = parser.parse_args(args)
+    formatter = Formatter()
+    if args.format is not None:
+        # Template from command line can contain escaped tabs and newlines.
+        formatter.record = args.format.encode().decode('unicode_escape')
+    try:
+        for item in decode(args.path):
+            if args.json is True:
+                line = json.dumps(item, default=str) + '\n'
+            else:
+                forms = Forms(item, div=formatter.div)
+                line = formatter.record.format_map(forms)
+            sys.stdout.write(line)
+    except BrokenPipeError:
+        # Output was closed by the reader e.g. head.
+        sys.stderr.close()
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 """Logging header."""
 
+import threading
+import time
+
 from .sysinfo import Descriptors
 
 
@@ -16,6 +19,13 @@ class Header():
     can be presented both as functions returning some sting and as a regular
     string.
 
+    Lines of static variables are evaluated only once and then reused. Only
+    variables listed in `dynamic` are evaluated each time the header is
+    created. Static variables are resolved concurrently, so slow ones like
+    `ip` do not stall the logging longer than `timeout` seconds. Variable that
+    was not resolved in time is shown as unknown until its evaluation is
+    finished in the background, so the timeout is waited only once.
+
     Parameters
     ----------
     logger : Logger
@@ -38,6 +48,10 @@ class Header():
         Symbolic block used for borders.
     items : dict
         Dictionary with header variables.
+    dynamic : set
+        Names of the variables that must be evaluated each time.
+    timeout : int or float
+        Maximum number of seconds to wait for static variables.
     """
 
     def __init__(self, logger, *args, **kwargs):
@@ -61,6 +75,16 @@ class Header():
                       'script': lambda: desc.script,
                       'pip': lambda: desc.pip,
                       'locdate': lambda: desc.locdate}
+        self.dynamic = {'application', 'description', 'version', 'pid',
+                        'locdate'}
+        self.timeout = 2
+        self._values = {}
+        self._threads = {}
+        self._late = set()
+        self._lines = {}
+        self._frame = None
+        self._lengths = None
+        self._borders = None
         if args or kwargs:
             self.include(**kwargs)
             self.exclude(*args)
@@ -84,38 +108,56 @@ class Header():
         """
         # Change flag to determine that header is already used in logger.
         self._used = True
-        # Calculate all necessary lengths.
-        ln_out, ln_in, ln_name, ln_value = self._calculate_lengths()
-        lines = []
-
-        # Format of the one line of header.
-        frame_format = '{div}{content:{filler}<{ln_in}}{div}\n'
-        all = dict(div=self.div, ln_in=ln_in)
-
-        # Get basic top two lines of the header.
-        top = frame_format.format(content='', filler=self.div, **all)
-        top += frame_format.format(content='', filler='', **all)
-        lines.append(top)
+        # Lengths and borders are calculated again only when the items or
+        # the styling are changed.
+        frame = (self.length, self.div, tuple(self.items.keys()))
+        if frame != self._frame:
+            self._lines.clear()
+            self._frame = frame
+            self._lengths = self._calculate_lengths()
+            self._borders = self._render_borders()
+        self._resolve()
+        top, bottom = self._borders
+        lines = [top]
 
         # Get all lines with the variables.
-        content_format = '{name:>{ln_name}}: {value}'
         for d_name, d_value in self.items.items():
-            name = d_name.upper()
-            value = d_value() if callable(d_value) is True else d_value
-            content = content_format.format(name=name, ln_name=ln_name,
-                                            value=value)
-            frame = frame_format.format(content=content, filler='', **all)
-            lines.append(frame)
-
-        # Get buttom two lines of the header.
-        bottom = frame_format.format(content='', filler='', **all)
-        bottom += frame_format.format(content='', filler=self.div, **all)
-        lines.append(bottom)
+            line = self._lines.get(d_name)
+            if line is None:
+                # Only the line of the resolved value is cached, so the line
+                # of the late value is never kept.
+                resolved = d_name in self._values
+                if d_name in self.dynamic:
+                    value = self._evaluate(d_value)
+                else:
+                    value = self._values.get(d_name, 'unknown')
+                line = self._render_line(d_name, value)
+                if d_name not in self.dynamic and resolved is True:
+                    self._lines[d_name] = line
+            lines.append(line)
 
+        lines.append(bottom)
         header = ''.join(lines)
         return header
 
-    def include(self, pos='start', **kwargs):
+    def refresh(self):
+        """Forget all evaluated variables so they are evaluated again."""
+        self._values.clear()
+        self._late.clear()
+        self._lines.clear()
+        pass
+
+    def fork(self):
+        """Forget the threads of the parent process after fork.
+
+        Threads evaluating the variables do not exist in the child process,
+        so the variables they did not evaluate are evaluated again by the
+        new threads.
+        """
+        self._threads = {}
+        pass
+
+    def include(self, pos='start', dynamic=False, **kwargs):
         """Add variables to the header.
 
         Parameters
@@ -124,9 +166,19 @@ class Header():
             The argument used for position to which new variables will be
             added.
             Can be `start` or `end`.
+        dynamic : bool, optional
+            The argument used to mark new variables as dynamic, so they are
+            evaluated each time the header is created.
         **kwargs
             The keyword arguments used to include variables to header.
         """
+        for name in kwargs.keys():
+            self._values.pop(name, None)
+            self._lines.pop(name, None)
+            if dynamic is True:
+                self.dynamic.add(name)
+            else:
+                self.dynamic.discard(name)
         if pos == 'start':
             self.items = {**kwargs, **self.items}
         elif pos == 'end':
@@ -144,6 +196,8 @@ class Header():
         """
         for arg in args:
             del self.items[arg]
+            self._values.pop(arg, None)
+            self._lines.pop(arg, None)
         pass
 
     def _calculate_lengths(self):
@@ -165,3 +219,62 @@ class Header():
         ln_name = max([len(key) for key in self.items.keys()]) + 2
         ln_value = ln_in - ln_name
         return (ln_out, ln_in, ln_name, ln_value)
+
+    def _evaluate(self, item):
+        # Get value of the variable. Header must never break the logging so
+        # failed variable is shown as unknown.
+        try:
+            return item() if callable(item) is True else item
+        except Exception:
+            return 'unknown'
+
+    def _resolve(self):
+        # Evaluate all static variables that are not evaluated yet. Each
+        # callable is run in its own daemon thread so slow variables are
+        # evaluated concurrently and can not delay the application exit.
+        for name, item in self.items.items():
+            if (name in self.dynamic or name in self._values
+               or name in self._threads):
+                continue
+            if callable(item) is False:
+                self._values[name] = item
+                continue
+
+            def target(name=name, item=item):
+                self._values[name] = self._evaluate(item)
+                self._lines.pop(name, None)
+                self._threads.pop(name, None)
+            thread = threading.Thread(target=target, daemon=True,
+                                      name=f'header-{name}')
+            self._threads[name] = thread
+            thread.start()
+        deadline = time.monotonic() + self.timeout
+        for name, thread in list(self._threads.items()):
+            if name in self._values or name in self._late:
+                continue
+            thread.join(max(deadline - time.monotonic(), 0))
+            # Timeout is waited only once, late value is shown when it is
+            # ready.
+            if thread.is_alive() is True:
+                self._late.add(name)
+        pass
+
+    def _render_line(self, name, value):
+        # Format one line with the variable.
+        ln_out, ln_in, ln_name, ln_value = self._lengths
+        content = '{name:>{ln_name}}: {value}'.format(
+            name=name.upper(), ln_name=ln_name, value=value)
+        return self._render_frame(content, '', ln_in)
+
+    def _render_borders(self):
+        # Format top and bottom lines of the header.
+        ln_out, ln_in, ln_name, ln_value = self._lengths
+        border = self._render_frame('', self.div, ln_in)
+        blank = self._render_frame('', '', ln_in)
+        return (border + blank, blank + border)
+
+    def _render_frame(self, content, filler, ln_in):
+        # Format of the one line of header.
+        frame_format = '{div}{content:{filler}<{ln_in}}{div}\n'
+        return frame_format.format(div=self.div, content=content,
+                                   filler=filler, ln_in=ln_in)
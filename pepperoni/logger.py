@@ -1,16 +1,29 @@
 """Logging tools."""
 
 import atexit
+import contextlib
+import contextvars
+import copy
 import datetime as dt
+import functools
+import logging
 import os
 import sys
+import threading
+import time
 import traceback
+import types
 
-from .cache import all_loggers
+from .bridge import Adapter, Handler
+from .cache import all_loggers, bound, context
 from .formatter import Formatter
 from .header import Header
-from .output import Root
+from .output import Root, handles, pidpath
+from .profiler import Profiler, Sampler, from_environment
 from .record import Record
+from .sysinfo import Monitor, resources
+from .timing import Timer, Timing, timed
+from .watcher import Watcher
 
 
 class Logger():
@@ -47,6 +60,10 @@ class Logger():
         The argument is used to open or close output `html`.
     table : bool, optional
         The argument is used to open or close output `table`.
+    recorder : bool, optional
+        The argument is used to open or close output `recorder`.
+    binary : bool, optional
+        The argument is used to open or close output `binary`.
     directory : str, optional
         The argument is used to set logging file folder.
     filename : str, optional
@@ -89,11 +106,34 @@ class Logger():
     maxerrors : int or bool, optional
         The argument is used to define maximun number of errors. The default
         is False which means it is disabled.
+    timing : int or bool, optional
+        The argument is used to define the interval in seconds for summary
+        records of timers. The default is False which means that summary is
+        written only at exit.
+    maxmessage : int or bool, optional
+        The argument is used to define maximum number of characters in the
+        message. Longer messages are truncated and messages that are not
+        strings are rendered with the bounded representation, so huge objects
+        are never converted to strings as a whole. True means the limit of
+        `messagelength` characters. The default is False which means it is
+        disabled.
+    parent : Logger, optional
+        The argument is used to create a child logger that shares outputs,
+        connections, formatter and header of the parent logger. All other
+        configuration arguments are ignored in that case, use `configure()`
+        to customize the child.
+    weak : bool, optional
+        The argument is used to keep the logger in the registry by weak
+        reference, so it is freed when application does not use it anymore.
+        Useful for ephemeral loggers e.g. created per job. Loggers with
+        background threads or network outputs must be disposed explicitly.
 
     Attributes
     ----------
     name : str
         Name of the logger.
+    parent : Logger
+        The parent logger if this one is a child, `None` otherwise.
     app : str
         Name of the application that we are logging.
     desc : str
@@ -150,19 +190,34 @@ class Logger():
         etc.
     header : pepperoni.header.Header
         The header that can be printed to the writable output.
+    timings : dict
+        Aggregated durations of all timers by their names.
+    timeout : float
+        Maximum number of seconds to finish all loggers at exit. The default
+        is 10.
+    messagelength : int
+        Maximum number of characters in the message when `maxmessage` is
+        True. The default is 10000.
     """
 
+    timeout = 10
+    messagelength = 10000
+
     def __init__(self, name=None, app=None, desc=None, version=None,
                  status=True, console=True, file=True, email=False, html=False,
-                 table=False, directory=None, filename=None, extension=None,
-                 smtp=None, db=None, format=None, info=True, debug=False,
-                 warning=True, error=True, critical=True, alarming=True,
-                 control=True, maxsize=(1024*1024*10), maxdays=1, maxlevel=2,
-                 maxerrors=False):
+                 table=False, recorder=False, binary=False, directory=None,
+                 filename=None, extension=None, smtp=None, db=None,
+                 format=None, info=True, debug=False, warning=True,
+                 error=True, critical=True, alarming=True, control=True,
+                 maxsize=(1024*1024*10), maxdays=1, maxlevel=2,
+                 maxerrors=False, timing=False, maxmessage=False,
+                 parent=None, weak=False):
         # Unique name of the logger.
         self._name = name
+        self._parent = parent
+        self._weak = weak
         # Add creating logger to special all_loggers dictinary.
-        all_loggers[self._name] = self
+        all_loggers.register(self, weak=weak)
 
         # Attributes describing the application.
         self.app = None
@@ -184,24 +239,39 @@ class Logger():
         self._with_error = False
         self._count_errors = 0
         self._all_errors = []
+        self.timings = {}
+
+        # Complete the initial configuration. Child logger takes everything
+        # from its parent so outputs are not built for the second time.
+        if parent is None:
+            self.configure(app=app, desc=desc, version=version,
+                           status=status, console=console, file=file,
+                           email=email, html=html, table=table,
+                           recorder=recorder, binary=binary,
+                           directory=directory, filename=filename,
+                           extension=extension, smtp=smtp, db=db,
+                           format=format, info=info, debug=debug,
+                           warning=warning, error=error, critical=critical,
+                           alarming=alarming, control=control,
+                           maxsize=maxsize, maxdays=maxdays,
+                           maxlevel=maxlevel, maxerrors=maxerrors,
+                           timing=timing, maxmessage=maxmessage)
+        else:
+            self.__inherit(parent)
 
-        # Complete the initial configuration.
-        self.configure(app=app, desc=desc, version=version, status=status,
-                       console=console, file=file, email=email, html=html,
-                       table=table, directory=directory, filename=filename,
-                       extension=extension, smtp=smtp, db=db, format=format,
-                       info=info, debug=debug, warning=warning, error=error,
-                       critical=critical, alarming=alarming, control=control,
-                       maxsize=maxsize, maxdays=maxdays, maxlevel=maxlevel,
-                       maxerrors=maxerrors)
+        # Profile the whole run if it is requested by environment.
+        self._profiler = None
+        self._sampler = None
+        self._monitor = None
+        self._watcher = None
+        self._running = []
+        if parent is None:
+            self._profiler = from_environment(self)
 
         # Output shortcuts.
         self.console = self.root.console
         self.file = self.root.file
 
-        # Set exit function.
-        atexit.register(self._exit)
-
         pass
 
     def __repr__(self):
@@ -213,6 +283,11 @@ class Logger():
         """Get the unique logger name."""
         return self._name
 
+    @property
+    def parent(self):
+        """Get the parent logger if this one is a child."""
+        return self._parent
+
     @property
     def with_error(self):
         """Get the flag indicating whether an error has occurred or not."""
@@ -228,12 +303,19 @@ class Logger():
         """Get the list with all currently met errors."""
         return self._all_errors
 
+    @property
+    def maxmessage(self):
+        """Get maximum number of characters in the message."""
+        return self._maxmessage
+
     def configure(self, app=None, desc=None, version=None, status=None,
                   console=None, file=None, email=None, html=None, table=None,
-                  directory=None, filename=None, extension=None, smtp=None,
-                  db=None, format=None, info=None, debug=None, warning=None,
-                  error=None, critical=None, alarming=None, control=None,
-                  maxsize=None, maxdays=None, maxlevel=None, maxerrors=None):
+                  recorder=None, binary=None, directory=None, filename=None,
+                  extension=None, smtp=None, db=None, format=None, info=None,
+                  debug=None, warning=None, error=None, critical=None,
+                  alarming=None, control=None, maxsize=None, maxdays=None,
+                  maxlevel=None, maxerrors=None, timing=None,
+                  maxmessage=None):
         """Configure this particular Logger.
 
         This is the only one right way to customize Logger. Parameters are the
@@ -259,6 +341,10 @@ class Logger():
             The argument is used to open or close output `html`.
         table : bool, optional
             The argument is used to open or close output `table`.
+        recorder : bool, optional
+            The argument is used to open or close output `recorder`.
+        binary : bool, optional
+            The argument is used to open or close output `binary`.
         directory : str, optional
             The argument is used to set logging file folder.
         filename : str, optional
@@ -295,7 +381,33 @@ class Logger():
             The argument is used to define the break error level.
         maxerrors : int or bool, optional
             The argument is used to define maximun number of errors.
+        timing : int or bool, optional
+            The argument is used to define the interval for summary records
+            of timers.
+        maxmessage : int or bool, optional
+            The argument is used to define maximum number of characters in
+            the message. True means the limit of `messagelength` characters.
+
+        Raises
+        ------
+        ValueError
+            If parameters of the shared outputs are given to the child
+            logger.
         """
+        # Outputs are shared with the parent, so the child can not change
+        # them. Nothing is applied when such parameter is given.
+        if self._parent is not None:
+            shared = {'status': status, 'console': console, 'file': file,
+                      'email': email, 'html': html, 'table': table,
+                      'recorder': recorder, 'binary': binary,
+                      'directory': directory, 'filename': filename,
+                      'extension': extension, 'smtp': smtp, 'db': db,
+                      'maxsize': maxsize, 'maxdays': maxdays}
+            for key, value in shared.items():
+                if value is not None:
+                    raise ValueError(f'{key} can be configured only in the '
+                                     f'top logger of {self._name}')
+
         if isinstance(app, str) is True:
             self.app = app
         if isinstance(desc, str) is True:
@@ -314,27 +426,36 @@ class Logger():
             format = {} if isinstance(format, dict) is False else format
             self.formatter = Formatter(**format)
         elif isinstance(format, dict) is True:
+            # Child gets own formatter on the first change, so the format
+            # of the parent stays the same.
+            if (self._parent is not None
+               and self.formatter is self._parent.formatter):
+                self.formatter = copy.copy(self.formatter)
             self.formatter.configure(**format)
 
-        # Create or customize record type filters.
-        if hasattr(self, 'filters') is False:
-            self.filters = {}
+        # Create or customize record type filters. New table replaces the
+        # old one at once, so writing threads never see it half updated and
+        # need no lock.
+        filters = dict(getattr(self, 'filters', {}))
         for key, value in {'info': info, 'debug': debug, 'error': error,
                            'warning': warning, 'critical': critical}.items():
             if isinstance(value, bool) is True:
-                self.filters[key] = value
+                filters[key] = value
+        self.filters = filters
 
         # Build the output root if it is not exists. In other case modify
         # existing output if it is requested.
         if hasattr(self, 'root') is False:
             self.root = Root(self, console=console, file=file, email=email,
-                             html=html, table=table, status=status,
+                             html=html, table=table, recorder=recorder,
+                             binary=binary, status=status,
                              directory=directory, filename=filename,
                              extension=extension, smtp=smtp, db=db)
         else:
             for key, value in {'console': console, 'file': file,
                                'email': email, 'html': html,
-                               'table': table}.items():
+                               'table': table, 'recorder': recorder,
+                               'binary': binary}.items():
                 if value is True:
                     getattr(self.root, key).open()
                     if key == 'file':
@@ -375,12 +496,53 @@ class Logger():
             self._alarming = alarming
         if isinstance(control, bool) is True:
             self._control = control
+        if isinstance(timing, (int, float, bool)) is True:
+            self._timing = timing
+        # Bool is an int too, so True must not become the limit of one
+        # character.
+        if maxmessage is True:
+            self._maxmessage = self.messagelength
+        elif isinstance(maxmessage, (int, bool)) is True:
+            self._maxmessage = maxmessage
 
         # Initialize header instance when not exists.
         if hasattr(self, 'header') is False:
             self.header = Header(self)
         pass
 
+    def child(self, name, **kwargs):
+        """Get child logger or return existing one.
+
+        Child logger shares the outputs of this logger, so no new file
+        handlers, SMTP connections or database engines are created for it.
+        Outputs are configured only by the top logger, the child can have
+        its own filters, format and limits of errors. Errors of the child
+        are alarmed by the top logger.
+        The full name of the child is the name of this logger and the name
+        of the child separated by dot. It is available in records as the
+        `logname` form.
+
+        Parameters
+        ----------
+        name : str
+            The short name of the child logger.
+        **kwargs
+            The keyword arguments that used for child logger configuration.
+
+        Returns
+        -------
+        logger
+            The `Logger` object.
+        """
+        name = f'{self._name}.{name}'
+        if all_loggers.get(name) is not None:
+            child = all_loggers[name]
+        else:
+            child = Logger(name=name, parent=self, weak=self._weak)
+        if len(kwargs) > 0:
+            child.configure(**kwargs)
+        return child
+
     def write(self, record):
         """Direct write to the output.
 
@@ -389,6 +551,10 @@ class Logger():
         record : Record
             The argument is used to send it to the output `root`.
         """
+        # Shared outputs are maintained by the top logger only.
+        if self._parent is not None:
+            self._parent.write(record)
+            return
         self.__check_file_stats()
         self.root.write(record)
         pass
@@ -415,6 +581,11 @@ class Logger():
         if self.filters.get(rectype, True) is True:
             record = Record(self, rectype, message, error=error, **kwargs)
             self.write(record)
+        elif self.root.recorder.status is True:
+            # Filtered records are kept only by the flight recorder which
+            # does not need the record object.
+            self.root.recorder.write_raw(self, rectype, message, kwargs,
+                                         error=error)
         pass
 
     def info(self, message, **kwargs):
@@ -461,7 +632,18 @@ class Logger():
         # Parse the error.
         err_type, err_value, err_tb = sys.exc_info()
 
-        self._with_error = True
+        # Records hidden by filters give the context of the error. Progress
+        # merged in the table must show the state at the moment of error.
+        if level >= 1:
+            self.root.recorder.release()
+            self.root.table.flush()
+
+        # Alarm at exit is sent by the top logger, so it must know about
+        # the errors of its children.
+        logger = self
+        while logger is not None:
+            logger._with_error = True
+            logger = logger._parent
         self._count_errors += 1
         self._all_errors.append((err_type, err_value, err_tb))
 
@@ -604,6 +786,9 @@ class Logger():
 
     def restart(self):
         """Restart logging. Will open new file."""
+        if self._parent is not None:
+            self._parent.restart()
+            return
         self.start_date = dt.datetime.now()
         self.__calculate_restart_date()
         if self.root.file.status is True:
@@ -628,10 +813,405 @@ class Logger():
         self.root.table.write(**kwargs)
         pass
 
+    def bind(self, **fields):
+        """Bind fields to the current execution context.
+
+        Bound fields are available as forms in all records created in this
+        context, so they do not have to be passed to each write method call.
+        Fields are stored in `contextvars`, so they follow asyncio tasks and
+        the functions wrapped with `wrap()`. Note that context is common for
+        all loggers.
+
+        Parameters
+        ----------
+        **fields
+            The keyword arguments used as forms e.g. request identifier.
+
+        Returns
+        -------
+        token : contextvars.Token
+            The token that can be used to restore previous fields.
+        """
+        bound.update(fields)
+        fields = types.MappingProxyType({**context.get(), **fields})
+        return context.set(fields)
+
+    def unbind(self, *names):
+        """Remove fields from the current execution context.
+
+        Parameters
+        ----------
+        *names
+            The names of the fields that must be removed.
+        """
+        fields = {k: v for k, v in context.get().items() if k not in names}
+        context.set(types.MappingProxyType(fields))
+        pass
+
+    @contextlib.contextmanager
+    def context(self, **fields):
+        """Bind fields only within the block of `with` statement.
+
+        Parameters
+        ----------
+        **fields
+            The keyword arguments used as forms e.g. request identifier.
+        """
+        token = self.bind(**fields)
+        try:
+            yield self
+        finally:
+            context.reset(token)
+
+    def wrap(self, func):
+        """Wrap function to run it with the fields of the current context.
+
+        Threads do not inherit context of the thread that started them, so
+        use this method for the targets of threads and executors.
+
+        Parameters
+        ----------
+        func : callable
+            The function that must be wrapped.
+
+        Returns
+        -------
+        wrapper : callable
+            The function running in the copy of the current context.
+        """
+        current = contextvars.copy_context()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return current.copy().run(func, *args, **kwargs)
+        return wrapper
+
+    def timer(self, name):
+        """Measure the duration of the code block.
+
+        Durations are not written one by one but aggregated per timer name
+        and written as summary records periodically or at exit.
+
+        Parameters
+        ----------
+        name : str
+            The name of the timer.
+
+        Returns
+        -------
+        timer : pepperoni.timing.Timer
+            The context manager.
+        """
+        return Timer(self, name)
+
+    def timed(self, func=None, name=None):
+        """Measure the duration of each function call.
+
+        Can be used as `@logger.timed` or `@logger.timed(name='...')`.
+
+        Parameters
+        ----------
+        func : callable, optional
+            The function that must be measured.
+        name : str, optional
+            The name of the timer. By default the name of the function.
+
+        Returns
+        -------
+        wrapper : callable
+            The measured function or decorator.
+        """
+        if func is None:
+            return functools.partial(self.timed, name=name)
+        return timed(self, func, name=name)
+
+    def summary(self):
+        """Send summary records of all timers to the output."""
+        for timing in list(self.timings.values()):
+            if timing.count > 0:
+                self.info(f'TIMER {timing.summary(reset=True)}')
+        pass
+
+    def profile(self, name=None, mode='cpu', top=20):
+        """Profile the code and write the results to the output.
+
+        Can be used as `with logger.profile('name'):`, as `@logger.profile`
+        or as `@logger.profile(mode='memory')`. The whole run can be profiled
+        by setting the environment variable PEPPERONI_PROFILE to `cpu` or
+        `memory`.
+
+        Parameters
+        ----------
+        name : str, optional
+            The name of the profile. By default the name of the function
+            when used as decorator.
+        mode : str, optional
+            Either `cpu` to use cProfile or `memory` to use tracemalloc.
+        top : int, optional
+            The number of top functions or lines written as records.
+
+        Returns
+        -------
+        profiler : pepperoni.profiler.Profiler
+            The context manager and decorator.
+        """
+        if callable(name) is True:
+            func = name
+            return Profiler(self, func.__qualname__, mode, top)(func)
+        return Profiler(self, name, mode, top)
+
+    def sample(self, rate=100, interval=60, top=10):
+        """Start background sampling of the stacks of all threads.
+
+        Sampling is much cheaper than deterministic profiling so it can be
+        used in production. Top stacks are written as records each interval
+        and at exit. Collapsed stacks for flamegraph tools are saved to the
+        *.stacks* file next to the output file.
+
+        Parameters
+        ----------
+        rate : int or float, optional
+            The number of samples per second.
+        interval : int or float, optional
+            The number of seconds between the reports.
+        top : int, optional
+            The number of top stacks written as records.
+
+        Returns
+        -------
+        sampler : pepperoni.profiler.Sampler
+            The running sampler.
+        """
+        if self._sampler is not None:
+            self._sampler.stop()
+        self._sampler = Sampler(self, rate=rate, interval=interval, top=top)
+        self._sampler.start()
+        return self._sampler
+
+    def monitor(self, interval=60):
+        """Start background writing of resources usage records.
+
+        Parameters
+        ----------
+        interval : int or float, optional
+            The number of seconds between the records.
+
+        Returns
+        -------
+        monitor : pepperoni.sysinfo.Monitor
+            The running monitor.
+        """
+        if self._monitor is not None:
+            self._monitor.stop()
+        self._monitor = Monitor(self, interval=interval)
+        self._monitor.start()
+        return self._monitor
+
+    def watch(self, path, interval=5, signals=True):
+        """Start applying the configuration file while application runs.
+
+        Configuration file is a JSON object with the parameters of
+        `configure()`. It is applied at once and then each time it is
+        modified or signal `SIGUSR1` or `SIGHUP` is received, so debug
+        records can be turned on without the restart.
+
+        Parameters
+        ----------
+        path : str
+            Path to the configuration file.
+        interval : int or float, optional
+            The number of seconds between the checks of the file.
+        signals : bool, optional
+            The argument is used to enable reload by signals.
+
+        Returns
+        -------
+        watcher : pepperoni.watcher.Watcher
+            The running watcher.
+        """
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._watcher = Watcher(self, path, interval=interval,
+                                signals=signals)
+        self._watcher.start()
+        return self._watcher
+
+    def capture(self, *names, level=logging.NOTSET):
+        """Capture records of built-in logging to this logger.
+
+        Parameters
+        ----------
+        *names
+            The names of built-in loggers which records must be captured,
+            e.g. `sqlalchemy`, `urllib3`. When no names are given then the
+            built-in root logger is captured.
+        level : int, optional
+            The minimum level of built-in logging records to capture.
+
+        Returns
+        -------
+        handler : pepperoni.bridge.Handler
+            The handler added to the built-in loggers.
+        """
+        handler = Handler(self, level=level)
+        for name in names or (None,):
+            stdlib_logger = logging.getLogger(name)
+            stdlib_logger.addHandler(handler)
+            if level != logging.NOTSET:
+                stdlib_logger.setLevel(level)
+        return handler
+
+    def adapter(self):
+        """Get built-in logging interface of this logger.
+
+        Returns
+        -------
+        adapter : pepperoni.bridge.Adapter
+            The object with the methods of `logging.Logger`.
+        """
+        return Adapter(self)
+
+    def flush(self):
+        """Send all buffered records to the outputs."""
+        self.root.flush()
+        pass
+
+    def dispose(self):
+        """Finish this logger and remove it from the registry.
+
+        Background threads are stopped, buffered records are written and
+        outputs are closed. Child loggers are disposed as well. Child logger
+        does not close the outputs of its parent.
+        """
+        for logger in all_loggers.values():
+            if logger.parent is self:
+                logger.dispose()
+        self._exit()
+        if self._parent is None:
+            for branch in tuple(self.root.branches.values()):
+                branch.close()
+        if all_loggers.get(self._name) is self:
+            del all_loggers[self._name]
+        pass
+
+    def _measure(self, name, duration):
+        # Aggregate the duration and write the summary if the interval is
+        # elapsed.
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings.setdefault(name, Timing(name))
+        timing.add(duration)
+        if self._timing is not False and self._timing is not True:
+            if time.monotonic() - timing.since >= self._timing:
+                self.info(f'TIMER {timing.summary(reset=True)}')
+        pass
+
+    def _prefork(self):
+        # Remember background threads running before fork, they must be
+        # started again in the child.
+        self._running = [thread for thread in (self._sampler, self._monitor,
+                                               self._watcher)
+                         if thread is not None and thread.is_alive() is True]
+        # Network outputs are not waited, their queues stay with the parent.
+        if self._parent is None:
+            self.root.prefork()
+        pass
+
+    def _fork(self):
+        # Child process after fork gets own outputs, connections and
+        # background threads. Threads of the parent do not exist here, so
+        # they are replaced without stopping.
+        if self._parent is None:
+            self.root.fork()
+            self.header.fork()
+        for timing in tuple(self.timings.values()):
+            timing.fork()
+        running, self._running = self._running, []
+        if self._sampler in running:
+            sampler, self._sampler = self._sampler, None
+            self.sample(rate=sampler.rate, interval=sampler.interval,
+                        top=sampler.top)
+            self._sampler.path = pidpath(sampler.path)
+        if self._monitor in running:
+            monitor, self._monitor = self._monitor, None
+            self.monitor(interval=monitor.interval)
+        if self._watcher in running:
+            # Signal handlers of the dead watcher are restored first, so
+            # the new one does not chain them.
+            watcher, self._watcher = self._watcher, None
+            watcher.stop()
+            self.watch(watcher.path, interval=watcher.interval)
+        pass
+
     def _exit(self):
+        self._stop()
+        self._finish()
+        pass
+
+    def _stop(self):
+        # Profiling of the whole run is finished at exit. It must be done in
+        # the main thread where profiler and signal handlers were set.
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler = None
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        pass
+
+    def _finish(self):
+        # Timers that were not reported yet must be reported now and nothing
+        # must be left in the buffers.
+        steps = [self.summary, self.flush]
         # Inform about the error.
         if self._alarming is True and self._with_error is True:
-            self.root.email.alarm()
+            steps.append(self.root.email.alarm)
+        # Spooled data is delivered now if backend is back. Buffer of the
+        # flight recorder is not needed after clean exit.
+        if self._parent is None:
+            steps.append(self.root.email.drain)
+            steps.append(self.root.table.drain)
+            steps.append(self.root.recorder.close)
+        # Each step is made even if the previous one failed, so one broken
+        # output does not lose the data of the others. Logger itself can be
+        # broken, so the failure goes to the stderr.
+        for step in steps:
+            try:
+                step()
+            except Exception:
+                print(f'pepperoni: {step.__qualname__} of {self.name} '
+                      'failed at exit', file=sys.stderr)
+                traceback.print_exc(file=sys.stderr)
+        pass
+
+    def __inherit(self, parent):
+        # Take the configuration of the parent logger. Outputs, formatter and
+        # header are shared while filters and limits are copied so they can
+        # be customized for the child separately.
+        self.app = parent.app
+        self.desc = parent.desc
+        self.version = parent.version
+        self.rectypes = parent.rectypes.copy()
+        self.messages = parent.messages.copy()
+        self.formatter = parent.formatter
+        self.filters = parent.filters.copy()
+        self.root = parent.root
+        self.header = parent.header
+        self._maxsize = parent._maxsize
+        self._maxdays = parent._maxdays
+        self._maxlevel = parent._maxlevel
+        self._maxerrors = parent._maxerrors
+        self._alarming = parent._alarming
+        self._control = parent._control
+        self._timing = parent._timing
+        self._maxmessage = parent._maxmessage
+        self.__calculate_restart_date()
         pass
 
     def __calculate_restart_date(self):
@@ -654,3 +1234,49 @@ class Logger():
                 if self.__restart_date.day == dt.datetime.now().day:
                     self.restart()
                     return
+
+
+def _before_fork():
+    # Buffered records must be written once, so they are flushed by the
+    # parent before fork.
+    for logger in tuple(all_loggers.values()):
+        logger._prefork()
+    pass
+
+
+def _after_fork_in_child():
+    resources.clear()
+    handles.fork()
+    for logger in tuple(all_loggers.values()):
+        logger._fork()
+    pass
+
+
+if hasattr(os, 'register_at_fork') is True:
+    os.register_at_fork(before=_before_fork,
+                        after_in_child=_after_fork_in_child)
+
+
+def _exit_all():
+    # Finish all live loggers at exit. Threads and profilers are stopped in
+    # the main thread, then loggers are flushed in parallel. Child loggers
+    # go first because they write to the outputs of their parents. Exit is
+    # not delayed longer than the timeout by a slow output.
+    loggers = all_loggers.values()
+    for logger in loggers:
+        logger._stop()
+    deadline = time.monotonic() + Logger.timeout
+    for group in ([x for x in loggers if x.parent is not None],
+                  [x for x in loggers if x.parent is None]):
+        threads = []
+        for logger in group:
+            thread = threading.Thread(target=logger._finish, daemon=True,
+                                      name=f'pepperoni-exit-{logger.name}')
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+    pass
+
+
+atexit.register(_exit_all)
@@ -1,19 +1,38 @@
 """Elements reflecting output objects."""
 
+import base64
+import collections
 import datetime as dt
+import decimal
 import functools
+import gzip
+import http.client
+import itertools
+import json
+import mmap
 import os
+import queue
+import signal
 import smtplib
+import socket
+import struct
+import sys
+import threading
+import time
+import types
+import urllib.parse
+import weakref
 import sqlalchemy as sql
 
-from email import encoders
+from email import encoders, message_from_bytes
 from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from .database import Database
-from .record import Record
-from .utils import py_dir
+from .cache import context
+from .record import clock
+from .utils import py_dir, shorten, truncate, varint, zigzag
 
 
 def you_shall_not_pass(func):
@@ -25,6 +44,12 @@ def you_shall_not_pass(func):
     return wrapper
 
 
+def pidpath(path):
+    """Get the path with the current process ID before the extension."""
+    root, ext = os.path.splitext(path)
+    return f'{root}.{os.getpid()}{ext}'
+
+
 class Output():
     """Parent class for all outputs.
 
@@ -65,6 +90,11 @@ class Branch(Output):
     Parent class for each low-level output object e.g. console, file, email,
     database table, and HTML document.
 
+    Own outputs can be made as subclasses with the `write()` method that
+    receives the record and added to the root with `Root.add()`. Record can
+    be either `Record` object or plain string like a header line, so use
+    `str()` to get the text.
+
     Parameters
     ----------
     root : Output
@@ -78,11 +108,28 @@ class Branch(Output):
         Low-level output that is a root of this branch.
     status : bool
         Status for this particular output.
+    levels : set or None
+        Keys of the record types that are sent to this output e.g.
+        `{'error', 'critical'}`. When it is `None` then all records are
+        sent. Plain strings are sent regardless of this attribute.
+    maxlength : int or None
+        Maximum number of characters in the record written to this output.
+        Longer records are truncated with the marker. When it is `None` then
+        records are not truncated.
+    writable : bool
+        Flag showing that records are sent to this output by the root.
+    strings : bool
+        Flag showing that plain strings are sent to this output by the root.
     """
 
+    writable = True
+    strings = True
+
     def __init__(self, root, status=False):
         super().__init__(status=status)
         self._root = root
+        self.levels = None
+        self.maxlength = None
         pass
 
     @property
@@ -90,6 +137,67 @@ class Branch(Output):
         """Low-level output that is a root of this branch."""
         return self._root
 
+    def open(self):
+        """Make this output active."""
+        super().open()
+        self._root.dispatch()
+        pass
+
+    def close(self):
+        """Make this output inactive."""
+        super().close()
+        self._root.dispatch()
+        pass
+
+    def route(self, *levels):
+        """Send only records of the given types to this output.
+
+        Parameters
+        ----------
+        *levels
+            Keys of the record types e.g. `'error'`, `'critical'`. When no
+            keys are given then all records are sent.
+        """
+        self.levels = frozenset(levels) if len(levels) > 0 else None
+        self._root.dispatch()
+        pass
+
+    def truncate(self, string):
+        """Cut the record string to the `maxlength` of this output.
+
+        Parameters
+        ----------
+        string : str
+            The record string.
+
+        Returns
+        -------
+        string : str
+            The string not longer than `maxlength` plus the marker.
+        """
+        return truncate(string, self.maxlength)
+
+    def flush(self):
+        """Send all buffered data to the output."""
+        pass
+
+    def prefork(self):
+        """Write local buffers before fork, so the child does not repeat them.
+
+        It is called in the thread making the fork, so it must not wait for
+        the network.
+        """
+        self.flush()
+        pass
+
+    def fork(self):
+        """Prepare the output for work in the child process after fork.
+
+        Locks, connections and threads of the parent process must not be
+        used in the child, so they are created again.
+        """
+        pass
+
 
 class Root(Output):
     """Output root.
@@ -101,6 +209,10 @@ class Root(Output):
     Constructor of this class also creates high-level outputs as `Root`
     attributes like `console`, `file`, `email`, `html` and `table`.
 
+    Records are sent to the active outputs using the dispatch table that is
+    built again only when some output is opened, closed, routed, added or
+    removed, so writing of the record is just a loop over prepared writers.
+
     Parameters
     ----------
     logger : Logger
@@ -117,6 +229,10 @@ class Root(Output):
         Used for `status` argument of `HTML` class.
     table : bool, optional
         Used for `status` argument of `Table` class.
+    recorder : bool, optional
+        Used for `status` argument of `Recorder` class.
+    binary : bool, optional
+        Used for `status` argument of `Binary` class.
     status : bool, optional
         The overall status of the `Root`.
     directory : str, optional
@@ -149,29 +265,119 @@ class Root(Output):
         The `HTML` object output.
     table : Table
         The `Table` object output.
+    recorder : Recorder
+        The `Recorder` object output.
+    binary : Binary
+        The `Binary` object output.
+    branches : dict
+        All outputs of the root by their names including added ones.
     """
 
     def __init__(self, logger, status=True, console=True, file=True,
-                 email=False, html=False, table=False, directory=None,
-                 filename=None, extension=None, smtp=None, db=None):
+                 email=False, html=False, table=False, recorder=False,
+                 binary=False, directory=None, filename=None,
+                 extension=None, smtp=None, db=None):
         super().__init__(status=status)
         self.logger = logger
+        self.branches = {}
+        self._writers = ()
+        self._routes = {}
+
+        # Order of the outputs is the order of writing. Binary and recorder
+        # go first as the cheapest ones.
+        self.add('binary', Binary(self, status=binary))
 
-        self.console = Console(self, status=console)
+        self.add('recorder', Recorder(self, status=False))
+
+        self.add('console', Console(self, status=console))
 
         path = dict(dir=directory, name=filename, ext=extension)
-        self.file = File(self, status=file, **path)
+        self.add('file', File(self, status=file, **path))
 
-        self.html = HTML(self, status=html)
+        self.add('html', HTML(self, status=html))
 
         smtp = smtp if isinstance(smtp, dict) is True else {}
-        self.email = Email(self, status=email, **smtp)
+        self.add('email', Email(self, status=email, **smtp))
 
         db = db if isinstance(db, dict) is True else {}
-        self.table = Table(self, status=table, **db)
+        self.add('table', Table(self, status=table, **db))
+
+        # Recorder places its buffer next to the output file.
+        if recorder is True:
+            self.recorder.open()
+        pass
+
+    def open(self):
+        """Make this output active."""
+        super().open()
+        self.dispatch()
+        pass
+
+    def close(self):
+        """Make this output inactive."""
+        super().close()
+        self.dispatch()
+        pass
+
+    def add(self, name, branch, levels=None):
+        """Add the output to this root.
+
+        Parameters
+        ----------
+        name : str
+            The name of the output. Output is also available as the
+            attribute of the root with that name if it is not taken.
+        branch : Branch
+            The output object.
+        levels : list, optional
+            Keys of the record types that are sent to this output.
+        """
+        self.branches[name] = branch
+        if hasattr(self, name) is False:
+            setattr(self, name, branch)
+        if levels is not None:
+            branch.route(*levels)
+        self.dispatch()
+        pass
+
+    def remove(self, name):
+        """Remove the output from this root.
+
+        Parameters
+        ----------
+        name : str
+            The name of the output.
+
+        Returns
+        -------
+        branch : Branch
+            The removed output object.
+        """
+        branch = self.branches.pop(name)
+        if getattr(self, name, None) is branch:
+            delattr(self, name)
+        self.dispatch()
+        return branch
+
+    def dispatch(self):
+        """Build the dispatch table of the active outputs."""
+        writers = []
+        if self.status is True:
+            for branch in self.branches.values():
+                if branch.writable is True and branch.status is True:
+                    # Status is already checked here, so the original method
+                    # is used without the check.
+                    write = getattr(type(branch).write, '__wrapped__', None)
+                    if write is not None:
+                        write = types.MethodType(write, branch)
+                    else:
+                        write = branch.write
+                    writers.append((write, branch))
+        # Both tables are replaced at once, so writing threads need no lock.
+        self._writers = tuple(writers)
+        self._routes = {}
         pass
 
-    @you_shall_not_pass
     def write(self, record):
         """Send received record to all writable outputs.
 
@@ -180,23 +386,67 @@ class Root(Output):
         record : str or Record
             The data that must be written to writable outputs.
         """
-        if isinstance(record, Record) is True:
-            record = record.create()
-        self.console.write(record)
-        self.file.write(record)
-        self.html.write(record)
+        level = getattr(record, 'level', None)
+        writers = self._routes.get(level)
+        if writers is None:
+            writers = self.__route(level)
+        for write in writers:
+            write(record)
+        pass
+
+    def flush(self):
+        """Flush all outputs."""
+        for branch in tuple(self.branches.values()):
+            branch.flush()
+        pass
+
+    def prefork(self):
+        """Write local buffers of all outputs before fork."""
+        for branch in tuple(self.branches.values()):
+            branch.prefork()
+        pass
+
+    def fork(self):
+        """Prepare all outputs for work in the child process after fork."""
+        for branch in tuple(self.branches.values()):
+            branch.fork()
+        self.dispatch()
         pass
 
+    def __route(self, level):
+        # Select the writers for the record type and keep them in the table.
+        routes = self._routes
+        writers = []
+        for write, branch in self._writers:
+            if level is None:
+                if branch.strings is True:
+                    writers.append(write)
+            elif branch.levels is None or level in branch.levels:
+                writers.append(write)
+        writers = routes[level] = tuple(writers)
+        return writers
+
 
 class Console(Branch):
     """Represents console output.
 
+    Records are written directly to the system stdout. When stdout is not a
+    terminal (e.g. a pipe in a container) records are collected in a buffer
+    which is flushed when it is full, when the interval is elapsed or when an
+    error record arrives.
+
     Parameters
     ----------
     root : Output
         Used to set `root` attribute.
     status : bool
         The argument that is used to enable or disable output.
+    buffer : int or bool, optional
+        Used to set `buffer` attribute.
+    interval : int or float, optional
+        Used to set `interval` attribute.
+    stderr : bool, optional
+        Used to set `stderr` attribute.
 
     Attributes
     ----------
@@ -204,24 +454,363 @@ class Console(Branch):
         Low-level output that is a root of this branch.
     status : bool
         Status for this particular output.
+    buffer : int or bool
+        Maximum number of characters kept in the buffer. When it is `None`
+        then buffering is used only if stdout is not a terminal. When it is
+        `True` then default buffer size of 8192 is used. When it is `False`
+        then buffering is disabled. The default is `None`.
+    interval : float
+        Maximum number of seconds records can be kept in the buffer. The
+        default is 1 second.
+    stderr : bool
+        Flag to send ERROR and CRITICAL records to system stderr. The default
+        is False.
     """
 
+    errors = ('error', 'critical')
+
+    def __init__(self, root, status=True, buffer=None, interval=1,
+                 stderr=False):
+        super().__init__(root, status=status)
+        self.buffer = None
+        self.interval = 1
+        self.stderr = False
+        self._lock = threading.RLock()
+        self._records = []
+        self._length = 0
+        self._timer = None
+        self._stdout = None
+        self._tty = None
+        self.configure(buffer=buffer, interval=interval, stderr=stderr)
+        pass
+
+    def configure(self, buffer=None, interval=None, stderr=None):
+        """Configure console output.
+
+        Parameters
+        ----------
+        buffer : int or bool, optional
+            Used to set `buffer` attribute.
+        interval : int or float, optional
+            Used to set `interval` attribute.
+        stderr : bool, optional
+            Used to set `stderr` attribute.
+        """
+        if isinstance(buffer, (int, bool)) is True:
+            self.flush()
+            self.buffer = buffer
+        if isinstance(interval, (int, float)) is True:
+            self.interval = interval
+        if isinstance(stderr, bool) is True:
+            self.stderr = stderr
+        pass
+
+    @property
+    def limit(self):
+        """Get the actual size of the buffer for current stdout."""
+        if self.buffer is None:
+            # Terminal check is a system call so it is done only when stdout
+            # is replaced.
+            if self._stdout is not sys.stdout:
+                isatty = getattr(sys.stdout, 'isatty', None)
+                self._tty = isatty is not None and isatty() is True
+                self._stdout = sys.stdout
+            return 0 if self._tty is True else 8192
+        elif self.buffer is True:
+            return 8192
+        return int(self.buffer)
+
     @you_shall_not_pass
     def write(self, record):
-        """Write string to console.
+        """Write record to console.
+
+        Parameters
+        ----------
+        record : str or Record
+            The record that must be written to system stdout. Type of the
+            record is used for routing and flushing.
+        """
+        error = getattr(record, 'level', None) in self.errors
+        record = self.truncate(str(record))
+        if error is True and self.stderr is True:
+            # Keep the order of records in the shared terminal.
+            self.flush()
+            sys.stderr.write(record)
+            sys.stderr.flush()
+        elif self.limit == 0:
+            sys.stdout.write(record)
+            if error is True:
+                sys.stdout.flush()
+        else:
+            with self._lock:
+                self._records.append(record)
+                self._length += len(record)
+                full = self._length >= self.limit
+                if error is False and full is False and self._timer is None:
+                    self._timer = threading.Timer(self.interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            if error is True or full is True:
+                self.flush()
+        pass
+
+    def flush(self):
+        """Write all buffered records to system stdout."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._records:
+                string = ''.join(self._records)
+                self._records.clear()
+                self._length = 0
+                sys.stdout.write(string)
+                sys.stdout.flush()
+        pass
+
+    def fork(self):
+        """Drop the buffer and the timer of the parent process."""
+        self._lock = threading.RLock()
+        self._records = []
+        self._length = 0
+        self._timer = None
+        pass
+
+
+class Handles():
+    """Process-wide registry of the outputs holding open file handlers.
+
+    Application that creates many loggers, e.g. one per tenant, would keep
+    one open file per each of them forever. Registry limits the number of
+    open files: when the limit is exceeded the least recently used outputs
+    release their handlers, which are opened again on the next write.
+    Outputs busy with writing at that moment are skipped.
+
+    Outputs are kept by weak references, so registry does not prevent
+    loggers from being freed. Handler of the freed output is closed by its
+    own finalizer.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Used to set `maxsize` attribute.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of open file handlers. The default is 256.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._owners = collections.OrderedDict()
+        self._dead = collections.deque()
+        self._lock = threading.Lock()
+        pass
+
+    def __len__(self):
+        """Get the number of open file handlers."""
+        with self._lock:
+            self.__purge()
+            return len(self._owners)
+
+    def fork(self):
+        """Forget the handlers of the parent process after fork."""
+        self._lock = threading.Lock()
+        self._owners = collections.OrderedDict()
+        self._dead = collections.deque()
+        pass
+
+    def touch(self, owner):
+        """Mark the output as the most recently used one.
+
+        Parameters
+        ----------
+        owner : Branch
+            The output with the open file handler. It must have the method
+            `release(blocking=True)`.
+        """
+        key = id(owner)
+        with self._lock:
+            self.__purge()
+            owners = self._owners
+            if key in owners:
+                owners.move_to_end(key)
+                return
+            owners[key] = weakref.ref(owner, self.__forget(key))
+            excess = len(owners) - self.maxsize
+            victims = list(itertools.islice(owners.values(), len(owners) - 1))
+        # Handlers are closed out of the registry lock because outputs take
+        # their own locks to do it.
+        for victim in victims:
+            if excess <= 0:
+                break
+            victim = victim()
+            if victim is not None and victim.release(blocking=False) is True:
+                excess -= 1
+        pass
+
+    def remove(self, owner):
+        """Forget the output which handler was closed.
+
+        Parameters
+        ----------
+        owner : Branch
+            The output which handler was closed.
+        """
+        with self._lock:
+            self.__purge()
+            self._owners.pop(id(owner), None)
+        pass
+
+    def __forget(self, key):
+        # Callback of the weak reference. It can be called by the garbage
+        # collector at any moment, even in the thread holding the lock, so
+        # it only queues the key which is removed under the lock later.
+        def callback(ref):
+            self._dead.append((key, ref))
+        return callback
+
+    def __purge(self):
+        # Remove the freed outputs. The key can be already used by the new
+        # output, so it is removed only with its own reference.
+        while self._dead:
+            key, ref = self._dead.popleft()
+            if self._owners.get(key) is ref:
+                self._owners.pop(key)
+        pass
+
+
+handles = Handles()
+
+
+class Appender():
+    """File handler appending whole records with single system calls.
+
+    File is opened with `O_APPEND`, so each write goes to the current end of
+    the file even if other processes write to it as well. Records are
+    collected in a batch which is written with one `writev` (or `write`)
+    call when the next record does not fit into the limit or when the
+    handler is flushed, so records of different processes never interleave
+    inside a line. POSIX guarantees this only for writes not larger than
+    `PIPE_BUF`, so the default limit is 4096 bytes. On local file systems
+    larger writes are not interleaved in practice. Record larger than the
+    limit is written alone, and if OS accepts it only partially the rest is
+    written with the next call, which is the only case when interleaving
+    is possible.
+
+    Parameters
+    ----------
+    path : str
+        Used to set `path` attribute.
+    limit : int, optional
+        Used to set `limit` attribute.
+
+    Attributes
+    ----------
+    path : str
+        Path to the file.
+    limit : int
+        Maximum number of bytes written with one call.
+    """
+
+    def __init__(self, path, limit=4096):
+        self.path = path
+        self.limit = limit
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                           0o644)
+        # Descriptor of the handler that was not closed is closed when the
+        # handler is freed. At exit the batch is written by the logger, so
+        # the descriptor is not closed before it.
+        self._finalizer = weakref.finalize(self, os.close, self._fd)
+        self._finalizer.atexit = False
+        self._batch = []
+        self._length = 0
+        pass
+
+    def fileno(self):
+        """Get the file descriptor."""
+        return self._fd
+
+    def write(self, data):
+        """Add the record to the batch.
 
         Parameters
         ----------
-        record : str
-            The string that must be written to system stdout.
+        data : bytes
+            The record that must be written.
         """
-        print(record, end='')
+        if self._length + len(data) > self.limit:
+            self.flush()
+        self._batch.append(data)
+        self._length += len(data)
+        if self._length >= self.limit:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        """Write the batch with one system call."""
+        if self._length == 0:
+            return
+        batch = self._batch
+        self._batch = []
+        self._length = 0
+        if hasattr(os, 'writev') is True:
+            written = os.writev(self._fd, batch)
+        else:
+            written = os.write(self._fd, b''.join(batch))
+        data = b''.join(batch)
+        while written < len(data):
+            data = data[written:]
+            written = os.write(self._fd, data)
+        pass
+
+    def close(self):
+        """Write the batch and close the file."""
+        if self._fd is not None:
+            try:
+                self.flush()
+            finally:
+                self._finalizer()
+                self._fd = None
         pass
 
 
 class File(Branch):
     """Represents file output.
 
+    Durability of the records is configured with one of the levels:
+
+    +--------------+------------------------------------------------------+
+    |    Level     |                 Description                          |
+    +==============+======================================================+
+    |none          |Records are buffered and written by large chunks      |
+    +--------------+------------------------------------------------------+
+    |flush         |Each record is passed to OS at once                   |
+    +--------------+------------------------------------------------------+
+    |fsync-on-error|Same as flush but ERROR and CRITICAL records are also |
+    |              |synchronized to the disk                              |
+    +--------------+------------------------------------------------------+
+    |periodic      |Records are buffered, passed to OS and synchronized to|
+    |              |the disk once per period                              |
+    +--------------+------------------------------------------------------+
+    |always        |Each record is synchronized to the disk               |
+    +--------------+------------------------------------------------------+
+
+    Synchronization uses group commit: threads that wrote their records
+    while another one was synchronizing the file share the next `fsync`
+    instead of making one each. In periodic mode the timer synchronizes
+    the last records when no more records follow, so they are never left
+    unsynchronized longer than the period.
+
+    In atomic mode file is written with `Appender`, so many processes can
+    safely append to the same file e.g. a daily log of cron jobs. Buffered
+    records are written by batches of whole records.
+
+    Number of open files of all outputs is limited by `handles` registry.
+    Idle file is closed when the limit is exceeded and opened again on the
+    next write.
+
     Parameters
     ----------
     root : Output
@@ -249,10 +838,41 @@ class File(Branch):
         the start date of logging in format *YYYYMMDDHHMISS*.
     ext : str
         The extension of output file. By default we use *log* extension.
+    perpid : bool
+        Flag to add the process ID to the name of output file, so each
+        process forked from the application writes to its own file. The
+        default is False.
+    durability : str
+        The durability level. The default is `flush`.
+    period : float
+        Number of seconds between synchronizations when durability is
+        `periodic`. The default is 1.
+    atomic : bool
+        Flag to write records with single system calls in append mode. The
+        default is False.
+    limit : int
+        Maximum size of the batch in atomic mode. The default is 4096.
     """
 
+    durabilities = ('none', 'flush', 'fsync-on-error', 'periodic', 'always')
+    errors = ('error', 'critical')
+
     def __init__(self, root, status=True, dir=None, name=None, ext=None):
         super().__init__(root, status=status)
+        self._path = None
+        self.perpid = False
+        self.durability = 'flush'
+        self.period = 1
+        self.atomic = False
+        self.limit = 4096
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._written = 0
+        self._flushed = 0
+        self._synced = 0
+        self._last = 0
+        self._timer = None
+        self.__handler = None
         dir = dir or os.path.join(py_dir, 'logs')
         name = name or '{root.logger.start_date:%Y%m%d%H%M%S}'
         ext = ext or 'log'
@@ -264,6 +884,18 @@ class File(Branch):
         """Return absolute path to output file."""
         return self._path
 
+    @property
+    def base(self):
+        """Return path to output file without extension.
+
+        Used to place additional files like profiles next to the output
+        file. If output file is not opened then the name of the logger in
+        the output folder is used.
+        """
+        if self._path is not None:
+            return os.path.splitext(self._path)[0]
+        return os.path.join(self.dir, self.root.logger.name)
+
     @property
     def modified(self):
         """Return last time when file was modified."""
@@ -274,7 +906,8 @@ class File(Branch):
         """Return current file size."""
         return self._size
 
-    def configure(self, dir=None, name=None, ext=None):
+    def configure(self, dir=None, name=None, ext=None, perpid=None,
+                  durability=None, period=None, atomic=None, limit=None):
         """Change output file parameters.
 
         Parameters
@@ -290,14 +923,41 @@ class File(Branch):
         ext : str, optional
             Used to define the extension of output file. By
             default we use *log* extension.
+        perpid : bool, optional
+            Used to set `perpid` attribute.
+        durability : str, optional
+            Used to set `durability` attribute.
+        period : int or float, optional
+            Used to set `period` attribute.
+        atomic : bool, optional
+            Used to set `atomic` attribute.
+        limit : int, optional
+            Used to set `limit` attribute.
         """
+        if isinstance(atomic, bool) is True or isinstance(limit, int) is True:
+            # Handler of another kind is opened on the next write.
+            self.release()
+            if isinstance(atomic, bool) is True:
+                self.atomic = atomic
+            if isinstance(limit, int) is True:
+                self.limit = limit
+        if isinstance(durability, str) is True:
+            if durability not in self.durabilities:
+                raise ValueError(f'unknown durability {durability}')
+            self.flush()
+            self.durability = durability
+        if isinstance(period, (int, float)) is True:
+            self.period = period
         if isinstance(dir, str) is True:
             self.dir = dir
         if isinstance(name, str) is True:
             self.name = name
         if isinstance(ext, str) is True:
             self.ext = ext
-        if dir is not None or name is not None or ext is not None:
+        if isinstance(perpid, bool) is True:
+            self.perpid = perpid
+        if (dir is not None or name is not None or ext is not None
+           or perpid is not None):
             self.new()
         pass
 
@@ -307,14 +967,19 @@ class File(Branch):
         # Define new path.
         head = self.dir
         tail = f'{self.name}.{self.ext}'
+        if self.perpid is True:
+            tail = f'{self.name}.{os.getpid()}.{self.ext}'
         datetime = self.root.logger.start_date
         path = os.path.join(head, tail)
-        self._path = path.format(root=self.root, datetime=datetime)
 
-        # Handler and file statistics must be purged.
-        self.__handler = None
+        # Previous file is closed and statistics must be purged.
+        self.release()
+        self._path = path.format(root=self.root, datetime=datetime)
         self._modified = None
         self._size = None
+        self._written = 0
+        self._flushed = 0
+        self._synced = 0
         pass
 
     @you_shall_not_pass
@@ -328,277 +993,2249 @@ class File(Branch):
 
         Parameters
         ----------
-        record : str
-            The string that must be written to file.
+        record : str or Record
+            The record that must be written to file.
         """
-        # Create path and open file handler if it is not opened yet.
-        if self.__handler is None:
-            # Check the directories.
-            dirname = os.path.dirname(self._path)
-            if os.path.exists(dirname) is False:
-                os.makedirs(dirname)
-            # Make file.
-            self.__handler = open(self._path, 'a')
-
         # We should write to handler only string values.
         # So if data presented as record.Record() object it must be converted
-        # to string value by using Record.create() method.
-        self.__handler.write(record)
-        self.__handler.flush()
+        # to string value which is created once for all outputs.
+        data = self.truncate(str(record)).encode('utf-8', 'replace')
+        durability = self.durability
+        with self._lock:
+            # Create path and open file handler if it is not opened yet.
+            if self.__handler is None:
+                # Check the directories.
+                dirname = os.path.dirname(self._path)
+                if os.path.exists(dirname) is False:
+                    os.makedirs(dirname)
+                # Make file.
+                if self.atomic is True:
+                    self.__handler = Appender(self._path, limit=self.limit)
+                else:
+                    self.__handler = open(self._path, 'ab')
+                self._size = os.fstat(self.__handler.fileno()).st_size
+                self._last = time.monotonic()
+            self.__handler.write(data)
+            self._size += len(data)
+            sync = False
+            if durability == 'periodic':
+                sync = time.monotonic() - self._last >= self.period
+                # Records that are not synchronized now are synchronized by
+                # the timer even if the application goes idle.
+                if sync is True:
+                    self._cancel()
+                elif self._timer is None:
+                    self._timer = threading.Timer(self.period, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            elif durability == 'always':
+                sync = True
+            elif durability == 'fsync-on-error':
+                sync = getattr(record, 'level', None) in self.errors
+            self._written += 1
+            if sync is True or durability in ('flush', 'fsync-on-error'):
+                self.__handler.flush()
+                self._flushed = self._written
+            written = self._written
+            handler = self.__handler
 
         # Update statistics that is requeired for other logger functionality.
         self._modified = dt.datetime.now()
-        self._size = os.stat(self._path).st_size
+        handles.touch(self)
+
+        # Synchronization is made out of the write lock, so other threads
+        # can write while the disk is busy and join the next group.
+        if sync is True:
+            self._sync(handler, written)
         pass
 
+    def flush(self):
+        """Pass buffered records to OS and synchronize them if needed."""
+        with self._lock:
+            self._cancel()
+            handler = self.__handler
+            if handler is None:
+                return
+            handler.flush()
+            written = self._flushed = self._written
+        if self.durability not in ('none', 'flush'):
+            self._sync(handler, written)
+        pass
 
-class Email(Branch):
-    """Represents email output.
+    def close(self):
+        """Close the file and make this output inactive."""
+        super().close()
+        self.release()
+        pass
 
-    Gives access to SMTP server and email objects used to send messages,
-    notifications and alarms.
+    def release(self, blocking=True):
+        """Close the file handler, it is opened again on the next write.
+
+        Parameters
+        ----------
+        blocking : bool, optional
+            The argument is used to wait while file is busy with writing.
+
+        Returns
+        -------
+        result : bool
+            True if handler is closed, False if file is busy.
+        """
+        if self._lock.acquire(blocking=blocking) is False:
+            return False
+        try:
+            handler, self.__handler = self.__handler, None
+            if handler is not None:
+                handler.flush()
+                if self.durability not in ('none', 'flush'):
+                    os.fsync(handler.fileno())
+                handler.close()
+        finally:
+            self._lock.release()
+            handles.remove(self)
+        return True
+
+    def _sync(self, handler, written):
+        # Synchronize the file unless another thread already did it after
+        # the given write.
+        with self._sync_lock:
+            if self._synced >= written:
+                return
+            # All records passed to OS so far are synchronized together.
+            written = self._flushed
+            try:
+                os.fsync(handler.fileno())
+            except (OSError, ValueError):
+                # File was closed by the rotation.
+                return
+            self._synced = written
+            self._last = time.monotonic()
+        pass
+
+    def _cancel(self):
+        # Stop the timer of periodic synchronization.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pass
+
+    def fork(self):
+        """Open own file handler or new file in the child process."""
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._timer = None
+        if self.perpid is True:
+            self.new()
+        else:
+            self.__handler = None
+        pass
+
+
+class Spool():
+    """Append-only file keeping the records that were not delivered.
+
+    Each entry is stored as its length and bytes. Entries are read from the
+    oldest one and the file is truncated when all of them are delivered. The
+    file is kept between runs, so records left by the previous run are
+    delivered as well. Entry cut by the crash at the end of the file is
+    dropped.
 
     Parameters
     ----------
-    root : Output
-        Used to set `root` attribute.
-    status : bool, optional
-        Used to open or close the output.
-    address : str, optional
-        Used to set the `email` attribute.
-    host : str, optional
-        Used to set the `host` attribute.
-    port : str or int, optional
-        Used to set the `port` attribute.
-    tls : bool, optional
-        Used to set `tls` attribute.
-    user : str, optional
-        Used to set `user` attribute.
-    password : str, optional
-        Used to pass `password` argument to `connect()` method.
-    recipients : str or list, optional
-        Used to set `recipients` attribute.
+    path : str
+        Used to set `path` attribute.
+    maxsize : int, optional
+        Used to set `maxsize` attribute.
 
     Attributes
     ----------
-    root : Root
-        Low-level output that is a root of this branch.
-    status : bool
-        Status for this particular output.
-    address : str
-        The email address using to send messages.
-    host : str
-        The host on which SMTP server is running.
-    port : str or int, optional
-        The port on which SMTP server can be reached.
-    tls : bool
-        The flag of TLS channel enabled.
-    user : str
-        The username using to login to SMTP server.
-    recipients : str or list
-        The one or more email addresses who will receive the messages.
+    path : str
+        Path to the spool file.
+    maxsize : int
+        Maximum size of the file in bytes. Entries that do not fit are
+        dropped. The default is 100 MiB.
+    dropped : int
+        Number of entries dropped because the file was full.
     """
 
-    def __init__(self, root, status=False, address=None, host=None, port=None,
-                 tls=None, user=None, password=None, recipients=None):
-        super().__init__(root, status=status)
-        self.address = None
-        self.host = None
-        self.port = None
-        self.tls = None
-        self.user = None
-        self.password = None
-        self.recipients = None
-        self.configure(address=address, host=host, port=port, tls=tls,
-                       user=user, password=password, recipients=recipients)
+    prefix = struct.Struct('<I')
+
+    def __init__(self, path, maxsize=1024*1024*100):
+        self.path = path
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._offset = 0
+        dirname = os.path.dirname(path)
+        if os.path.exists(dirname) is False:
+            os.makedirs(dirname)
+        self._handler = open(path, 'a+b')
+        self._size = self._handler.seek(0, os.SEEK_END)
+        self._repair()
         pass
 
-    def configure(self, address=None, host=None, port=None, tls=None,
-                  user=None, password=None, recipients=None):
-        """Configure SMTP server connection and email parameters.
+    @property
+    def pending(self):
+        """Get the flag showing that spool has undelivered entries."""
+        return self._offset < self._size
+
+    def append(self, entries):
+        """Add entries to the end of the spool.
 
         Parameters
         ----------
-        address : str, optional
-            Used to set the `email` attribute.
-        host : str, optional
-            Used to set the `host` attribute.
-        port : str or int, optional
-            Used to set the `port` attribute.
-        tls : bool, optional
-            Used to set `tls` attribute.
-        user : str, optional
-            Used to set `user` attribute.
-        password : str, optional
-            Used to pass `password` argument to `connect()`
-            method.
-        recipients : str or list, optional
-            Used to set `recipients` attribute.
+        entries : list
+            The bytes that must be kept.
         """
-        if isinstance(host, str) is True:
-            self.host = host
-        if isinstance(port, int) is True:
-            self.port = port
-        if isinstance(tls, bool) is True:
-            self.tls = tls
+        chunks = []
+        with self._lock:
+            size = self._size
+            for data in entries:
+                length = self.prefix.size + len(data)
+                if size + length > self.maxsize:
+                    self.dropped += 1
+                    continue
+                chunks.append(self.prefix.pack(len(data)))
+                chunks.append(data)
+                size += length
+            self._handler.seek(0, os.SEEK_END)
+            self._handler.write(b''.join(chunks))
+            self._handler.flush()
+            self._size = size
+        pass
 
-        if isinstance(user, str) is True:
-            self.user = user
-        if isinstance(address, str) is True:
-            self.address = address
-        if isinstance(recipients, (str, list)) is True:
-            if isinstance(recipients, str) is True:
+    def read(self, count):
+        """Get the oldest undelivered entries.
+
+        Parameters
+        ----------
+        count : int
+            Maximum number of entries.
+
+        Returns
+        -------
+        entries : list
+            The bytes of the entries.
+        offset : int
+            The position after the entries that must be passed to
+            `commit()` when entries are delivered.
+        """
+        entries = []
+        with self._lock:
+            offset = self._offset
+            self._handler.seek(offset)
+            while len(entries) < count and offset < self._size:
+                head = self._handler.read(self.prefix.size)
+                if len(head) < self.prefix.size:
+                    self._cut(offset)
+                    break
+                length, = self.prefix.unpack(head)
+                data = self._handler.read(length)
+                if len(data) < length:
+                    self._cut(offset)
+                    break
+                entries.append(data)
+                offset += self.prefix.size + length
+        return entries, offset
+
+    def commit(self, offset):
+        """Mark entries up to the offset as delivered.
+
+        Parameters
+        ----------
+        offset : int
+            The position returned by `read()`.
+        """
+        with self._lock:
+            self._offset = offset
+            if self._offset >= self._size:
+                self._handler.truncate(0)
+                self._offset = 0
+                self._size = 0
+        pass
+
+    def close(self):
+        """Close the spool file."""
+        with self._lock:
+            self._handler.close()
+        pass
+
+    def _repair(self):
+        # Find the end of the last complete entry, so entries appended in
+        # this run do not follow the partial one.
+        offset = 0
+        self._handler.seek(0)
+        while offset < self._size:
+            head = self._handler.read(self.prefix.size)
+            if len(head) < self.prefix.size:
+                break
+            length, = self.prefix.unpack(head)
+            if offset + self.prefix.size + length > self._size:
+                break
+            offset = self._handler.seek(length, os.SEEK_CUR)
+        if offset < self._size:
+            self._cut(offset)
+        pass
+
+    def _cut(self, offset):
+        # Drop the partial entry at the end of the file.
+        self._handler.truncate(offset)
+        self._size = offset
+        pass
+
+
+class Breaker():
+    """Circuit breaker tracking the health of the output backend.
+
+    Breaker is closed while backend works well. It is opened (tripped) when
+    the number of consecutive failures reaches the limit or when the average
+    latency of the calls exceeds the limit. Latency is checked only after
+    the first `samples` calls, so one slow call does not open the breaker.
+    While it is open no calls are
+    made. When the cooldown is elapsed breaker is half-open and allows one
+    probe call: success closes the breaker, failure opens it again with the
+    cooldown twice longer.
+
+    Parameters
+    ----------
+    errors : int, optional
+        Used to set `errors` attribute.
+    latency : int or float, optional
+        Used to set `latency` attribute.
+    cooldown : int or float, optional
+        Used to set `cooldown` attribute.
+    maxcooldown : int or float, optional
+        Used to set `maxcooldown` attribute.
+
+    Attributes
+    ----------
+    errors : int
+        Number of consecutive failures that opens the breaker. The default
+        is 3.
+    latency : float
+        Average number of seconds per call that opens the breaker. When it
+        is `None` then latency is not tracked. The default is 10.
+    cooldown : float
+        Number of seconds before the first probe. The default is 30.
+    maxcooldown : float
+        Maximum number of seconds between the probes. The default is 600.
+    state : str
+        One of `closed`, `open` or `half-open`.
+    trips : int
+        Number of times the breaker was opened.
+    """
+
+    weight = 0.2
+    samples = 5
+
+    def __init__(self, errors=3, latency=10, cooldown=30, maxcooldown=600):
+        self.errors = errors
+        self.latency = latency
+        self.cooldown = cooldown
+        self.maxcooldown = maxcooldown
+        self.state = 'closed'
+        self.trips = 0
+        self._failures = 0
+        self._average = 0.0
+        self._calls = 0
+        self._opened = 0
+        self._until = 0
+        pass
+
+    @property
+    def average(self):
+        """Get the average latency of the calls in seconds."""
+        return self._average
+
+    def allow(self):
+        """Check whether the call can be made now.
+
+        Returns
+        -------
+        result : bool
+            True if breaker is closed or if it is time for the probe.
+        """
+        if self.state == 'open' and time.monotonic() >= self._until:
+            self.state = 'half-open'
+            return True
+        return self.state == 'closed'
+
+    def remaining(self):
+        """Get the number of seconds before the next probe."""
+        if self.state == 'open':
+            return max(0, self._until - time.monotonic())
+        return 0
+
+    def success(self, duration):
+        """Register the successful call.
+
+        Parameters
+        ----------
+        duration : float
+            Number of seconds the call took.
+        """
+        self._failures = 0
+        self._calls += 1
+        if self.state == 'half-open' or self._calls == 1:
+            self.state = 'closed'
+            self._average = duration
+        else:
+            weight = self.weight
+            self._average = self._average * (1 - weight) + duration * weight
+        if (self.latency is not None and self._calls >= self.samples
+           and self._average > self.latency):
+            self.trip()
+        else:
+            self._opened = 0
+        pass
+
+    def failure(self):
+        """Register the failed call."""
+        self._failures += 1
+        if self.state == 'half-open' or self._failures >= self.errors:
+            self.trip()
+        pass
+
+    def probe(self):
+        """Allow the probe call at once if the breaker is open."""
+        if self.state == 'open':
+            self._until = 0
+        pass
+
+    def trip(self):
+        """Open the breaker."""
+        cooldown = min(self.maxcooldown, self.cooldown * 2 ** self._opened)
+        self.state = 'open'
+        self.trips += 1
+        self._opened += 1
+        self._failures = 0
+        self._until = time.monotonic() + cooldown
+        pass
+
+
+class Spooled(Branch):
+    """Parent class for outputs that keep undelivered data in the spool.
+
+    When the backend of the output fails, data is put to the spool file
+    instead of being lost, and the output is not disabled. Spool is replayed
+    by batches in the background with exponential backoff until the backend
+    recovers. While the spool is not empty new data is put to the spool as
+    well to keep the order. Data is delivered at least once.
+
+    Health of the backend is tracked by the circuit breaker. When backend
+    fails or becomes slow the breaker is opened and all data goes to the
+    spool, so the application is not slowed down. Replay of the spool is
+    used as the probe that closes the breaker when backend is back.
+
+    Subclasses must implement `deliver()` and define `faults` - the
+    exceptions meaning that backend is temporarily unavailable. Other errors
+    mean that backend rejects the data, so they are raised to the caller or
+    the rejected data is dropped from the spool. Use `transient()` when the
+    exception type is not enough to tell it. Data is passed to the backend
+    as it is and serialized by `encode()` only when it goes to the spool,
+    so subclasses delivering anything but bytes must implement `encode()`
+    and `decode()`.
+
+    Attributes
+    ----------
+    spool : Spool
+        The spool of undelivered data or `None` when nothing failed yet.
+    maxspool : int
+        Maximum size of the spool file in bytes. The default is 100 MiB.
+    backoff : float
+        Maximum number of seconds between the attempts to replay the spool.
+        The default is 300.
+    breaker : Breaker
+        The circuit breaker of the backend.
+    dropped : int
+        Number of spooled entries dropped because backend rejected them.
+    """
+
+    faults = (OSError,)
+    batch = 100
+
+    def __init__(self, root, status=False):
+        super().__init__(root, status=status)
+        self.spool = None
+        self.maxspool = 1024*1024*100
+        self.backoff = 300
+        self.breaker = Breaker()
+        self.dropped = 0
+        self._delivery = threading.RLock()
+        self._attempts = 0
+        self._retry = None
+        pass
+
+    @property
+    def pending(self):
+        """Get the flag showing that spool has undelivered data."""
+        return self.spool is not None and self.spool.pending is True
+
+    def put(self, data):
+        """Deliver the data or put it to the spool if backend fails.
+
+        Parameters
+        ----------
+        data : object
+            The data to deliver.
+        """
+        # Application never waits for the replay running in the background,
+        # data just goes to the spool after the replayed one.
+        if self._delivery.acquire(blocking=False) is True:
+            try:
+                if self.pending is False and self.breaker.allow() is True:
+                    start = time.perf_counter()
+                    try:
+                        self.deliver([data])
+                    except Exception as error:
+                        # Rejected data goes to the caller as it is.
+                        if self.transient(error) is False:
+                            raise
+                        name = self.__class__.__name__.lower()
+                        self._report('warning', f'SPOOL {name} is used: '
+                                     f'{error.__class__.__name__}: {error}')
+                        self._check(self.breaker.failure)
+                    else:
+                        duration = time.perf_counter() - start
+                        self._check(self.breaker.success, duration)
+                        return
+            finally:
+                self._delivery.release()
+        self.defer([data])
+        pass
+
+    def defer(self, entries):
+        """Put the data to the spool and plan the replay.
+
+        Parameters
+        ----------
+        entries : list
+            The data to deliver.
+        """
+        entries = [self.encode(data) for data in entries]
+        self._open_spool()
+        self.spool.append(entries)
+        self._schedule()
+        pass
+
+    def deliver(self, entries):
+        """Deliver the data to the backend.
+
+        Parameters
+        ----------
+        entries : list
+            The data to deliver.
+        """
+        raise NotImplementedError
+
+    def encode(self, data):
+        """Serialize the data that goes to the spool.
+
+        Parameters
+        ----------
+        data : object
+            The data to deliver.
+
+        Returns
+        -------
+        entry : bytes
+            The serialized data.
+        """
+        return data
+
+    def decode(self, entry):
+        """Get the data back from the spool entry.
+
+        Parameters
+        ----------
+        entry : bytes
+            The serialized data.
+
+        Returns
+        -------
+        data : object
+            The data to deliver.
+        """
+        return entry
+
+    def transient(self, error):
+        """Check whether the error means that backend is unavailable.
+
+        Parameters
+        ----------
+        error : Exception
+            The error raised by `deliver()`.
+
+        Returns
+        -------
+        result : bool
+            True if delivery must be tried again later, False if backend
+            rejects the data.
+        """
+        return isinstance(error, self.faults)
+
+    def replay(self):
+        """Deliver the data from the spool by batches.
+
+        When backend rejects the batch, entries are delivered one by one to
+        find and drop the rejected ones. Entries of that batch delivered
+        before the rejected one can be delivered twice.
+
+        Returns
+        -------
+        result : bool
+            True if the whole spool is delivered.
+        """
+        with self._delivery:
+            self._retry = None
+            batch = self.batch
+            while self.pending is True:
+                if self.breaker.allow() is False:
+                    self._schedule()
+                    return False
+                entries, offset = self.spool.read(batch)
+                # Partial entry at the end of the spool was dropped.
+                if len(entries) == 0:
+                    break
+                start = time.perf_counter()
+                try:
+                    # Entry that can not be decoded is rejected as well.
+                    self.deliver([self.decode(entry) for entry in entries])
+                except Exception as error:
+                    if self.transient(error) is True:
+                        self._check(self.breaker.failure)
+                        self._attempts += 1
+                        self._schedule()
+                        return False
+                    if len(entries) > 1:
+                        batch = 1
+                        continue
+                    self._reject(error)
+                    self.spool.commit(offset)
+                    continue
+                duration = (time.perf_counter() - start) / len(entries)
+                self._check(self.breaker.success, duration)
+                self.spool.commit(offset)
+                batch = self.batch
+            self._attempts = 0
+        return True
+
+    def prefork(self):
+        """Do nothing, data is delivered by the parent process."""
+        pass
+
+    def drain(self):
+        """Try to deliver the spool at once without waiting for cooldown.
+
+        Used at exit, so data is not left in the spool until the next run
+        when backend is available.
+
+        Returns
+        -------
+        result : bool
+            True if the whole spool is delivered.
+        """
+        if self.pending is False:
+            return True
+        if self._retry is not None:
+            self._retry.cancel()
+        self.breaker.probe()
+        return self.replay()
+
+    def recover(self):
+        """Plan the replay of the spool left by the previous run."""
+        name = self.__class__.__name__.lower()
+        path = os.path.join(self.root.file.dir,
+                            f'{self.root.logger.name}.{name}.spool')
+        if self.spool is not None or os.path.exists(path) is True:
+            self._open_spool()
+            if self.pending is True:
+                self._attempts = 0
+                self._schedule()
+        pass
+
+    def fork(self):
+        """Drop the replay of the parent process and use own spool."""
+        self._delivery = threading.RLock()
+        self._retry = None
+        if self.spool is not None:
+            self.spool = Spool(pidpath(self.spool.path),
+                               maxsize=self.maxspool)
+        pass
+
+    def _open_spool(self):
+        # Spool is placed in the output file folder.
+        if self.spool is None:
+            name = self.__class__.__name__.lower()
+            path = os.path.join(self.root.file.dir,
+                                f'{self.root.logger.name}.{name}.spool')
+            self.spool = Spool(path, maxsize=self.maxspool)
+        pass
+
+    def _check(self, func, *args):
+        # Register the call in the breaker and report when its state is
+        # changed.
+        state = self.breaker.state
+        func(*args)
+        if self.breaker.state != state and self.breaker.state != 'half-open':
+            name = self.__class__.__name__.lower()
+            average = self.breaker.average
+            message = (f'BREAKER {name} is {self.breaker.state}, '
+                       f'latency={average:.3f}s, trips={self.breaker.trips}')
+            if self.breaker.state == 'open':
+                self._report('warning', message)
+            else:
+                self._report('info', message)
+        pass
+
+    def _reject(self, error):
+        # Entry will never be accepted by backend, so it is dropped to let
+        # the rest of the spool go.
+        self.dropped += 1
+        name = self.__class__.__name__.lower()
+        self._report('warning', f'SPOOL {name} entry is dropped: '
+                                f'{error.__class__.__name__}: {error}')
+        pass
+
+    def _report(self, rectype, message):
+        # State of the output is not the error of the application, so it is
+        # written as a plain record. It is not counted, does not raise an
+        # alarm and can not break the execution from the replay thread.
+        self.root.logger.record(rectype, message)
+        pass
+
+    def _schedule(self):
+        # Plan the replay if it is not planned yet. Replay is not made
+        # before the breaker allows the probe.
+        if self._retry is None:
+            delay = min(self.backoff, 2 ** self._attempts)
+            delay = max(delay, self.breaker.remaining())
+            self._retry = threading.Timer(delay, self.replay)
+            self._retry.daemon = True
+            self._retry.start()
+        pass
+
+
+class Email(Spooled):
+    """Represents email output.
+
+    Gives access to SMTP server and email objects used to send messages,
+    notifications and alarms. Messages that can not be sent because SMTP
+    server is not available are kept in the spool and sent later.
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    address : str, optional
+        Used to set the `email` attribute.
+    host : str, optional
+        Used to set the `host` attribute.
+    port : str or int, optional
+        Used to set the `port` attribute.
+    tls : bool, optional
+        Used to set `tls` attribute.
+    user : str, optional
+        Used to set `user` attribute.
+    password : str, optional
+        Used to pass `password` argument to `connect()` method.
+    recipients : str or list, optional
+        Used to set `recipients` attribute.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    address : str
+        The email address using to send messages.
+    host : str
+        The host on which SMTP server is running.
+    port : str or int, optional
+        The port on which SMTP server can be reached.
+    tls : bool
+        The flag of TLS channel enabled.
+    user : str
+        The username using to login to SMTP server.
+    recipients : str or list
+        The one or more email addresses who will receive the messages.
+    attachments : list
+        Paths to additional files that are attached to each alarm e.g.
+        profiles.
+    """
+
+    writable = False
+    permanent = (smtplib.SMTPRecipientsRefused, smtplib.SMTPNotSupportedError)
+
+    def __init__(self, root, status=False, address=None, host=None, port=None,
+                 tls=None, user=None, password=None, recipients=None):
+        super().__init__(root, status=status)
+        self.address = None
+        self.host = None
+        self.port = None
+        self.tls = None
+        self.user = None
+        self.password = None
+        self.recipients = None
+        self.attachments = []
+        self._server = None
+        self.configure(address=address, host=host, port=port, tls=tls,
+                       user=user, password=password, recipients=recipients)
+        pass
+
+    def configure(self, address=None, host=None, port=None, tls=None,
+                  user=None, password=None, recipients=None):
+        """Configure SMTP server connection and email parameters.
+
+        Parameters
+        ----------
+        address : str, optional
+            Used to set the `email` attribute.
+        host : str, optional
+            Used to set the `host` attribute.
+        port : str or int, optional
+            Used to set the `port` attribute.
+        tls : bool, optional
+            Used to set `tls` attribute.
+        user : str, optional
+            Used to set `user` attribute.
+        password : str, optional
+            Used to pass `password` argument to `connect()`
+            method.
+        recipients : str or list, optional
+            Used to set `recipients` attribute.
+        """
+        if isinstance(host, str) is True:
+            self.host = host
+        if isinstance(port, int) is True:
+            self.port = port
+        if isinstance(tls, bool) is True:
+            self.tls = tls
+
+        if isinstance(user, str) is True:
+            self.user = user
+        # Password is kept to connect again after the failure.
+        if isinstance(password, str) is True:
+            self.password = password
+        if isinstance(address, str) is True:
+            self.address = address
+        if isinstance(recipients, (str, list)) is True:
+            if isinstance(recipients, str) is True:
                 if ',' in recipients:
                     recipients = recipients.replace(' ', '').split(',')
                 else:
                     recipients = [recipients]
             self.recipients = recipients
 
-        if (host is not None or port is not None or
-            user is not None or password is not None):
-            try:
-                self.connect(password)
-            except Exception:
-                self.root.logger.warning()
-                self._status = False
+        if (host is not None or port is not None or
+            user is not None or password is not None):
+            try:
+                self.connect()
+            except Exception as error:
+                # When server is not available now messages are kept in the
+                # spool until it is back.
+                self.root.logger.warning()
+                if self.transient(error) is False:
+                    self._status = False
+            else:
+                self.recover()
+        pass
+
+    @you_shall_not_pass
+    def connect(self, password=None):
+        """Connect to SMTP server.
+
+        Parameters
+        ----------
+        password : str, optional
+            Used as password in SMTP server connection. By default the
+            password given to `configure()` is used.
+        """
+        password = password or self.password
+        # You cannot connect to unknown host.
+        if (hasattr(self, 'host') is False or
+            isinstance(self.host, str) is False):
+            raise AttributeError('incorrect host')
+
+        # You must connect to certain port.
+        if (hasattr(self, 'port') is False or
+            isinstance(self.port, int) is False):
+            raise AttributeError('incorrect port')
+
+        # Creating connection with or without TLS.
+        self._server = smtplib.SMTP(self.host, self.port)
+        if self.tls is True:
+            self._server.starttls()
+
+        # Login to server.
+        if self.user is not None:
+            if password is None:
+                raise AttributeError('can not login without a password')
+
+            self._server.login(self.user, password)
+        pass
+
+    @you_shall_not_pass
+    def disconnect(self):
+        """Disconnect from SMTP server."""
+        if self._server is not None:
+            server, self._server = self._server, None
+            server.quit()
+        pass
+
+    @you_shall_not_pass
+    def send(self, subject, text, recipients=None, attachment=None,
+             type='html'):
+        """Send regular message to the listed email addresses.
+
+        Parameters
+        ----------
+        subject : str
+            Used for message subject.
+        text : str, MIMEText, list of str or list of MIMEText
+            Used for messages text.
+        recipients : str or list, optional
+            Used for message receivers.
+        attachment : str or list of str, optional
+            Used for path to message attachment.
+        type : str, optional
+            The argument for MIMEText as _subtype. So actually it defines the
+            type of the whole message (e.g. HTML).
+        """
+        # Message from.
+        sender = self.address
+        # Mesasge to. Must be a string with list of email addresses separated
+        # with comma.
+        recipients = recipients or self.recipients
+        # Message can be send only when there is at least one recipient.
+        if recipients is not None:
+            if isinstance(recipients, list) is True:
+                recipients = ', '.join(recipients)
+
+            message = MIMEMultipart()
+            message['From'] = sender
+            message['To'] = recipients
+            message['Subject'] = subject
+
+            # Message is MIMEMultipart so text must be attached as a part.
+            if text is not None:
+                if isinstance(text, list) is False:
+                    text = [text]
+                for item in text:
+                    if isinstance(item, MIMEText) is False:
+                        item = MIMEText(item, _subtype=type)
+                    message.attach(item)
+
+            # Now include all attachments.
+            if attachment is not None:
+                if isinstance(attachment, list) is False:
+                    attachment = [attachment]
+                for item in attachment:
+                    filename = os.path.basename(item)
+                    part = MIMEBase("application", "octet-stream")
+                    part.set_payload(open(item, "rb").read())
+                    encoders.encode_base64(part)
+                    part.add_header("Content-Disposition",
+                                    f"attachment; filename={filename}")
+                    message.attach(part)
+
+            # Finally send message or keep it until server is available.
+            self.put(message)
+        pass
+
+    def deliver(self, entries):
+        """Send the messages to SMTP server.
+
+        Parameters
+        ----------
+        entries : list
+            The messages.
+        """
+        try:
+            if self._server is None:
+                self.connect()
+            for message in entries:
+                self._server.send_message(message)
+        except self.faults:
+            # Broken connection must be created again next time.
+            server, self._server = self._server, None
+            if server is not None:
+                server.close()
+            raise
+        pass
+
+    def encode(self, message):
+        """Serialize the message for the spool.
+
+        Parameters
+        ----------
+        message : MIMEMultipart
+            The message to send.
+
+        Returns
+        -------
+        entry : bytes
+            The message as bytes.
+        """
+        return message.as_bytes()
+
+    def decode(self, entry):
+        """Get the message back from the spool.
+
+        Parameters
+        ----------
+        entry : bytes
+            The message as bytes.
+
+        Returns
+        -------
+        message : Message
+            The message to send.
+        """
+        return message_from_bytes(entry)
+
+    def transient(self, error):
+        """Check whether the error means that SMTP server is unavailable.
+
+        Refused recipients, failed authentication and other 5xx replies are
+        permanent, so such messages are not sent again.
+
+        Parameters
+        ----------
+        error : Exception
+            The error raised by `deliver()`.
+
+        Returns
+        -------
+        result : bool
+            True if message must be sent again later.
+        """
+        if isinstance(error, self.permanent) is True:
+            return False
+        if isinstance(error, smtplib.SMTPResponseException) is True:
+            return error.smtp_code < 500
+        return isinstance(error, self.faults)
+
+    def fork(self):
+        """Drop the SMTP connection of the parent process."""
+        super().fork()
+        # Connection is not closed, it is still used by the parent.
+        self._server = None
+        pass
+
+    @you_shall_not_pass
+    def alarm(self, with_log=True):
+        """Send special alarm message.
+
+        That message has the name of the application in the subject, log
+        header in the text and also log file as an attahcment if it is enabled
+        and if parameter with_log is set to True.
+        That method is a generic way used in Logger write methods to inform
+        user about occured application errors. But it also can be used by
+        user outside of the errors.
+
+        Parameters
+        ----------
+        with_log : bool, optional
+            Used for attachment of logging output file to
+            the alarm message. The default is True.
+        """
+        subject = f'ALARM in {self.root.logger.app}!'
+
+        text = self.root.logger.header.create()
+        text = f'<pre>{text}</pre>'
+        text = MIMEText(text, 'html')
+
+        attachment = []
+        if with_log is True and self.root.file.status is True:
+            attachment.append(self.root.file.path)
+        if self.root.recorder.status is True:
+            attachment.append(self.root.recorder.save())
+        for path in self.attachments:
+            if os.path.exists(path) is True:
+                attachment.append(path)
+        attachment = attachment or None
+
+        self.send(subject, text, recipients=self.recipients,
+                  attachment=attachment)
+        pass
+
+    @you_shall_not_pass
+    def write(self, record):
+        """Write record (not used)."""
+        pass
+
+
+class Recorder(Branch):
+    """Represents in-memory flight recorder output.
+
+    Recorder keeps the last records in a ring buffer placed in a memory
+    mapped file, so writing a record costs only a memory copy and the buffer
+    survives the crash of the process. Records filtered out by the logger
+    (e.g. DEBUG) are recorded as well. When an error occurs the filtered
+    records that were not released yet are written to the log, and the whole
+    buffer is saved and attached to alarms. The buffer is also released on
+    unhandled exception and on the signal if it is configured. Signal
+    handler only passes the request to the recorder thread, so the signal
+    that interrupts the writing of the log can not lock it.
+
+    File starts with the header containing the magic string, number of
+    slots, size of the slot and the index of the next record. Each slot
+    contains the length of the record, the flag showing whether record was
+    filtered and the record itself truncated to the slot size. Filtered
+    records are not even created as records, they are kept as the
+    timestamp followed by the raw fields separated by zero bytes and
+    formatted only when the buffer is dumped. File and object names are not
+    known for them, since the frames are not inspected.
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    size : int, optional
+        Used to set `size` attribute.
+    slot : int, optional
+        Used to set `slot` attribute.
+    path : str, optional
+        Used to set `path` attribute.
+    signal : int, optional
+        Used to set `signal` attribute.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    size : int
+        Number of the last records kept in the buffer. The default is 1000.
+    slot : int
+        Maximum size of one record in bytes. The default is 512.
+    path : str
+        Path to the memory mapped file. By default it is the *.ring* file
+        with the name of the logger and the process ID in the output file
+        folder, so processes using the same logger name do not share it.
+        Such file is removed when the recorder is closed e.g. at exit, so
+        only the files of the crashed processes are left.
+    signal : int
+        Number of the signal that releases the buffer. The default is None.
+    """
+
+    magic = b'PPRING01'
+    strings = False
+    layout = struct.Struct('<8sIIQ')
+    prefix = struct.Struct('<HB')
+    raw = struct.Struct('<q')
+
+    def __init__(self, root, status=False, size=1000, slot=512, path=None,
+                 signal=None):
+        super().__init__(root, status=False)
+        self.size = size
+        self.slot = slot
+        self.path = path
+        self.signal = signal
+        self._default = path is None
+        self._lock = threading.Lock()
+        self._handler = None
+        self._map = None
+        self._index = 0
+        self._released = 0
+        self._excepthook = None
+        self._sighandler = None
+        self._requests = None
+        if status is True:
+            self.open()
+        pass
+
+    def configure(self, size=None, slot=None, path=None, signal=None):
+        """Configure flight recorder. The buffer is created again.
+
+        Parameters
+        ----------
+        size : int, optional
+            Used to set `size` attribute.
+        slot : int, optional
+            Used to set `slot` attribute.
+        path : str, optional
+            Used to set `path` attribute.
+        signal : int, optional
+            Used to set `signal` attribute.
+        """
+        status = self.status
+        self.close()
+        if isinstance(size, int) is True:
+            self.size = size
+        if isinstance(slot, int) is True:
+            self.slot = slot
+        if isinstance(path, str) is True:
+            self.path = path
+            self._default = False
+        if isinstance(signal, int) is True:
+            self.signal = signal
+        if status is True:
+            self.open()
+        pass
+
+    def open(self):
+        """Create the buffer and make this output active."""
+        if self.status is True:
+            return
+        if self.path is None:
+            file = self.root.file
+            name = f'{self.root.logger.name}.ring'
+            self.path = pidpath(os.path.join(file.dir, name))
+        dirname = os.path.dirname(self.path)
+        if os.path.exists(dirname) is False:
+            os.makedirs(dirname)
+        length = self.layout.size + self.size * self.slot
+        self._handler = open(self.path, 'w+b')
+        self._handler.truncate(length)
+        self._map = mmap.mmap(self._handler.fileno(), length)
+        self.layout.pack_into(self._map, 0, self.magic, self.size,
+                              self.slot, 0)
+        self._index = 0
+        self._released = 0
+
+        # Unhandled exceptions and the signal release the buffer.
+        self._excepthook = sys.excepthook
+        sys.excepthook = self._handle_exception
+        if self.signal is not None:
+            try:
+                self._sighandler = signal.signal(self.signal,
+                                                 self._handle_signal)
+            except ValueError:
+                # Signals can be handled only in the main thread.
+                self._sighandler = None
+            else:
+                self._requests = queue.SimpleQueue()
+                thread = threading.Thread(target=self._serve,
+                                          args=(self._requests,),
+                                          name='pepperoni-recorder',
+                                          daemon=True)
+                thread.start()
+        super().open()
+        pass
+
+    def close(self):
+        """Close the buffer and make this output inactive."""
+        if self.status is False:
+            return
+        super().close()
+        if sys.excepthook == self._handle_exception:
+            sys.excepthook = self._excepthook
+        if self._requests is not None:
+            self._requests.put(False)
+            self._requests = None
+        if threading.current_thread() is threading.main_thread():
+            if self._sighandler is not None:
+                signal.signal(self.signal, self._sighandler)
+                self._sighandler = None
+        with self._lock:
+            self._map.close()
+            self._handler.close()
+            self._map = None
+            self._handler = None
+        # File of the process that finished cleanly is not needed.
+        if self._default is True:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        pass
+
+    @you_shall_not_pass
+    def write(self, record):
+        """Put the record to the buffer.
+
+        Parameters
+        ----------
+        record : Record
+            The record that must be recorded.
+        """
+        data = self.truncate(str(record)).encode('utf-8', 'replace')
+        self._put(data, False)
+        pass
+
+    @you_shall_not_pass
+    def write_raw(self, logger, rectype, message, arguments, error=False):
+        """Put the record filtered by the logger to the buffer.
+
+        Record object is not created, so only the time, the thread and the
+        raw message with its arguments are kept.
+
+        Parameters
+        ----------
+        logger : Logger
+            The logger that filtered the record.
+        rectype : str
+            The key of the record type.
+        message : str
+            The message template.
+        arguments : dict
+            The keyword arguments of the message.
+        error : bool, optional
+            The flag showing that error message template must be used.
+        """
+        template = logger.formatter.error if error is True else message
+        limit = self.slot
+        fields = {key: shorten(value, limit)
+                  for key, value in {**context.get(), **arguments}.items()}
+        data = self._pack(time.time_ns(), rectype, logger.name, '', '',
+                          threading.current_thread().name,
+                          shorten(template, limit), fields)
+        self._put(data, True)
+        pass
+
+    def _put(self, data, filtered):
+        # Copy the record to the next slot of the buffer.
+        data = data[:self.slot-self.prefix.size]
+        with self._lock:
+            if self._map is None:
+                return
+            index = self._index
+            offset = self.layout.size + (index % self.size) * self.slot
+            self.prefix.pack_into(self._map, offset, len(data), filtered)
+            offset += self.prefix.size
+            self._map[offset:offset+len(data)] = data
+            self._index = index + 1
+            struct.pack_into('<Q', self._map, 16, self._index)
+        pass
+
+    def flush(self):
+        """Flush the buffer to the disk."""
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+        pass
+
+    def fork(self):
+        """Use own buffer in the child process."""
+        self._lock = threading.Lock()
+        if self.status is True:
+            self.close()
+            if self._default is True:
+                self.path = None
+            else:
+                self.path = pidpath(self.path)
+            self.open()
+        pass
+
+    def dump(self, start=0, filtered=False):
+        """Get recorded records from the oldest to the newest.
+
+        Parameters
+        ----------
+        start : int, optional
+            The index of the first record that must be returned.
+        filtered : bool, optional
+            The argument is used to return only filtered records.
+
+        Returns
+        -------
+        records : list of str
+            The recorded records.
+        """
+        records = []
+        with self._lock:
+            if self._map is None:
+                return records
+            first = max(start, self._index - self.size, 0)
+            for index in range(first, self._index):
+                offset = self.layout.size + (index % self.size) * self.slot
+                length, flag = self.prefix.unpack_from(self._map, offset)
+                if filtered is True and flag == 0:
+                    continue
+                offset += self.prefix.size
+                data = bytes(self._map[offset:offset+length])
+                if flag == 0:
+                    records.append(data.decode('utf-8', 'replace'))
+                else:
+                    records.append(data)
+        # Raw records are formatted out of the lock.
+        return [self._unpack(record) if isinstance(record, bytes) else record
+                for record in records]
+
+    def release(self):
+        """Write filtered records that were not released yet to the log."""
+        if self.status is True:
+            index = self._index
+            records = self.dump(start=self._released, filtered=True)
+            self._released = index
+            if records:
+                logger = self.root.logger
+                logger.subhead('flight recorder')
+                for record in records:
+                    logger.write(record)
+                logger.bound()
+        pass
+
+    def save(self):
+        """Save the whole buffer to the text file.
+
+        Returns
+        -------
+        path : str
+            Path to the saved file.
+        """
+        path = f'{os.path.splitext(self.path)[0]}.flight.log'
+        with open(path, 'w') as fh:
+            fh.write(''.join(self.dump()))
+        return path
+
+    def _pack(self, timestamp, level, logname, flname, objname, thread,
+              template, arguments):
+        # Keep the raw fields of the record, so the filtered record is not
+        # formatted unless the buffer is dumped.
+        items = [level, logname or '', flname, objname, thread, template]
+        for key, value in arguments.items():
+            items.append(key)
+            items.append(str(value))
+        string = '\0'.join(items).encode('utf-8', 'replace')
+        return self.raw.pack(timestamp) + string
+
+    def _unpack(self, data):
+        # Format the raw record with the current record template.
+        timestamp, = self.raw.unpack_from(data)
+        items = data[self.raw.size:].decode('utf-8', 'replace').split('\0')
+        items += [''] * (6 - len(items))
+        level, logname, flname, objname, thread, template = items[:6]
+        arguments = dict(zip(items[6::2], items[7::2]))
+        logger = self.root.logger
+        forms = {'rectype': logger.rectypes.get(level, level.upper()),
+                 'level': level,
+                 'timestamp': timestamp,
+                 'isodate': clock.isodate(timestamp),
+                 'msdate': clock.msdate(timestamp),
+                 'utcdate': clock.utcdate(timestamp),
+                 'logname': logname,
+                 'flname': flname,
+                 'objname': objname,
+                 'thread': thread,
+                 'div': logger.formatter.div}
+        try:
+            message = template.format_map({**arguments, **forms})
+        except (KeyError, IndexError, ValueError):
+            message = template
+        forms = collections.defaultdict(str, arguments, **forms,
+                                        message=message)
+        try:
+            string = logger.formatter.record.format_map(forms)
+        except (IndexError, ValueError):
+            string = f'{forms["isodate"]}\t{forms["rectype"]}\t{message}\n'
+        return self.truncate(string)
+
+    def _handle_exception(self, *args):
+        # Release the buffer and call original hook.
+        try:
+            self.release()
+            self.flush()
+        finally:
+            self._excepthook(*args)
+        pass
+
+    def _handle_signal(self, signum, frame):
+        # Signal can interrupt the thread holding the locks of the outputs,
+        # so the buffer is released by the recorder thread. Queue can be
+        # used in the signal handler. Original handler is called if it is
+        # callable.
+        if self._requests is not None:
+            self._requests.put(True)
+        if callable(self._sighandler) is True:
+            self._sighandler(signum, frame)
+        pass
+
+    def _serve(self, requests):
+        # Release and save the buffer on each request until the recorder is
+        # closed.
+        while requests.get() is True:
+            try:
+                self.release()
+                self.save()
+            except Exception:
+                pass
+        pass
+
+
+class Binary(Branch):
+    """Represents compact binary file output.
+
+    Records are not formatted but stored as small structures with the
+    timestamp, identifiers of the interned strings (logger name, record type,
+    message template, call site and thread) and packed message arguments.
+    Each string is written to the file only once, the first time it is met.
+    So formatting is moved from the application to the reading time. Use
+    `python -m pepperoni.decode` to get text or JSON from the file.
+
+    File consists of entries starting with one byte tag. All integers are
+    variable length (LEB128), signed ones are zigzag encoded. Each logging
+    session starts with the magic string which resets the interned strings
+    and the timestamp. Tag `S` defines the string: identifier, length and
+    UTF-8 bytes. Tag `R` defines the record: difference of the timestamp in
+    nanoseconds with the previous record, identifiers of the logger name,
+    record type, template, file name, object name and thread name, and
+    number of arguments. Each argument is the identifier of its name, the
+    type code and the packed value. When the strings table reaches
+    `maxstrings` entries the new session is started, so messages with
+    varying text do not make the table grow for the life of the process.
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    path : str, optional
+        Used to set `path` attribute.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    path : str
+        Path to the binary file. By default it is the *.bin* file with the
+        name of the logger in the output file folder.
+    maxstrings : int
+        Maximum number of the interned strings in one session. The default
+        is 4096.
+    """
+
+    magic = b'PPBIN001'
+    errors = ('error', 'critical')
+    strings = False
+
+    def __init__(self, root, status=False, path=None):
+        super().__init__(root, status=status)
+        self.path = path
+        self.maxstrings = 4096
+        self._lock = threading.Lock()
+        self._handler = None
+        self._strings = {}
+        self._timestamp = 0
+        pass
+
+    def configure(self, path=None):
+        """Configure binary output.
+
+        Parameters
+        ----------
+        path : str, optional
+            Used to set `path` attribute.
+        """
+        if isinstance(path, str) is True:
+            self.close()
+            self.path = path
+            self.open()
+        pass
+
+    def close(self):
+        """Close the file and make this output inactive."""
+        super().close()
+        self.release()
+        pass
+
+    def release(self, blocking=True):
+        """Close the file, it is opened with new session on the next write.
+
+        Parameters
+        ----------
+        blocking : bool, optional
+            The argument is used to wait while file is busy with writing.
+
+        Returns
+        -------
+        result : bool
+            True if file is closed, False if it is busy.
+        """
+        if self._lock.acquire(blocking=blocking) is False:
+            return False
+        try:
+            if self._handler is not None:
+                self._handler.close()
+                self._handler = None
+        finally:
+            self._lock.release()
+            handles.remove(self)
+        return True
+
+    @you_shall_not_pass
+    def write(self, record):
+        """Write the record to the file.
+
+        Parameters
+        ----------
+        record : Record
+            The record that must be written.
+        """
+        arguments = {**record.fields, **record.arguments}
+        with self._lock:
+            if self._handler is None:
+                self._start()
+            elif len(self._strings) >= self.maxstrings:
+                self._session()
+            # Definitions of new strings must precede the record.
+            chunks = []
+            intern = functools.partial(self._intern, chunks=chunks)
+            delta = zigzag(record.timestamp - self._timestamp)
+            self._timestamp = record.timestamp
+            head = [b'R', varint(delta),
+                    intern(record.logname), intern(record.rectype),
+                    intern(record.template), intern(record.flname),
+                    intern(record.objname), intern(record.thread),
+                    varint(len(arguments))]
+            for name, value in arguments.items():
+                head.append(intern(name))
+                head.append(self._pack(value))
+            chunks.extend(head)
+            self._handler.write(b''.join(chunks))
+            if record.level in self.errors:
+                self._handler.flush()
+        handles.touch(self)
+        pass
+
+    def flush(self):
+        """Flush the file."""
+        with self._lock:
+            if self._handler is not None:
+                self._handler.flush()
+        pass
+
+    def fork(self):
+        """Use own file in the child process."""
+        self._lock = threading.Lock()
+        self._handler = None
+        if self.path is None:
+            file = self.root.file
+            self.path = os.path.join(file.dir, f'{self.root.logger.name}.bin')
+        self.path = pidpath(self.path)
+        pass
+
+    def _start(self):
+        # Open the file and start new session with empty strings table.
+        if self.path is None:
+            file = self.root.file
+            self.path = os.path.join(file.dir, f'{self.root.logger.name}.bin')
+        dirname = os.path.dirname(self.path)
+        if os.path.exists(dirname) is False:
+            os.makedirs(dirname)
+        self._handler = open(self.path, 'ab')
+        self._session()
+        pass
+
+    def _session(self):
+        # Start new session, strings are defined again after the magic.
+        self._handler.write(self.magic)
+        self._strings = {}
+        self._timestamp = 0
+        pass
+
+    def _intern(self, string, chunks):
+        # Get the encoded identifier of the string, define it when it is new.
+        id = self._strings.get(string)
+        if id is None:
+            id = self._strings[string] = varint(len(self._strings))
+            data = string.encode('utf-8', 'replace')
+            chunks.extend((b'S', id, varint(len(data)), data))
+        return id
+
+    def _pack(self, value):
+        # Pack the argument value with the type code.
+        if value is None:
+            return b'n'
+        elif isinstance(value, bool) is True:
+            return b'b\x01' if value is True else b'b\x00'
+        elif isinstance(value, int) is True:
+            return b'i' + varint(zigzag(value))
+        elif isinstance(value, float) is True:
+            return b'f' + struct.pack('<d', value)
+        data = str(value).encode('utf-8', 'replace')
+        return b's' + varint(len(data)) + data
+
+
+class Sender(Branch):
+    """Parent class for outputs sending records over the network.
+
+    Records are encoded in the calling thread and put to the bounded queue.
+    Background thread takes them from the queue in batches and sends them,
+    so the application never waits for the network. When sending fails the
+    connection is closed, records are returned to the queue and the thread
+    tries again with exponential backoff. When the queue is full the oldest
+    records are dropped and counted. When the spool is used then records
+    that failed to be sent are moved to the file instead of the queue and
+    sent again before new ones once the receiver is back.
+
+    Subclasses must implement `encode()`, `send()` and `disconnect()`.
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    batch : int, optional
+        Used to set `batch` attribute.
+    size : int, optional
+        Used to set `size` attribute.
+    backoff : int or float, optional
+        Used to set `backoff` attribute.
+    timeout : int or float, optional
+        Used to set `timeout` attribute.
+    spool : bool or str, optional
+        Path to the spool file. When it is True then the *.spool* file with
+        the name of the logger and the output in the output file folder is
+        used. The default is False which means that spool is not used.
+    maxspool : int, optional
+        Maximum size of the spool file in bytes.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    batch : int
+        Maximum number of records sent at once. The default is 100.
+    size : int
+        Maximum number of records kept in the queue. The default is 10000.
+    backoff : float
+        Maximum number of seconds between the attempts to send records.
+        The default is 60.
+    timeout : float
+        Number of seconds to wait for the network and for the queue to be
+        sent on flush. The default is 5.
+    dropped : int
+        Number of records dropped because the queue was full.
+    spool : Spool
+        The spool of records that failed to be sent or `None`.
+    """
+
+    strings = False
+
+    def __init__(self, root, status=False, batch=100, size=10000, backoff=60,
+                 timeout=5, spool=False, maxspool=1024*1024*100):
+        super().__init__(root, status=False)
+        self.batch = batch
+        self.size = size
+        self.backoff = backoff
+        self.timeout = timeout
+        self.dropped = 0
+        self.spool = None
+        self._spool = spool
+        self._maxspool = maxspool
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+        self._stopped = False
+        self._failures = 0
+        if status is True:
+            self.open()
+        pass
+
+    def open(self):
+        """Start the sending thread and make this output active."""
+        if self.status is True:
+            return
+        if self._spool is not False and self.spool is None:
+            path = self._spool
+            if path is True:
+                name = self.__class__.__name__.lower()
+                path = os.path.join(self.root.file.dir,
+                                    f'{self.root.logger.name}.{name}.spool')
+            self.spool = Spool(path, maxsize=self._maxspool)
+        self._stopped = False
+        name = f'pepperoni-{self.__class__.__name__.lower()}'
+        self._thread = threading.Thread(target=self._run, name=name,
+                                        daemon=True)
+        self._thread.start()
+        super().open()
+        # Records left by the previous run are sent at once.
+        if self.spool is not None and self.spool.pending is True:
+            self._wakeup.set()
+        pass
+
+    def close(self):
+        """Send the queue, stop the thread and make this output inactive."""
+        if self.status is False:
+            return
+        super().close()
+        self.flush()
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(self.timeout)
+        self._thread = None
+        self.disconnect()
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
         pass
 
     @you_shall_not_pass
-    def connect(self, password):
-        """Connect to SMTP server.
+    def write(self, record):
+        """Put the record to the queue.
 
         Parameters
         ----------
-        password : str
-            Used as password in SMTP server connection.
+        record : Record
+            The record that must be sent.
         """
-        # You cannot connect to unknown host.
-        if (hasattr(self, 'host') is False or
-            isinstance(self.host, str) is False):
-            raise AttributeError('incorrect host')
+        data = self.encode(record)
+        with self._lock:
+            if len(self._queue) >= self.size:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(data)
+            self._idle.clear()
+        if self._wakeup.is_set() is False:
+            self._wakeup.set()
+        pass
 
-        # You must connect to certain port.
-        if (hasattr(self, 'port') is False or
-            isinstance(self.port, int) is False):
-            raise AttributeError('incorrect port')
+    def flush(self):
+        """Wait until the queue is sent but not longer than timeout."""
+        if self._thread is not None and self._failures == 0:
+            self._wakeup.set()
+            self._idle.wait(self.timeout)
+        pass
 
-        # Creating connection with or without TLS.
-        self._server = smtplib.SMTP(self.host, self.port)
-        if self.tls is True:
-            self._server.starttls()
+    def prefork(self):
+        """Do nothing, queued records are sent by the parent process."""
+        pass
 
-        # Login to server.
-        if self.user is not None:
-            if password is None:
-                raise AttributeError('can not login without a password')
+    def fork(self):
+        """Start own sending thread and use own spool in the child process.
 
-            self._server.login(self.user, password)
+        Queued records belong to the parent process which sends them.
+        """
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._failures = 0
+        if self.spool is not None:
+            self.spool = Spool(pidpath(self.spool.path),
+                               maxsize=self._maxspool)
+        if self._thread is not None:
+            name = f'pepperoni-{self.__class__.__name__.lower()}'
+            self._thread = threading.Thread(target=self._run, name=name,
+                                            daemon=True)
+            self._thread.start()
         pass
 
-    @you_shall_not_pass
+    def encode(self, record):
+        """Get the bytes of the record that must be sent."""
+        raise NotImplementedError
+
+    def send(self, batch):
+        """Send the batch of encoded records.
+
+        Sent records must be removed from the batch, so only the rest is
+        returned to the queue if sending fails.
+        """
+        raise NotImplementedError
+
     def disconnect(self):
-        """Disconnect from SMTP server."""
-        if hasattr(self, '_server') is True:
-            self._server.quit()
+        """Close the connection."""
         pass
 
-    @you_shall_not_pass
-    def send(self, subject, text, recipients=None, attachment=None,
-             type='html'):
-        """Send regular message to the listed email addresses.
+    def _run(self):
+        # Send records until the output is closed. After the failure next
+        # attempt is made only when the backoff delay is elapsed.
+        retry = 0
+        while self._stopped is False:
+            if self._failures > 0:
+                delay = retry - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    self._wakeup.clear()
+                    continue
+            else:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            if self._drain() is False:
+                self._failures += 1
+                delay = min(self.backoff, 0.5 * 2 ** (self._failures - 1))
+                retry = time.monotonic() + delay
+            else:
+                self._failures = 0
+        pass
+
+    def _drain(self):
+        # Send all queued records by batches. Unsent records of the failed
+        # batch are moved to the spool or returned to the head of the queue.
+        while self._stopped is False:
+            # Spooled records are older, so they are sent first.
+            spool = self.spool
+            if spool is not None and spool.pending is True:
+                try:
+                    batch, offset = spool.read(self.batch)
+                    if len(batch) > 0:
+                        self.send(batch)
+                except Exception:
+                    self._spill(spool)
+                    self.disconnect()
+                    return False
+                spool.commit(offset)
+                continue
+            with self._lock:
+                if len(self._queue) == 0:
+                    self._idle.set()
+                    return True
+                count = min(self.batch, len(self._queue))
+                batch = [self._queue.popleft() for i in range(count)]
+            try:
+                self.send(batch)
+            except Exception:
+                if spool is not None:
+                    spool.append(batch)
+                    self._spill(spool)
+                else:
+                    with self._lock:
+                        self._queue.extendleft(reversed(batch))
+                        while len(self._queue) > self.size:
+                            self._queue.popleft()
+                            self.dropped += 1
+                self.disconnect()
+                return False
+        return True
+
+    def _spill(self, spool):
+        # Receiver is down, so the queue is moved to the spool to keep the
+        # memory free during the outage.
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+        spool.append(batch)
+        pass
+
+
+class Socket(Sender):
+    """Represents socket output.
+
+    Sends records to syslog or any other log collector using UDP, TCP or
+    Unix datagram socket. Each record is sent as a separate datagram over
+    UDP and Unix socket. Over TCP records are framed with the length prefix
+    as described in RFC 5425 and each batch is sent at once. Output can be
+    added to the logger like this:
+
+    >>> root = logger.root
+    >>> root.add('syslog', Socket(root, status=True, protocol='unix',
+    ...                           address='/dev/log'))
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    address : tuple or str, optional
+        Used to set `address` attribute.
+    protocol : str, optional
+        Used to set `protocol` attribute.
+    syslog : bool, optional
+        Used to set `syslog` attribute.
+    facility : str, optional
+        Used to set `facility` attribute.
+    **kwargs
+        The keyword arguments of `Sender` like `batch`, `size`, `backoff`
+        and `timeout`.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    address : tuple or str
+        Host and port of the collector or path to the Unix socket. The
+        default is `('localhost', 514)`.
+    protocol : str
+        One of `udp`, `tcp` or `unix`. The default is `udp`.
+    syslog : bool
+        Flag to send records as RFC 5424 syslog messages. When it is False
+        then record strings are sent as they are. The default is True.
+    facility : str
+        Name of the syslog facility. The default is `user`.
+    """
+
+    facilities = {'kern': 0, 'user': 1, 'mail': 2, 'daemon': 3, 'auth': 4,
+                  'syslog': 5, 'lpr': 6, 'news': 7, 'uucp': 8, 'cron': 9,
+                  'authpriv': 10, 'ftp': 11, 'local0': 16, 'local1': 17,
+                  'local2': 18, 'local3': 19, 'local4': 20, 'local5': 21,
+                  'local6': 22, 'local7': 23}
+    severities = {'critical': 2, 'error': 3, 'warning': 4, 'none': 5,
+                  'info': 6, 'debug': 7}
+
+    def __init__(self, root, status=False, address=None, protocol='udp',
+                 syslog=True, facility='user', **kwargs):
+        self.address = address or ('localhost', 514)
+        self.protocol = protocol
+        self.syslog = True
+        self.facility = 'user'
+        self._socket = None
+        self._hostname = socket.gethostname()
+        self._pid = os.getpid()
+        self.configure(syslog=syslog, facility=facility)
+        super().__init__(root, status=status, **kwargs)
+        pass
+
+    def configure(self, syslog=None, facility=None):
+        """Configure syslog messages.
 
         Parameters
         ----------
-        subject : str
-            Used for message subject.
-        text : str, MIMEText, list of str or list of MIMEText
-            Used for messages text.
-        recipients : str or list, optional
-            Used for message receivers.
-        attachment : str or list of str, optional
-            Used for path to message attachment.
-        type : str, optional
-            The argument for MIMEText as _subtype. So actually it defines the
-            type of the whole message (e.g. HTML).
+        syslog : bool, optional
+            Used to set `syslog` attribute.
+        facility : str, optional
+            Used to set `facility` attribute.
         """
-        # Message from.
-        sender = self.address
-        # Mesasge to. Must be a string with list of email addresses separated
-        # with comma.
-        recipients = recipients or self.recipients
-        # Message can be send only when there is at least one recipient.
-        if recipients is not None:
-            if isinstance(recipients, list) is True:
-                recipients = ', '.join(recipients)
+        if isinstance(facility, str) is True:
+            if facility not in self.facilities:
+                raise ValueError(f'unknown facility {facility}')
+            self.facility = facility
+        if isinstance(syslog, bool) is True:
+            self.syslog = syslog
+        pass
 
-            message = MIMEMultipart()
-            message['From'] = sender
-            message['To'] = recipients
-            message['Subject'] = subject
+    def encode(self, record):
+        """Get the bytes of the record that must be sent.
 
-            # Message is MIMEMultipart so text must be attached as a part.
-            if text is not None:
-                if isinstance(text, list) is False:
-                    text = [text]
-                for item in text:
-                    if isinstance(item, MIMEText) is False:
-                        item = MIMEText(item, _subtype=type)
-                    message.attach(item)
+        Parameters
+        ----------
+        record : Record
+            The record that must be sent.
 
-            # Now include all attachments.
-            if attachment is not None:
-                if isinstance(attachment, list) is False:
-                    attachment = [attachment]
-                for item in attachment:
-                    filename = os.path.basename(item)
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(open(item, "rb").read())
-                    encoders.encode_base64(part)
-                    part.add_header("Content-Disposition",
-                                    f"attachment; filename={filename}")
-                    message.attach(part)
+        Returns
+        -------
+        data : bytes
+            The encoded record.
+        """
+        if self.syslog is True:
+            facility = self.facilities[self.facility]
+            severity = self.severities.get(record.level, 5)
+            timestamp = dt.datetime.fromtimestamp(record.timestamp / 1e9,
+                                                  dt.timezone.utc)
+            timestamp = timestamp.isoformat(timespec='milliseconds')
+            app = (record.logname or '-').replace(' ', '_')
+            string = (f'<{facility*8+severity}>1 {timestamp} '
+                      f'{self._hostname} {app} {self._pid} - - '
+                      f'{record.message}')
+        else:
+            string = str(record).rstrip('\n')
+        return self.truncate(string).encode('utf-8', 'replace')
+
+    def send(self, batch):
+        """Send the batch of encoded records.
 
-            # Finally send message.
-            self._server.send_message(message)
+        Parameters
+        ----------
+        batch : list
+            The encoded records.
+        """
+        if self._socket is None:
+            self._socket = self._connect()
+        if self.protocol == 'tcp':
+            frames = [b'%d %s' % (len(data), data) for data in batch]
+            self._socket.sendall(b''.join(frames))
+            batch.clear()
+        else:
+            while len(batch) > 0:
+                self._socket.send(batch[0])
+                del batch[0]
         pass
 
-    @you_shall_not_pass
-    def alarm(self, with_log=True):
-        """Send special alarm message.
+    def fork(self):
+        """Drop the socket of the parent process and start own thread."""
+        # Socket is not closed, it is still used by the parent.
+        self._socket = None
+        self._pid = os.getpid()
+        super().fork()
+        pass
 
-        That message has the name of the application in the subject, log
-        header in the text and also log file as an attahcment if it is enabled
-        and if parameter with_log is set to True.
-        That method is a generic way used in Logger write methods to inform
-        user about occured application errors. But it also can be used by
-        user outside of the errors.
+    def disconnect(self):
+        """Close the socket."""
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            finally:
+                self._socket = None
+        pass
+
+    def _connect(self):
+        # Make the socket connected to the address.
+        if self.protocol == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            address = self.address
+        else:
+            if self.protocol == 'tcp':
+                type = socket.SOCK_STREAM
+            else:
+                type = socket.SOCK_DGRAM
+            host, port = self.address
+            info = socket.getaddrinfo(host, port, type=type)
+            family, type, proto, name, address = info[0]
+            sock = socket.socket(family, type, proto)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class HTTP(Sender):
+    """Represents HTTP output.
+
+    Sends batches of records as JSON arrays to the endpoint using POST
+    requests. Each record is an object with its forms, context fields and
+    message arguments. Batches are compressed with gzip and sent over the
+    persistent connection. Records are kept in the spool while the endpoint
+    is down. Output can be added to the logger like this:
+
+    >>> root = logger.root
+    >>> root.add('http', HTTP(root, status=True,
+    ...                       url='http://localhost:8080/logs'))
+
+    Parameters
+    ----------
+    root : Output
+        Used to set `root` attribute.
+    status : bool, optional
+        Used to open or close the output.
+    url : str, optional
+        Used to set `url` attribute.
+    headers : dict, optional
+        Used to set `headers` attribute.
+    compress : bool, optional
+        Used to set `compress` attribute.
+    spool : bool or str, optional
+        Path to the spool file. The default is True which means that the
+        *.spool* file in the output file folder is used.
+    **kwargs
+        The keyword arguments of `Sender` like `batch`, `size`, `backoff`,
+        `timeout` and `maxspool`.
+
+    Attributes
+    ----------
+    root : Root
+        Low-level output that is a root of this branch.
+    status : bool
+        Status for this particular output.
+    url : str
+        The URL of the endpoint. The default is `http://localhost:8080/`.
+    headers : dict
+        Additional headers of requests e.g. authorization.
+    compress : bool
+        Flag to compress the requests with gzip. The default is True.
+    """
+
+    retryable = (408, 429)
+
+    def __init__(self, root, status=False, url=None, headers=None,
+                 compress=True, spool=True, **kwargs):
+        self.url = url or 'http://localhost:8080/'
+        self.headers = headers or {}
+        self.compress = compress
+        self._connection = None
+        super().__init__(root, status=status, spool=spool, **kwargs)
+        pass
+
+    def encode(self, record):
+        """Get the JSON of the record that must be sent.
 
         Parameters
         ----------
-        with_log : bool, optional
-            Used for attachment of logging output file to
-            the alarm message. The default is True.
+        record : Record
+            The record that must be sent.
+
+        Returns
+        -------
+        data : bytes
+            The encoded record.
         """
-        subject = f'ALARM in {self.root.logger.app}!'
+        data = record.asdict()
+        data['message'] = self.truncate(data['message'])
+        return json.dumps(data, default=str).encode('utf-8')
 
-        text = self.root.logger.header.create()
-        text = f'<pre>{text}</pre>'
-        text = MIMEText(text, 'html')
+    def send(self, batch):
+        """Send the batch of encoded records in one request.
 
-        if with_log is True and self.root.file.status is True:
-            attachment = self.root.file.path
-        else:
-            attachment = None
+        Parameters
+        ----------
+        batch : list
+            The encoded records.
+        """
+        body = b'[' + b','.join(batch) + b']'
+        headers = {'Content-Type': 'application/json', **self.headers}
+        if self.compress is True:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        response = self._request(body, headers)
+        if response.status >= 300:
+            error = f'{response.status} {response.reason}'
+            if response.status >= 500 or response.status in self.retryable:
+                raise http.client.HTTPException(error)
+            # Endpoint will never accept that batch, so it is dropped.
+            self.dropped += len(batch)
+        batch.clear()
+        pass
 
-        self.send(subject, text, recipients=self.recipients,
-                  attachment=attachment)
+    def fork(self):
+        """Drop the connection of the parent process and start own thread."""
+        # Connection is not closed, it is still used by the parent.
+        self._connection = None
+        super().fork()
         pass
 
-    @you_shall_not_pass
-    def write(self, record):
-        """Write record (not used)."""
+    def disconnect(self):
+        """Close the connection."""
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            finally:
+                self._connection = None
         pass
 
+    def _request(self, body, headers):
+        # Make the request using the persistent connection. Server can close
+        # idle connection at any time, so request is repeated once with the
+        # new connection.
+        url = urllib.parse.urlsplit(self.url)
+        path = url.path or '/'
+        if url.query:
+            path = f'{path}?{url.query}'
+        while True:
+            reused = self._connection is not None
+            if reused is False:
+                if url.scheme == 'https':
+                    connection = http.client.HTTPSConnection
+                else:
+                    connection = http.client.HTTPConnection
+                self._connection = connection(url.netloc,
+                                              timeout=self.timeout)
+            try:
+                self._connection.request('POST', path, body=body,
+                                         headers=headers)
+                response = self._connection.getresponse()
+                response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                self.disconnect()
+                if reused is False:
+                    raise
+            else:
+                return response
+
 
 class HTML(Branch):
     """Represents HTML document output.
@@ -621,11 +3258,23 @@ class HTML(Branch):
         pass
 
 
-class Table(Branch):
+class Table(Spooled):
     """Represents a database table output.
 
     Can be used to generate record in database table and update its fields
-    with necessary values during the logging process.
+    with necessary values during the logging process. Values that can not be
+    written because database is not available are kept in the spool and
+    written later. Values are passed to the database as they are, but the
+    spool keeps them as JSON, so only numbers, strings, dates, times,
+    decimals and bytes survive the outage of the database.
+    Frequent updates like progress of the job can be coalesced: values are
+    merged in memory and written at most once per `interval` with the
+    latest values winning. Merged values are also written when new record
+    is initiated, on error and at exit. The first values of the record are
+    never merged, so the record is inserted at once and `primary_key` is
+    known right away. Merged values are written later by the timer, so they
+    are checked at once and only the values that the spool can keep can be
+    merged.
 
     Parameters
     ----------
@@ -635,6 +3284,8 @@ class Table(Branch):
         Used to open or close the output.
     date_column : str, optional
         Used to set `date_column` attribute.
+    interval : int or float, optional
+        Used to set `interval` attribute.
 
     Attributes
     ----------
@@ -645,19 +3296,33 @@ class Table(Branch):
     date_column : str
         Name of the column in logging table which can be modified by
         application to write last write date.
+    interval : float or bool
+        Number of seconds during which updates are merged before they are
+        written. The default is False which means that each update is
+        written at once.
     """
 
+    writable = False
+    faults = (OSError, sql.exc.OperationalError, sql.exc.InterfaceError,
+              sql.exc.DisconnectionError, sql.exc.TimeoutError)
+
     def __init__(self, root, status=False, name=None, database=None,
-                 proxy=None, date_column=None, **kwargs):
+                 proxy=None, date_column=None, interval=False, **kwargs):
         super().__init__(root, status=status)
         self.name = None
         self.database = None
         self.date_column = None
+        self.proxy = None
+        self.interval = False
         self._primary_key = None
         self._primary_key_column = None
+        self._declaration = None
+        self._lock = threading.Lock()
+        self._values = {}
+        self._timer = None
 
         self.configure(name=name, database=database, proxy=proxy,
-                       date_column=date_column)
+                       date_column=date_column, interval=interval)
         pass
 
     # Used for a compatibility with version 0.1.1.
@@ -672,14 +3337,29 @@ class Table(Branch):
         return self._primary_key
 
     def configure(self, name=None, database=None, proxy=None,
-                  date_column=None, **kwargs):
+                  date_column=None, interval=None, **kwargs):
         """Configure database and table.
 
+        Table is declared again only when `name` or `proxy` is given, so
+        other parameters of the declared table can be changed alone.
+
         Parameters
         ----------
         date_column : str, optional
             Used to set `date_column` attribute.
+        interval : int, float or bool, optional
+            Used to set `interval` attribute.
+
+        Raises
+        ------
+        TypeError
+            If table must be declared but neither name nor proxy is given.
         """
+        if isinstance(interval, (int, float, bool)) is True:
+            self.flush()
+            self.interval = interval
+        if isinstance(date_column, str) is True:
+            self.date_column = date_column
         if isinstance(name, str) is True:
             self.name = name.lower()
 
@@ -703,37 +3383,47 @@ class Table(Branch):
                         db_kwargs['user'] = kwargs.get('user')
                         db_kwargs['password'] = kwargs.get('password')
                     self.database = Database(vendor, **db_kwargs)
-        # Check database connection.
-        if self.database is not None:
+        # Check database connection and declare the table when it is given
+        # or was not declared yet.
+        declare = (name is not None or proxy is not None
+                   or self._declaration is None)
+        if self.database is not None and declare is True:
+            if (isinstance(proxy, sql.sql.schema.Table) is False
+               and isinstance(name, str) is False):
+                tp = name.__class__.__name__
+                raise TypeError(f'name must str not {tp}')
+            self._declaration = (name, proxy)
+            self.proxy = None
             try:
                 conn = self.database.connect()
                 conn.close()
-            except Exception:
+                self._declare(name, proxy)
+            except Exception as error:
+                # When database is not available now values are kept in the
+                # spool until it is back.
                 self.root.logger.warning()
-                self._status = False
+                if self.transient(error) is False:
+                    self._status = False
             else:
-                # Here is a table declaration.
-                if isinstance(proxy, sql.sql.schema.Table) is True:
-                    self.name = proxy.name
-                    self.proxy = proxy
-                elif isinstance(name, str) is True:
-                    self.name = name
-                    self.proxy = self.database.table(name)
-                else:
-                    tp = name.__class__.__name__
-                    raise TypeError(f'name must str not {tp}')
-
-                if isinstance(date_column, str) is True:
-                    self.date_column = date_column
-
-                self._primary_key_column = self._get_primary_key_column()
                 self._primary_key = None
+                self.recover()
         pass
 
     @you_shall_not_pass
     def new(self):
         """Initiate new logging record."""
-        self._primary_key = None
+        # Merged and spooled values must be written to the current record
+        # first. When nothing waits in the spool the key is just forgotten,
+        # otherwise the mark of the new record is put after the values.
+        self.flush()
+        if self._delivery.acquire(blocking=False) is True:
+            try:
+                if self.pending is False:
+                    self._primary_key = None
+                    return
+            finally:
+                self._delivery.release()
+        self.defer([None])
         pass
 
     @you_shall_not_pass
@@ -749,20 +3439,175 @@ class Table(Branch):
         ----------
         **values
             The keyword argument is used to update fields in table.
+
+        Raises
+        ------
+        TypeError
+            If merged value can not be kept in the spool.
         """
-        conn = self.database.connect()
         if self.date_column is not None:
             values[self.date_column] = dt.datetime.now()
-        if self._primary_key is None:
-            insert = self.proxy.insert().values(**values)
-            result = conn.execute(insert)
-            self._primary_key = result.inserted_primary_key[0]
+        if self.interval is False or self.interval <= 0:
+            self.put(values)
+            return
+        # Values are merged until the timer writes them. Only updates are
+        # merged, record that is not inserted yet is inserted at once.
+        with self._lock:
+            insert = self._primary_key is None and not self._values
+            if insert is False:
+                # Value that can not be written by the timer is rejected
+                # now, so the caller gets the error.
+                self.encode(values)
+                self._values.update(values)
+                if self._timer is None:
+                    self._timer = threading.Timer(self.interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if insert is True:
+            self.put(values)
+        pass
+
+    def flush(self):
+        """Write the merged values to the table."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            values, self._values = self._values, {}
+        if values:
+            self.put(values)
+        pass
+
+    def close(self):
+        """Write the merged values and make this output inactive."""
+        self.flush()
+        super().close()
+        pass
+
+    def deliver(self, entries):
+        """Write the values to the table.
+
+        Parameters
+        ----------
+        entries : list
+            The dictionaries of values. None starts new logging record.
+        """
+        # Table could not be declared while database was not available.
+        if self.proxy is None:
+            self._declare(*self._declaration)
+        conn = self.database.connect()
+        try:
+            for values in entries:
+                if values is None:
+                    self._primary_key = None
+                elif self._primary_key is None:
+                    insert = self.proxy.insert().values(**values)
+                    result = conn.execute(insert)
+                    self._primary_key = result.inserted_primary_key[0]
+                else:
+                    update = self.proxy.update().\
+                        values(**values).\
+                        where(self._primary_key_column == self._primary_key)
+                    conn.execute(update)
+        finally:
+            conn.close()
+        pass
+
+    def fork(self):
+        """Drop the database connections of the parent process."""
+        super().fork()
+        # Merged values are written by the parent.
+        self._lock = threading.Lock()
+        self._values = {}
+        self._timer = None
+        # Connections in the pool are still used by the parent, so they are
+        # left open and the child gets the new pool.
+        if self.database is not None and self.database.engine is not None:
+            self.database.engine.dispose(close=False)
+        pass
+
+    def encode(self, values):
+        """Serialize the values as JSON for the spool.
+
+        Types that JSON does not have are tagged, so the spool contains
+        only data.
+
+        Parameters
+        ----------
+        values : dict or None
+            The values of the record.
+
+        Returns
+        -------
+        entry : bytes
+            The values encoded as JSON.
+
+        Raises
+        ------
+        TypeError
+            If value can not be kept in the spool.
+        """
+        return json.dumps(values, default=self._tag).encode('utf-8')
+
+    def decode(self, entry):
+        """Get the values back from the spool with their original types.
+
+        Parameters
+        ----------
+        entry : bytes
+            The values encoded as JSON.
+
+        Returns
+        -------
+        values : dict or None
+            The values of the record.
+        """
+        return json.loads(entry, object_hook=self._untag)
+
+    @staticmethod
+    def _tag(value):
+        if isinstance(value, dt.datetime) is True:
+            return {'$datetime': value.isoformat()}
+        elif isinstance(value, dt.date) is True:
+            return {'$date': value.isoformat()}
+        elif isinstance(value, dt.time) is True:
+            return {'$time': value.isoformat()}
+        elif isinstance(value, dt.timedelta) is True:
+            return {'$timedelta': value.total_seconds()}
+        elif isinstance(value, decimal.Decimal) is True:
+            return {'$decimal': str(value)}
+        elif isinstance(value, (bytes, bytearray)) is True:
+            return {'$bytes': base64.b64encode(value).decode('ascii')}
+        tp = value.__class__.__name__
+        raise TypeError(f'{tp} value can not be written to the table')
+
+    @staticmethod
+    def _untag(item):
+        if len(item) == 1:
+            (key, value), = item.items()
+            if key == '$datetime':
+                return dt.datetime.fromisoformat(value)
+            elif key == '$date':
+                return dt.date.fromisoformat(value)
+            elif key == '$time':
+                return dt.time.fromisoformat(value)
+            elif key == '$timedelta':
+                return dt.timedelta(seconds=value)
+            elif key == '$decimal':
+                return decimal.Decimal(value)
+            elif key == '$bytes':
+                return base64.b64decode(value)
+        return item
+
+    def _declare(self, name, proxy):
+        # Here is a table declaration.
+        if isinstance(proxy, sql.sql.schema.Table) is True:
+            self.name = proxy.name
+            self.proxy = proxy
         else:
-            update = self.proxy.update().\
-                values(**values).\
-                where(self._primary_key_column == self._primary_key)
-            conn.execute(update)
-        conn.close()
+            self.name = name
+            self.proxy = self.database.table(name)
+        self._primary_key_column = self._get_primary_key_column()
         pass
 
     def _get_primary_key_column(self):
@@ -0,0 +1,320 @@
+"""Profiling tools integrated with logging."""
+
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+
+# Profiler of the whole run started with the help of environment variable.
+environment = 'PEPPERONI_PROFILE'
+run = None
+
+
+class Profiler():
+    """Context manager and decorator profiling the code through the logger.
+
+    In `cpu` mode `cProfile` is used and in `memory` mode `tracemalloc` is
+    used. When profiling is finished top functions or lines are written to
+    the logger as records and raw statistics are saved to the file next to
+    the logger output file: *.prof* for `cpu` mode and *.snapshot* for
+    `memory` mode. That file is also attached to the alarms. Nothing is
+    done when the profiler is not used. Only one `cpu` profiler can work at
+    a time, so nested `cpu` profiler does nothing and its results are part
+    of the outer one.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+    name : str, optional
+        Used to set `name` attribute.
+    mode : str, optional
+        Used to set `mode` attribute.
+    top : int, optional
+        Used to set `top` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` which is used to write the results.
+    name : str
+        Name of the profile used in records and file name. By default the
+        name of decorated function or *profile*.
+    mode : str
+        Either `cpu` or `memory`. The default is `cpu`.
+    top : int
+        Number of the top functions or lines written as records. The
+        default is 20.
+    path : str
+        Path to the file with raw statistics of the last profiling.
+    """
+
+    extensions = {'cpu': 'prof', 'memory': 'snapshot'}
+
+    def __init__(self, logger, name=None, mode='cpu', top=20):
+        if mode not in self.extensions:
+            raise ValueError(f'mode must be cpu or memory not {mode}')
+        self.logger = logger
+        self.name = name
+        self.mode = mode
+        self.top = top
+        self.path = None
+        self._profile = None
+        self._tracing = None
+        pass
+
+    def __repr__(self):
+        """Get this Profiler string representation."""
+        return f'<Profiler "{self.name}" ({self.mode})>'
+
+    def __enter__(self):
+        """Start profiling."""
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stop profiling and write the results."""
+        self.stop()
+        pass
+
+    def __call__(self, func):
+        """Decorate function so each its call is profiled."""
+        name = self.name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Profiler(self.logger, name, self.mode, self.top):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def start(self):
+        """Start profiling."""
+        if self.mode == 'cpu':
+            if sys.getprofile() is None:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+        elif self.mode == 'memory':
+            # Tracing that was started outside must not be stopped here.
+            self._tracing = tracemalloc.is_tracing()
+            if self._tracing is False:
+                tracemalloc.start()
+        pass
+
+    def stop(self):
+        """Stop profiling and write the results."""
+        if self.mode == 'cpu' and self._profile is None:
+            return
+        name = self.name or 'profile'
+        self.path = f'{self.logger.root.file.base}.{name}'
+        self.path += f'.{self.extensions[self.mode]}'
+        dirname = os.path.dirname(self.path)
+        if os.path.exists(dirname) is False:
+            os.makedirs(dirname)
+
+        if self.mode == 'cpu':
+            self._profile.disable()
+            self._profile.dump_stats(self.path)
+            lines = list(self._read_cpu())
+            self._profile = None
+        elif self.mode == 'memory':
+            snapshot = tracemalloc.take_snapshot()
+            if self._tracing is False:
+                tracemalloc.stop()
+            snapshot.dump(self.path)
+            lines = self._read_memory(snapshot)
+
+        for line in lines:
+            self.logger.info(f'PROFILE {name}: {line}')
+        attachments = self.logger.root.email.attachments
+        if self.path not in attachments:
+            attachments.append(self.path)
+        pass
+
+    def _read_cpu(self):
+        # Get top functions by cumulative time.
+        stats = pstats.Stats(self._profile).stats
+        items = sorted(stats.items(), key=lambda item: item[1][3],
+                       reverse=True)
+        for (file, line, func), (cc, nc, tt, ct, callers) in \
+                items[:self.top]:
+            yield (f'{nc} calls, {tt:.3f}s own, {ct:.3f}s total, '
+                   f'{file}:{line}({func})')
+
+    def _read_memory(self, snapshot):
+        # Get top lines by allocated memory.
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            yield (f'{stat.size/1024:.1f} KiB in {stat.count} blocks, '
+                   f'{frame.filename}:{frame.lineno}')
+
+
+class Sampler(threading.Thread):
+    """Background thread sampling the stacks of all threads.
+
+    Stacks are taken from `sys._current_frames()` at a given rate and
+    aggregated in a trie where each node is a list of the number of samples
+    that ended in it and the dictionary of its children keyed by code
+    objects. Periodically the top stacks are written to the logger as
+    records and all stacks are saved in collapsed format (one stack per line
+    with frames separated by semicolon and number of samples at the end) to
+    the *.stacks* file next to the logger output file. That file can be
+    used with flamegraph tools.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+    rate : int or float, optional
+        Used to set `rate` attribute.
+    interval : int or float, optional
+        Used to set `interval` attribute.
+    top : int, optional
+        Used to set `top` attribute.
+    depth : int, optional
+        Used to set `depth` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` which is used to write the results.
+    rate : float
+        Number of samples per second. The default is 100.
+    interval : float
+        Number of seconds between the reports. The default is 60.
+    top : int
+        Number of the top stacks written as records. The default is 10.
+    depth : int
+        Maximum number of frames in a stack. The default is 64.
+    samples : int
+        Total number of sampled stacks.
+    path : str
+        Path to the file with collapsed stacks.
+    """
+
+    def __init__(self, logger, rate=100, interval=60, top=10, depth=64):
+        super().__init__(name='pepperoni-sampler', daemon=True)
+        self.logger = logger
+        self.rate = rate
+        self.interval = interval
+        self.top = top
+        self.depth = depth
+        self.samples = 0
+        self.path = f'{logger.root.file.base}.stacks'
+        self._trie = [0, {}]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        pass
+
+    def run(self):
+        """Sample stacks until the sampler is stopped."""
+        period = 1 / self.rate
+        reported = time.monotonic()
+        ident = threading.get_ident()
+        while self._stopped.wait(period) is False:
+            with self._lock:
+                for thread, frame in sys._current_frames().items():
+                    if thread != ident:
+                        self._add(frame)
+            if time.monotonic() - reported >= self.interval:
+                self.report()
+                reported = time.monotonic()
+        pass
+
+    def stop(self):
+        """Stop sampling and write the final report."""
+        self._stopped.set()
+        if self.is_alive() is True:
+            self.join()
+        self.report()
+        pass
+
+    def stacks(self):
+        """Get all sampled stacks.
+
+        Returns
+        -------
+        stacks : list
+            Pairs of the collapsed stack string and number of samples sorted
+            by number of samples.
+        """
+        stacks = []
+        with self._lock:
+            nodes = [((), self._trie)]
+            while nodes:
+                path, (count, children) = nodes.pop()
+                if count > 0:
+                    stacks.append((';'.join(path), count))
+                for code, child in children.items():
+                    nodes.append((path + (self._label(code),), child))
+        stacks.sort(key=lambda item: item[1], reverse=True)
+        return stacks
+
+    def report(self):
+        """Write the top stacks to the logger and all stacks to the file."""
+        stacks = self.stacks()
+        if not stacks:
+            return
+        dirname = os.path.dirname(self.path)
+        if os.path.exists(dirname) is False:
+            os.makedirs(dirname)
+        with open(self.path, 'w') as fh:
+            for stack, count in stacks:
+                fh.write(f'{stack} {count}\n')
+        for stack, count in stacks[:self.top]:
+            share = count / self.samples * 100
+            frames = stack.split(';')[-3:]
+            self.logger.info(f'SAMPLE {count} ({share:.1f}%): '
+                             f'{" <- ".join(reversed(frames))}')
+        pass
+
+    def _add(self, frame):
+        # Put the stack to the trie starting from the outermost frame.
+        codes = []
+        while frame is not None and len(codes) < self.depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        node = self._trie
+        for code in reversed(codes):
+            children = node[1]
+            child = children.get(code)
+            if child is None:
+                child = children[code] = [0, {}]
+            node = child
+        node[0] += 1
+        self.samples += 1
+        pass
+
+    def _label(self, code):
+        # Get the string presentation of the frame.
+        filename = os.path.basename(code.co_filename)
+        return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+def from_environment(logger):
+    """Start profiling of the whole run if it is requested.
+
+    Profiling is requested with the environment variable PEPPERONI_PROFILE
+    set to `cpu` or `memory`. Only one whole run profiler is started per
+    process.
+
+    Parameters
+    ----------
+    logger : Logger
+        The `Logger` which is used to write the results.
+
+    Returns
+    -------
+    profiler : Profiler or None
+        The started profiler.
+    """
+    global run
+    mode = os.environ.get(environment)
+    if run is None and mode in Profiler.extensions:
+        run = Profiler(logger, name='run', mode=mode)
+        run.start()
+        return run
@@ -1,9 +1,94 @@
 """Elements used for record preparation and creation."""
 
+import collections
 import datetime as dt
 import os
 import sys
 import threading
+import time
+
+from .cache import bound, context
+from .sysinfo import resources
+from .utils import shorten, truncate
+
+
+class Clock():
+    """Cache of the date strings used in records.
+
+    Thousands of records can be created within the same second so the date
+    string is formatted only once per second and then reused. Each cache is
+    stored as a tuple of the second and the string so it can be replaced
+    atomically from any thread.
+    """
+
+    def __init__(self):
+        self._local = (None, None)
+        self._utc = (None, None)
+        pass
+
+    def isodate(self, timestamp):
+        """Get local date string for the timestamp in nanoseconds."""
+        second = timestamp // 1000000000
+        cached, string = self._local
+        if cached != second:
+            datetime = dt.datetime.fromtimestamp(second)
+            string = datetime.isoformat(sep=' ', timespec='seconds')
+            self._local = (second, string)
+        return string
+
+    def utcdate(self, timestamp):
+        """Get UTC date string for the timestamp in nanoseconds."""
+        second = timestamp // 1000000000
+        cached, string = self._utc
+        if cached != second:
+            datetime = dt.datetime.fromtimestamp(second, dt.timezone.utc)
+            string = datetime.isoformat(sep=' ', timespec='seconds')
+            self._utc = (second, string)
+        return string
+
+    def msdate(self, timestamp):
+        """Get local date string with milliseconds."""
+        milliseconds = timestamp // 1000000 % 1000
+        return f'{self.isodate(timestamp)}.{milliseconds:03d}'
+
+
+clock = Clock()
+
+
+class Forms(collections.ChainMap):
+    """Mapping of record forms used in string formatting.
+
+    Forms are looked up in the record attributes, in the additional mappings
+    and then in the fields bound to the context without merging them into a
+    new dictionary. Lazy forms of the record are evaluated only when a
+    template really uses them.
+
+    Parameters
+    ----------
+    record : Record
+        The record which attributes are used as forms.
+    *maps
+        The additional mappings with forms.
+    default : str, optional
+        The value of the fields that were bound somewhere but are not bound
+        in the current context. If it is not set or the form is unknown then
+        KeyError is raised.
+    """
+
+    def __init__(self, record, *maps, default=None):
+        super().__init__(record.__dict__, *maps, record.fields)
+        self.record = record
+        self.default = default
+        pass
+
+    def __missing__(self, key):
+        """Get lazy form of the record."""
+        try:
+            return getattr(self.record, key)
+        except AttributeError:
+            if self.default is not None and key in bound:
+                return self.default
+            raise KeyError(key)
 
 
 class Record():
@@ -21,6 +106,15 @@ class Record():
     which are the variablse that automatically defined by class during the
     instance construction. Second one is user defined forms which are passed
     to class constructor as kwargs.
+    Fields bound to the context with `Logger.bind()` or `Logger.context()`
+    are also available as forms. Fields that are not bound in the current
+    context are presented as empty strings, while unknown forms in the
+    record template still raise KeyError.
+    Some of the predefined forms like `datetime`, `msdate` and `utcdate` are
+    lazy - they are evaluated only when they are used in templates or
+    accessed as attributes. Resource descriptors like `rss`, `utime`,
+    `stime`, `fds`, `threads`, `memlimit` and `cpulimit` are lazy forms as
+    well.
     List of predefined dynamic forms available by now:
 
     +---------+----------------------------------------------------+
@@ -28,10 +122,20 @@ class Record():
     +=========+====================================================+
     |rectype  |Type of the record                                  |
     +---------+----------------------------------------------------+
+    |level    |Key of the record type e.g. info, error             |
+    +---------+----------------------------------------------------+
+    |timestamp|Time of record construction in nanoseconds          |
+    +---------+----------------------------------------------------+
     |datetime |Datetime object at the time of record construction  |
     +---------+----------------------------------------------------+
     |isodate  |Date string form of the time of record construction |
     +---------+----------------------------------------------------+
+    |msdate   |Same as isodate but with milliseconds               |
+    +---------+----------------------------------------------------+
+    |utcdate  |Same as isodate but in UTC                          |
+    +---------+----------------------------------------------------+
+    |logname  |Name of the logger that created the record          |
+    +---------+----------------------------------------------------+
     |objname  |Name of the object from which record was initiated  |
     +---------+----------------------------------------------------+
     |flname   |Script file name from which record was initiated    |
@@ -40,7 +144,7 @@ class Record():
     +---------+----------------------------------------------------+
     |div      |Border element                                      |
     +---------+----------------------------------------------------+
-    |message  |Input text message                                  |
+    |message  |Input text message (lazy)                           |
     +---------+----------------------------------------------------+
 
     Parameters
@@ -50,7 +154,10 @@ class Record():
     rectype : str
         Name of the record type item from the Logger.rectypes dictionary.
     message : str
-        Input message that must be printed with that record.
+        Input message that must be printed with that record. When the logger
+        limits the message size then objects that are not strings are
+        rendered with the bounded representation and long messages are
+        truncated.
     error : bool, optional
         That is True or False to indicate that record include error
         information.
@@ -58,52 +165,140 @@ class Record():
         String template of the whole record.
     error_format : str or bool, optional
         String template of the error message.
+    origin : tuple, optional
+        Path of the file, name of the object and name of the thread from
+        which record was initiated. Used when these values are already known,
+        so frames are not inspected.
+    timestamp : int, optional
+        Time of the record in nanoseconds. Used when the record was created
+        earlier e.g. by built-in logging. The default is the current time.
     **kwargs
         The keyword arguments that is used for additional variables in record
         and message formatting.
     """
 
+    lazy_forms = {
+        'datetime': lambda self: dt.datetime.fromtimestamp(
+            self.timestamp / 1000000000),
+        'msdate': lambda self: clock.msdate(self.timestamp),
+        'utcdate': lambda self: clock.utcdate(self.timestamp),
+        'rss': lambda self: resources.get('rss'),
+        'utime': lambda self: resources.get('utime'),
+        'stime': lambda self: resources.get('stime'),
+        'fds': lambda self: resources.get('fds'),
+        'threads': lambda self: resources.get('threads'),
+        'memlimit': lambda self: resources.get('memlimit'),
+        'cpulimit': lambda self: resources.get('cpulimit'),
+        'message': lambda self: self._format_message()
+    }
+
     def __init__(self, logger, rectype, message, error=False, format=None,
-                 error_format=None, **kwargs):
+                 error_format=None, origin=None, timestamp=None, **kwargs):
         self.logger = logger
         # Get the record string template.
         self.format = format or logger.formatter.record
-        # Get the presentation of record type.
+        # Get the presentation of record type and keep the original key
+        # used for routing.
         self.rectype = logger.rectypes[rectype]
+        self.level = rectype
 
         # Date forms.
-        self.datetime = dt.datetime.now()
-        self.isodate = self.datetime.isoformat(sep=' ', timespec='seconds')
+        self.timestamp = timestamp or time.time_ns()
+        self.isodate = clock.isodate(self.timestamp)
 
         # Execution forms.
-        frame = self.__catch_frame()
-        f_code = frame.f_code
-        flname = f_code.co_filename
-        objname = f_code.co_name
+        self.logname = logger.name
+        if origin is None:
+            frame = self.__catch_frame()
+            f_code = frame.f_code
+            flname = f_code.co_filename
+            objname = f_code.co_name
+            thread = threading.current_thread().name
+        else:
+            flname, objname, thread = origin
         self.objname = objname if objname != '<module>' else 'main'
         self.flname = os.path.splitext(os.path.basename(flname))[0]
-        self.thread = threading.current_thread().name
+        self.thread = thread
 
         # Styling forms.
         self.div = logger.formatter.div
 
-        # Store formatted message as instance attribute.
-        message = str(message if error is False else logger.formatter.error)
-        try:
-            self.message = message.format(**self.__dict__, **kwargs)
-        except KeyError:
-            self.message = message
+        # Context forms. Mapping is immutable so it is taken as it is.
+        self.fields = context.get()
+
+        # Message is formatted only when it is used, so outputs that store
+        # the template and arguments do not pay for the formatting. Size of
+        # the message is limited before it is converted to the string.
+        message = message if error is False else logger.formatter.error
+        self._limit = logger.maxmessage
+        self._template = shorten(message, self._limit)
+        self._arguments = kwargs
         pass
 
+    def __getattr__(self, name):
+        """Evaluate lazy form on the first access."""
+        lazy = self.lazy_forms.get(name)
+        if lazy is None:
+            raise AttributeError(name)
+        value = lazy(self)
+        setattr(self, name, value)
+        return value
+
     def __str__(self):
         """Create record string."""
         return self.create()
 
+    @property
+    def template(self):
+        """Get the message template before the formatting."""
+        return self._template
+
+    @property
+    def arguments(self):
+        """Get the keyword arguments used in message formatting."""
+        return self._arguments
+
+    def _format_message(self):
+        # Template can refer to the message itself so the template is used
+        # as the message while it is formatted. Truncated template can have
+        # broken fields, so it is used as it is then.
+        self.message = self._template
+        try:
+            message = self._template.format_map(Forms(self, self._arguments))
+        except (KeyError, IndexError, ValueError):
+            return self._template
+        # Arguments can make the message longer than the limit again.
+        if len(message) > len(self._template):
+            message = truncate(message, self._limit)
+        return message
+
     __repr__ = __str__
 
+    def asdict(self):
+        """Get the record as a dictionary.
+
+        Dictionary contains the main forms of the record, fields bound to the
+        context and message arguments, so it can be serialized e.g. to JSON.
+        """
+        forms = {'timestamp': self.timestamp,
+                 'isodate': self.isodate,
+                 'logname': self.logname,
+                 'rectype': self.rectype,
+                 'flname': self.flname,
+                 'objname': self.objname,
+                 'thread': self.thread,
+                 'message': self.message}
+        return {**self.fields, **self._arguments, **forms}
+
     def create(self, css=False):
-        """Create and return string representation of the record."""
-        string = self.format.format(**self.__dict__)
+        """Create and return string representation of the record.
+
+        String is created only once and then reused by all outputs.
+        """
+        string = self.__dict__.get('_string')
+        if string is None:
+            string = self.format.format_map(Forms(self, default=''))
+            self._string = string
         return string
 
     def __catch_frame(self):
@@ -111,7 +306,8 @@ class Record():
         frame = sys._getframe()
         module_dir = os.path.dirname(__file__)
         while True:
-            if module_dir != os.path.dirname(frame.f_code.co_filename):
+            if (module_dir != os.path.dirname(frame.f_code.co_filename)
+               or frame.f_back is None):
                 return frame
             else:
                 frame = frame.f_back
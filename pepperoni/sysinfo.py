@@ -9,6 +9,13 @@ import pip
 import platform
 import socket
 import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 
 # Path to user JSON file with parameters.
@@ -45,6 +52,173 @@ class Dataset(dict):
     __repr__ = __repr__
 
 
+class Resources():
+    """Class represents process resources usage.
+
+    Values are read from */proc*, cgroup files and `resource` module. They
+    are cached for a short time so frequent access (e.g. in each record)
+    costs almost nothing. Values that can not be read on the current system
+    are None.
+
+    Parameters
+    ----------
+    ttl : int or float, optional
+        Used to set `ttl` attribute.
+
+    Attributes
+    ----------
+    ttl : float
+        Number of seconds while the values are reused. The default is 1.
+    """
+
+    def __init__(self, ttl=1):
+        self.ttl = ttl
+        self._values = {}
+        self._expire = 0
+        pass
+
+    def __repr__(self):
+        """Get string with resources as pairs of names and values."""
+        items = ', '.join(f'{k}={v}' for k, v in self.read().items())
+        return f'Resources({items})'
+
+    def get(self, name):
+        """Get value of the resource by name."""
+        return self.read().get(name)
+
+    def clear(self):
+        """Forget the cached values, e.g. of the parent process after fork."""
+        self._expire = 0
+        pass
+
+    def read(self):
+        """Get dictionary with all resources.
+
+        Returns
+        -------
+        values : dict
+            Values of rss, utime, stime, fds, threads, memlimit and cpulimit.
+        """
+        now = time.monotonic()
+        if now >= self._expire:
+            values = {'rss': self._read_rss(),
+                      'utime': None,
+                      'stime': None,
+                      'fds': self._read_fds(),
+                      'threads': threading.active_count(),
+                      'memlimit': self._read_memlimit(),
+                      'cpulimit': self._read_cpulimit()}
+            if resource is not None:
+                usage = resource.getrusage(resource.RUSAGE_SELF)
+                values['utime'] = usage.ru_utime
+                values['stime'] = usage.ru_stime
+            self._values = values
+            self._expire = now + self.ttl
+        return self._values
+
+    def _read_file(self, path):
+        # Get content of the system file or None if it is not available.
+        try:
+            with open(path, 'r') as fh:
+                return fh.read().strip()
+        except OSError:
+            return None
+
+    def _read_rss(self):
+        # Resident set size in bytes.
+        statm = self._read_file('/proc/self/statm')
+        if statm is not None:
+            return int(statm.split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        if resource is not None:
+            # Peak value is the only one available on some systems.
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            factor = 1 if sys.platform == 'darwin' else 1024
+            return usage.ru_maxrss * factor
+
+    def _read_fds(self):
+        # Number of open file descriptors.
+        for path in ('/proc/self/fd', '/dev/fd'):
+            try:
+                return len(os.listdir(path))
+            except OSError:
+                continue
+
+    def _read_memlimit(self):
+        # Memory limit of the cgroup in bytes (v2 and then v1). Cgroup v1
+        # shows the absence of the limit as a huge number.
+        for path in ('/sys/fs/cgroup/memory.max',
+                     '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+            value = self._read_file(path)
+            if value is not None:
+                if value.isdigit() is True and int(value) < 2**62:
+                    return int(value)
+                return None
+
+    def _read_cpulimit(self):
+        # CPU limit of the cgroup as a number of CPUs (v2 and then v1).
+        value = self._read_file('/sys/fs/cgroup/cpu.max')
+        if value is not None:
+            quota, period = value.split()
+            return int(quota) / int(period) if quota != 'max' else None
+        quota = self._read_file('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+        period = self._read_file('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if quota is not None and period is not None and int(quota) > 0:
+            return int(quota) / int(period)
+
+
+resources = Resources()
+
+
+class Monitor(threading.Thread):
+    """Background thread writing resources usage to the logger.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+    interval : int or float, optional
+        Used to set `interval` attribute.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` which is used to write the records.
+    interval : float
+        Number of seconds between the records. The default is 60.
+    """
+
+    def __init__(self, logger, interval=60):
+        super().__init__(name='pepperoni-monitor', daemon=True)
+        self.logger = logger
+        self.interval = interval
+        self._stopped = threading.Event()
+        pass
+
+    def run(self):
+        """Write records until the monitor is stopped."""
+        while self._stopped.wait(self.interval) is False:
+            self.report()
+        pass
+
+    def stop(self):
+        """Stop the monitor."""
+        self._stopped.set()
+        pass
+
+    def report(self):
+        """Write the record with current resources usage."""
+        values = resources.read()
+        items = []
+        for key, value in values.items():
+            if key in ('rss', 'memlimit') and value is not None:
+                value = f'{value/1024/1024:.1f}MiB'
+            elif key in ('utime', 'stime') and value is not None:
+                value = f'{value:.2f}s'
+            items.append(f'{key}={value}')
+        self.logger.info(f'RESOURCES {", ".join(items)}')
+        pass
+
+
 class Descriptors():
     """Class represents special dataset with system descriptors.
 
@@ -76,6 +250,25 @@ class Descriptors():
     +------------+--------------------------------------------------+
     |pip         |Information about PIP                             |
     +------------+--------------------------------------------------+
+    |rss         |Resident memory of the process in bytes           |
+    +------------+--------------------------------------------------+
+    |utime       |CPU time spent in user mode in seconds            |
+    +------------+--------------------------------------------------+
+    |stime       |CPU time spent in system mode in seconds          |
+    +------------+--------------------------------------------------+
+    |fds         |Number of open file descriptors                   |
+    +------------+--------------------------------------------------+
+    |threads     |Number of active threads                          |
+    +------------+--------------------------------------------------+
+    |memlimit    |Memory limit of the cgroup in bytes               |
+    +------------+--------------------------------------------------+
+    |cpulimit    |CPU limit of the cgroup as a number of CPUs       |
+    +------------+--------------------------------------------------+
+
+    Resource descriptors are cached for a short time, so they are cheap
+    enough to be used as record forms e.g. `{rss}`. To show them in the
+    header include them as dynamic variables e.g.
+    `header.include(pos='end', dynamic=True, rss=lambda: desc.rss)`.
 
     Parameters
     ----------
@@ -103,7 +296,8 @@ class Descriptors():
     def keys(self):
         """List of descriptor names."""
         return ['hostname', 'ip', 'user', 'pid', 'system', 'python',
-                'compiler', 'interpreter', 'script', 'pip']
+                'compiler', 'interpreter', 'script', 'pip', 'rss', 'utime',
+                'stime', 'fds', 'threads', 'memlimit', 'cpulimit']
 
     @property
     def hostname(self):
@@ -162,6 +356,41 @@ class Descriptors():
         """Get current local date as a string in ISO format."""
         return dt.datetime.now().isoformat(sep=' ', timespec='seconds')
 
+    @property
+    def rss(self):
+        """Resident memory of the process in bytes."""
+        return resources.get('rss')
+
+    @property
+    def utime(self):
+        """CPU time spent in user mode in seconds."""
+        return resources.get('utime')
+
+    @property
+    def stime(self):
+        """CPU time spent in system mode in seconds."""
+        return resources.get('stime')
+
+    @property
+    def fds(self):
+        """Number of open file descriptors."""
+        return resources.get('fds')
+
+    @property
+    def threads(self):
+        """Number of active threads."""
+        return resources.get('threads')
+
+    @property
+    def memlimit(self):
+        """Memory limit of the cgroup in bytes."""
+        return resources.get('memlimit')
+
+    @property
+    def cpulimit(self):
+        """CPU limit of the cgroup as a number of CPUs."""
+        return resources.get('cpulimit')
+
 
 class Parameters(Dataset):
     """Class represents dataset with user parameters.
@@ -0,0 +1,232 @@
+"""Elements used for code execution timing."""
+
+import functools
+import threading
+import time
+
+
+class Histogram():
+    """Compact histogram of durations.
+
+    Values are grouped into log-linear buckets: each power of two range is
+    split into equal sub-buckets, so the relative error of percentiles does
+    not exceed 1/2**bits while only the used buckets are stored.
+
+    Parameters
+    ----------
+    bits : int, optional
+        Number of bits used to split each power of two range. The default is
+        4 which gives about 6% precision.
+
+    Attributes
+    ----------
+    bits : int
+        Number of bits used to split each power of two range.
+    counts : dict
+        Number of values in each bucket.
+    """
+
+    def __init__(self, bits=4):
+        self.bits = bits
+        self.counts = {}
+        pass
+
+    def add(self, value):
+        """Add value to the histogram."""
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        pass
+
+    def percentile(self, q):
+        """Get approximate value of the percentile.
+
+        Parameters
+        ----------
+        q : float
+            The percentile as a fraction e.g. 0.95.
+
+        Returns
+        -------
+        value : int
+            The middle of the bucket holding the percentile.
+        """
+        total = sum(self.counts.values())
+        if total == 0:
+            return None
+        rank = max(int(total * q + 0.999999), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return self._value(index)
+
+    def _index(self, value):
+        # Small values are stored as they are. Larger ones keep only the
+        # highest bits.
+        if value < (1 << self.bits):
+            return max(value, 0)
+        shift = value.bit_length() - self.bits - 1
+        top = value >> shift
+        return ((shift + 1) << self.bits) + top - (1 << self.bits)
+
+    def _value(self, index):
+        # Get the middle value of the bucket.
+        if index < (1 << self.bits):
+            return index
+        shift = (index >> self.bits) - 1
+        top = (index & ((1 << self.bits) - 1)) + (1 << self.bits)
+        return (top << shift) + ((1 << shift) >> 1)
+
+
+class Timing():
+    """Aggregated durations of one timer.
+
+    Parameters
+    ----------
+    name : str
+        Used to set `name` attribute.
+
+    Attributes
+    ----------
+    name : str
+        Name of the timer.
+    count : int
+        Number of measurements.
+    total : int
+        Sum of all durations in nanoseconds.
+    min : int
+        Minimum duration in nanoseconds.
+    max : int
+        Maximum duration in nanoseconds.
+    histogram : Histogram
+        Distribution of the durations.
+    since : float
+        Monotonic time when aggregation was started.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+        pass
+
+    def __repr__(self):
+        """Get this Timing string representation."""
+        return f'<Timing "{self.name}">'
+
+    def fork(self):
+        """Use own lock in the child process after fork."""
+        self._lock = threading.Lock()
+        pass
+
+    def add(self, duration):
+        """Add measured duration in nanoseconds."""
+        with self._lock:
+            self.count += 1
+            self.total += duration
+            if self.min is None or duration < self.min:
+                self.min = duration
+            if self.max is None or duration > self.max:
+                self.max = duration
+            self.histogram.add(duration)
+        pass
+
+    def reset(self):
+        """Start the aggregation from scratch."""
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.histogram = Histogram()
+        self.since = time.monotonic()
+        pass
+
+    def summary(self, reset=False):
+        """Get string with aggregated statistics.
+
+        Parameters
+        ----------
+        reset : bool, optional
+            The argument is used to start the aggregation from scratch after
+            the summary is created.
+
+        Returns
+        -------
+        summary : str
+            Statistics in milliseconds.
+        """
+        with self._lock:
+            ms = 1000000
+            mean = self.total / self.count / ms if self.count > 0 else 0
+            p50, p95, p99 = (self.histogram.percentile(q) or 0
+                             for q in (0.5, 0.95, 0.99))
+            summary = (f'{self.name}: count={self.count}, '
+                       f'total={self.total/ms:.3f}ms, mean={mean:.3f}ms, '
+                       f'min={(self.min or 0)/ms:.3f}ms, p50={p50/ms:.3f}ms, '
+                       f'p95={p95/ms:.3f}ms, p99={p99/ms:.3f}ms, '
+                       f'max={(self.max or 0)/ms:.3f}ms')
+            if reset is True:
+                self.reset()
+        return summary
+
+
+class Timer():
+    """Context manager measuring the duration of the code block.
+
+    Parameters
+    ----------
+    logger : Logger
+        The `Logger` that aggregates the durations.
+    name : str
+        Name of the timer.
+    """
+
+    __slots__ = ('logger', 'name', 'start')
+
+    def __init__(self, logger, name):
+        self.logger = logger
+        self.name = name
+        self.start = None
+        pass
+
+    def __enter__(self):
+        """Start the timer."""
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        """Stop the timer and pass the duration to the logger."""
+        duration = time.perf_counter_ns() - self.start
+        self.logger._measure(self.name, duration)
+        pass
+
+
+def timed(logger, func, name=None):
+    """Wrap function to measure the duration of each its call.
+
+    Parameters
+    ----------
+    logger : Logger
+        The `Logger` that aggregates the durations.
+    func : callable
+        The function that must be measured.
+    name : str, optional
+        Name of the timer. By default the qualified name of the function.
+
+    Returns
+    -------
+    wrapper : callable
+        The measured function.
+    """
+    name = name or func.__qualname__
+    measure = logger._measure
+    counter = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            measure(name, counter() - start)
+    return wrapper
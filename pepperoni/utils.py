@@ -2,8 +2,106 @@
 
 
 import os
+import reprlib
 import sys
 
 py_path = os.path.abspath(sys.argv[0])
 py_dir = os.path.dirname(py_path)
 py_file, py_ext = os.path.splitext(os.path.basename(py_path))
+
+
+def varint(value):
+    """Encode non-negative integer as variable length bytes (LEB128)."""
+    if value < 0x80:
+        return bytes((value,))
+    data = bytearray()
+    while value > 0x7f:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def read_varint(data, position):
+    """Decode variable length integer and return it with the next position."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def zigzag(value):
+    """Map signed integer to non-negative one for varint encoding."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    """Map non-negative integer back to signed one."""
+    return value >> 1 if value & 1 == 0 else -((value + 1) >> 1)
+
+
+class Repr(reprlib.Repr):
+    """Bounded representation of the objects used in messages.
+
+    Strings and bytes are sliced before they are represented and containers
+    show only their first items, so the full representation of a huge
+    object is never built. Objects of other types are represented by their
+    own `repr()`.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum length of strings and representations of other objects.
+    """
+
+    def __init__(self, limit):
+        super().__init__()
+        self.maxstring = limit
+        self.maxother = limit
+        self.maxlong = limit
+        self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = 20
+        self.maxdict = self.maxdeque = self.maxarray = 20
+        pass
+
+    def repr_bytes(self, x, level):
+        """Represent bytes sliced to the limit."""
+        if len(x) <= self.maxstring:
+            return repr(x)
+        return f'{repr(x[:self.maxstring])}...'
+
+    repr_bytearray = repr_bytes
+    repr_memoryview = repr_bytes
+
+
+def truncate(string, limit):
+    """Cut the string to the limit and mark the number of cut characters.
+
+    Trailing new line is kept so cut records stay on their own lines.
+    """
+    if limit is None or isinstance(limit, bool) is True:
+        return string
+    # Trailing new line is not counted, so the string is never cut only to
+    # get longer.
+    end = '\n' if string.endswith('\n') is True else ''
+    if len(string) - len(end) <= limit:
+        return string
+    cut = len(string) - limit - len(end)
+    return f'{string[:limit]}...[truncated {cut} chars]{end}'
+
+
+def shorten(value, limit):
+    """Get the string of the value not longer than the limit.
+
+    String values are truncated, other objects are rendered with the
+    bounded representation first.
+    """
+    if limit is None or isinstance(limit, bool) is True:
+        return str(value)
+    if isinstance(value, str) is False:
+        value = Repr(limit).repr(value)
+    return truncate(value, limit)
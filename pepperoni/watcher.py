@@ -0,0 +1,145 @@
+"""Runtime reconfiguration of loggers."""
+
+import inspect
+import json
+import os
+import signal
+import threading
+
+from .cache import all_loggers
+
+
+class Watcher(threading.Thread):
+    """Background thread applying the configuration file to the loggers.
+
+    Configuration file is a JSON object with the parameters of
+    `Logger.configure()`, e.g. `{"debug": true, "file": false}`. Key
+    `loggers` can contain the parameters for other loggers by their names,
+    e.g. `{"loggers": {"app.db": {"debug": true}}}`. File is checked by its
+    modification time, so no additional dependencies are needed. Signals
+    `SIGUSR1` and `SIGHUP` force the reload when the watcher was started
+    from the main thread. Only the parameters changed since the last reload
+    are applied, so e.g. `"file": true` does not open new log file each
+    time.
+
+    Parameters
+    ----------
+    logger : Logger
+        Used to set `logger` attribute.
+    path : str
+        Used to set `path` attribute.
+    interval : int or float, optional
+        Used to set `interval` attribute.
+    signals : bool, optional
+        The argument is used to enable reload by signals.
+
+    Attributes
+    ----------
+    logger : Logger
+        The `Logger` which is configured by the file.
+    path : str
+        Path to the configuration file.
+    interval : float
+        Number of seconds between the checks of the file. The default is 5.
+    """
+
+    signals = ('SIGUSR1', 'SIGHUP')
+
+    def __init__(self, logger, path, interval=5, signals=True):
+        super().__init__(name='pepperoni-watcher', daemon=True)
+        self.logger = logger
+        self.path = path
+        self.interval = interval
+        self._mtime = None
+        self._applied = {}
+        self._stopped = False
+        self._wakeup = threading.Event()
+        self._handlers = {}
+        if signals is True:
+            self.__install()
+        pass
+
+    def run(self):
+        """Check the file until the watcher is stopped."""
+        forced = True
+        while self._stopped is False:
+            self.check(forced=forced)
+            forced = self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+        pass
+
+    def stop(self):
+        """Stop the watcher and restore the signal handlers."""
+        self._stopped = True
+        self._wakeup.set()
+        if threading.current_thread() is threading.main_thread():
+            for signum, handler in self._handlers.items():
+                signal.signal(signum, handler)
+            self._handlers = {}
+        pass
+
+    def reload(self):
+        """Force the watcher to reload the file."""
+        self._wakeup.set()
+        pass
+
+    def check(self, forced=False):
+        """Apply the file if it was modified since the last check.
+
+        Parameters
+        ----------
+        forced : bool, optional
+            The argument is used to apply the file even if it is not
+            modified.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if forced is True or mtime != self._mtime:
+            self._mtime = mtime
+            self.apply()
+        pass
+
+    def apply(self):
+        """Read the file and configure the loggers."""
+        try:
+            with open(self.path, 'r') as fh:
+                config = json.load(fh)
+            loggers = config.pop('loggers', {})
+            # Bad configuration must not break the logging, so all parameters
+            # are checked before any logger is touched.
+            items = [(self.logger, config)]
+            for name, options in loggers.items():
+                items.append((all_loggers[name], options))
+            for logger, options in items:
+                inspect.signature(logger.configure).bind(**options)
+            for logger, options in items:
+                applied = self._applied.get(logger.name, {})
+                changes = {key: value for key, value in options.items()
+                           if key not in applied or applied[key] != value}
+                if len(changes) > 0:
+                    logger.configure(**changes)
+                self._applied[logger.name] = options
+        except Exception as error:
+            self.logger.warning(f'CONFIG {self.path} was not applied: '
+                                f'{error.__class__.__name__}: {error}')
+        else:
+            self.logger.info(f'CONFIG {self.path} applied')
+        pass
+
+    def __install(self):
+        # Signal handlers can be set only in the main thread. Handler just
+        # wakes the watcher up, so nothing heavy is done inside the signal.
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for name in self.signals:
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                handler = signal.signal(signum, self.__handle)
+                self._handlers[signum] = handler
+        pass
+
+    def __handle(self, signum, frame):
+        self.reload()
+        pass
@@ -13,7 +13,7 @@ long_description = open('README.md', 'r').read()
 long_description_content_type = 'text/markdown'
 license = pepperoni.__license__
 url = 'https://github.com/t3eHawk/pepperoni'
-install_requires = ['sqlalchemy']
+install_requires = ['sqlalchemy>=1.4.33']
 packages = setuptools.find_packages()
 classifiers = ['Programming Language :: Python :: 3',
                'License :: OSI Approved :: MIT License',
@@ -0,0 +1,18 @@
+"""Common fixtures of the tests."""
+
+import itertools
+
+import pytest
+
+import pepperoni
+
+names = itertools.count()
+
+
+@pytest.fixture
+def logger(tmp_path):
+    """Get the logger writing only to the added outputs."""
+    logger = pepperoni.logger(f'test{next(names)}', console=False,
+                              file=False, directory=str(tmp_path))
+    yield logger
+    logger.dispose()
@@ -0,0 +1,93 @@
+"""Tests of the atomic appending to the shared file."""
+
+import os
+
+import pytest
+
+from pepperoni.output import Appender
+
+
+def content(path):
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def test_batch_is_written_on_flush(tmp_path):
+    path = str(tmp_path / 'shared.log')
+    appender = Appender(path, limit=100)
+    appender.write(b'first\n')
+    appender.write(b'second\n')
+    assert content(path) == b''
+    appender.flush()
+    assert content(path) == b'first\nsecond\n'
+    appender.close()
+
+
+@pytest.mark.skipif(hasattr(os, 'writev') is False,
+                    reason='writev is not available')
+def test_batch_is_limited(tmp_path, monkeypatch):
+    path = str(tmp_path / 'shared.log')
+    calls = []
+    writev = os.writev
+    monkeypatch.setattr(os, 'writev',
+                        lambda fd, batch: calls.append(batch) or
+                        writev(fd, batch))
+    appender = Appender(path, limit=10)
+    appender.write(b'1234\n')
+    appender.write(b'5678\n')
+    appender.write(b'abcd\n')
+    # Large record is written alone.
+    appender.write(b'x' * 20 + b'\n')
+    appender.close()
+    assert calls == [[b'1234\n', b'5678\n'], [b'abcd\n'],
+                     [b'x' * 20 + b'\n']]
+    assert content(path) == b'1234\n5678\nabcd\n' + b'x' * 20 + b'\n'
+
+
+def test_close_writes_the_batch(tmp_path):
+    path = str(tmp_path / 'shared.log')
+    appender = Appender(path)
+    appender.write(b'last\n')
+    appender.close()
+    appender.close()
+    assert content(path) == b'last\n'
+
+
+@pytest.mark.skipif(hasattr(os, 'fork') is False,
+                    reason='fork is not available')
+def test_processes_do_not_interleave(tmp_path):
+    path = str(tmp_path / 'shared.log')
+    pids = []
+    for n in range(4):
+        pid = os.fork()
+        if pid == 0:
+            appender = Appender(path, limit=4096)
+            for i in range(500):
+                appender.write(f'{n} {i} {"x" * 50}\n'.encode())
+            appender.close()
+            os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    lines = content(path).decode().splitlines()
+    assert len(lines) == 2000
+    assert all(line.endswith('x' * 50) for line in lines) is True
+
+
+def test_atomic_file_output(logger):
+    logger.configure(file=True, format='{message}\n')
+    output = logger.root.file
+    output.configure(atomic=True, limit=64)
+    logger.info('first')
+    logger.info('second')
+    output.flush()
+    assert content(output.path) == b'first\nsecond\n'
+
+
+def test_lost_handler_is_closed(tmp_path):
+    path = str(tmp_path / 'shared.log')
+    appender = Appender(path)
+    fd = appender.fileno()
+    del appender
+    with pytest.raises(OSError):
+        os.fstat(fd)
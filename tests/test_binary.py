@@ -0,0 +1,77 @@
+"""Tests of the binary output and its decoder."""
+
+import json
+import os
+
+from pepperoni.decode import decode, main
+
+
+def binary(logger):
+    logger.configure(binary=True)
+    return logger.root.binary
+
+
+def test_round_trip(logger):
+    output = binary(logger)
+    with logger.context(request='r1'):
+        logger.info('user {name} has {count} items', name='bob', count=-3,
+                    ratio=0.5, flag=True, missing=None)
+    logger.warning('second')
+    output.flush()
+    first, second = decode(output.path)
+    assert first['message'] == 'user bob has -3 items'
+    assert first['rectype'] == 'INFO'
+    assert first['logname'] == logger.name
+    assert first['flname'] == 'test_binary'
+    assert first['objname'] == 'test_round_trip'
+    assert first['request'] == 'r1'
+    assert first['ratio'] == 0.5
+    assert first['flag'] is True
+    assert first['missing'] is None
+    assert second['message'] == 'second'
+    assert second['timestamp'] >= first['timestamp']
+
+
+def test_strings_are_written_once(logger):
+    output = binary(logger)
+    for i in range(3):
+        logger.info('same {i}', i=i)
+    output.flush()
+    with open(output.path, 'rb') as fh:
+        assert fh.read().count(b'same {i}') == 1
+    assert [item['message'] for item in decode(output.path)] == \
+        ['same 0', 'same 1', 'same 2']
+
+
+def test_new_session_when_strings_are_full(logger):
+    output = binary(logger)
+    output.maxstrings = 10
+    for i in range(20):
+        logger.info(f'unique {i}')
+    output.flush()
+    assert len(output._strings) < 20
+    messages = [item['message'] for item in decode(output.path)]
+    assert messages == [f'unique {i}' for i in range(20)]
+
+
+def test_truncated_file(logger):
+    output = binary(logger)
+    for i in range(5):
+        logger.info('record {i}', i=i)
+    output.flush()
+    size = os.path.getsize(output.path)
+    with open(output.path, 'rb+') as fh:
+        fh.truncate(size - 1)
+    messages = [item['message'] for item in decode(output.path)]
+    assert messages == [f'record {i}' for i in range(4)]
+
+
+def test_command_line(logger, capsys):
+    output = binary(logger)
+    logger.info('printed {value}', value=1)
+    output.flush()
+    main(['--format', '{rectype}|{message}\\n', output.path])
+    assert capsys.readouterr().out == 'INFO|printed 1\n'
+    main(['--json', output.path])
+    item = json.loads(capsys.readouterr().out)
+    assert item['value'] == 1
@@ -0,0 +1,50 @@
+"""Tests of the circuit breaker and of the delivery at exit."""
+
+from pepperoni.output import Breaker
+
+
+def test_trips_after_errors():
+    breaker = Breaker(errors=2, cooldown=60)
+    breaker.failure()
+    assert breaker.state == 'closed'
+    breaker.failure()
+    assert breaker.state == 'open'
+    assert breaker.trips == 1
+    assert breaker.allow() is False
+    assert breaker.remaining() > 0
+
+
+def test_probe_closes_or_opens_again():
+    breaker = Breaker(errors=1, cooldown=60)
+    breaker.failure()
+    breaker.probe()
+    assert breaker.allow() is True
+    assert breaker.state == 'half-open'
+    breaker.failure()
+    assert breaker.state == 'open'
+    assert breaker.trips == 2
+    breaker.probe()
+    assert breaker.allow() is True
+    breaker.success(0.01)
+    assert breaker.state == 'closed'
+    assert breaker.remaining() == 0
+
+
+def test_trips_when_slow():
+    breaker = Breaker(latency=0.5, cooldown=60)
+    for i in range(Breaker.samples):
+        breaker.success(1.0)
+    assert breaker.state == 'open'
+    assert breaker.average == 1.0
+
+
+def test_exit_steps_are_isolated(logger, capsys):
+    calls = []
+
+    def fail():
+        raise RuntimeError('broken')
+    logger.root.email.drain = fail
+    logger.root.table.drain = lambda: calls.append('table')
+    logger._finish()
+    assert calls == ['table']
+    assert 'RuntimeError: broken' in capsys.readouterr().err
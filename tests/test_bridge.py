@@ -0,0 +1,50 @@
+"""Tests of the bridge with built-in logging."""
+
+import logging
+import time
+
+
+def read(logger):
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def test_capture_keeps_name_and_time(logger):
+    logger.configure(file=True, format='{logname} {rectype} {message}\n')
+    handler = logger.capture('bridge.capture', level=logging.INFO)
+    stdlib_logger = logging.getLogger('bridge.capture')
+    stdlib_logger.propagate = False
+    try:
+        record = stdlib_logger.makeRecord('bridge.capture', logging.WARNING,
+                                          __file__, 1, 'late {%s}', ('x',),
+                                          None)
+        record.created = time.time() - 3600
+        handler.handle(record)
+        stdlib_logger.debug('filtered')
+        stdlib_logger.info('second')
+    finally:
+        stdlib_logger.removeHandler(handler)
+    assert read(logger) == ('bridge.capture WARNING late {x}\n'
+                            'bridge.capture INFO second\n')
+
+
+def test_capture_timestamp(logger):
+    logger.configure(file=True, format='{timestamp}\n')
+    handler = logger.capture('bridge.timestamp')
+    record = logging.LogRecord('bridge.timestamp', logging.INFO, __file__,
+                               1, 'old', None, None)
+    record.created = 1000.5
+    handler.handle(record)
+    logging.getLogger('bridge.timestamp').removeHandler(handler)
+    assert read(logger) == '1000500000000\n'
+
+
+def test_adapter_extra(logger):
+    logger.configure(file=True, format='{rectype} {message}\n')
+    adapter = logger.adapter()
+    adapter.info('hello %s {user}', 'world',
+                 extra={'user': 'bob', 'message': 'lost', 'error': True})
+    adapter.debug('filtered', extra={'user': 'bob'})
+    assert read(logger) == 'INFO hello world {user}\n'
+    assert logger.with_error is False
@@ -0,0 +1,43 @@
+"""Tests of the child loggers."""
+
+import pytest
+
+
+def test_child_shares_outputs(logger):
+    child = logger.child('db')
+    assert child.name == f'{logger.name}.db'
+    assert child.parent is logger
+    assert child.root is logger.root
+    assert logger.child('db') is child
+
+
+def test_child_writes_to_parent_file(logger):
+    logger.configure(file=True, format='{logname} {message}\n')
+    logger.child('db').info('from child')
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        assert fh.read().endswith(f'{logger.name}.db from child\n')
+
+
+def test_child_rejects_shared_outputs(logger):
+    child = logger.child('db')
+    status = logger.root.console.status
+    with pytest.raises(ValueError):
+        child.configure(console=not status)
+    assert logger.root.console.status is status
+
+
+def test_child_own_format_and_filters(logger):
+    record = logger.formatter.record
+    child = logger.child('db', format='{message}\n', debug=True)
+    assert child.formatter.record == '{message}\n'
+    assert logger.formatter.record == record
+    assert child.filters['debug'] is True
+    assert logger.filters['debug'] is False
+
+
+def test_child_error_reaches_parent(logger):
+    child = logger.child('db')
+    child.error('failed')
+    assert child.with_error is True
+    assert logger.with_error is True
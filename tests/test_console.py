@@ -0,0 +1,45 @@
+"""Tests of the buffered console output."""
+
+import time
+
+
+def console(logger, **kwargs):
+    logger.configure(console=True, format='{rectype} {message}\n')
+    logger.root.console.configure(**kwargs)
+    return logger.root.console
+
+
+def test_records_are_buffered(logger, capsys):
+    output = console(logger, buffer=None, interval=60)
+    logger.info('first')
+    logger.info('second')
+    assert capsys.readouterr().out == ''
+    output.flush()
+    assert capsys.readouterr().out == 'INFO first\nINFO second\n'
+
+
+def test_full_buffer_and_error_are_flushed(logger, capsys):
+    console(logger, buffer=20, interval=60)
+    logger.info('short')
+    assert capsys.readouterr().out == ''
+    logger.info('long enough to fill')
+    assert capsys.readouterr().out == 'INFO short\nINFO long enough to fill\n'
+    logger.info('before error')
+    logger.error('failed')
+    assert capsys.readouterr().out == 'INFO before error\nERROR failed\n'
+
+
+def test_interval_flushes_buffer(logger, capsys):
+    console(logger, buffer=True, interval=0.05)
+    logger.info('delayed')
+    time.sleep(0.3)
+    assert capsys.readouterr().out == 'INFO delayed\n'
+
+
+def test_unbuffered_and_stderr(logger, capsys):
+    console(logger, buffer=False, stderr=True)
+    logger.info('at once')
+    logger.error('failed')
+    captured = capsys.readouterr()
+    assert captured.out == 'INFO at once\n'
+    assert captured.err == 'ERROR failed\n'
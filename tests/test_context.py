@@ -0,0 +1,61 @@
+"""Tests of the fields bound to the context."""
+
+import asyncio
+import threading
+
+import pytest
+
+from pepperoni.cache import context
+from pepperoni.record import Record
+
+
+def render(logger, format):
+    return str(Record(logger, 'info', 'message', format=format))
+
+
+def test_bind_and_unbind(logger):
+    token = logger.bind(request='r1', user='bob')
+    try:
+        assert render(logger, '{request} {user}') == 'r1 bob'
+        logger.unbind('user')
+        assert render(logger, '{request} [{user}]') == 'r1 []'
+    finally:
+        context.reset(token)
+    assert render(logger, '[{request}]') == '[]'
+
+
+def test_context_block(logger):
+    with logger.context(request='outer'):
+        with logger.context(request='inner'):
+            assert render(logger, '{request}') == 'inner'
+        assert render(logger, '{request}') == 'outer'
+
+
+def test_unknown_form_raises(logger):
+    with pytest.raises(KeyError):
+        render(logger, '{never_bound_form}')
+
+
+def test_wrap_passes_context_to_thread(logger):
+    results = []
+
+    def target():
+        results.append(render(logger, '[{request}]'))
+    with logger.context(request='r2'):
+        threads = [threading.Thread(target=logger.wrap(target)),
+                   threading.Thread(target=target)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    assert results == ['[r2]', '[]']
+
+
+def test_tasks_keep_own_fields(logger):
+    async def task(name):
+        logger.bind(task=name)
+        await asyncio.sleep(0)
+        return render(logger, '{task}')
+
+    async def main():
+        return await asyncio.gather(task('a'), task('b'))
+    assert asyncio.run(main()) == ['a', 'b']
@@ -0,0 +1,59 @@
+"""Tests of the dispatch table of the output root."""
+
+from pepperoni.output import Branch
+
+
+class Collector(Branch):
+    """Output keeping the received records."""
+
+    def __init__(self, root, status=True):
+        super().__init__(root, status=status)
+        self.records = []
+
+    def write(self, record):
+        self.records.append(str(record))
+
+
+def test_added_output_gets_records(logger):
+    logger.configure(format='{rectype} {message}\n')
+    collector = Collector(logger.root)
+    logger.root.add('collector', collector)
+    assert logger.root.collector is collector
+    logger.info('first')
+    logger.line('plain')
+    assert collector.records == ['INFO first\n', 'plain\n']
+    assert logger.root.remove('collector') is collector
+    logger.info('second')
+    assert len(collector.records) == 2
+    assert hasattr(logger.root, 'collector') is False
+
+
+def test_routing_by_levels(logger):
+    logger.configure(format='{rectype} {message}\n')
+    errors = Collector(logger.root)
+    logger.root.add('errors', errors, levels=['error', 'critical'])
+    logger.info('skipped')
+    logger.error('failed')
+    assert errors.records == ['ERROR failed\n']
+    errors.route()
+    logger.info('routed again')
+    assert errors.records[-1] == 'INFO routed again\n'
+
+
+def test_closed_output_is_skipped(logger):
+    logger.configure(format='{message}\n')
+    collector = Collector(logger.root)
+    logger.root.add('collector', collector)
+    collector.close()
+    logger.info('skipped')
+    collector.open()
+    logger.info('written')
+    assert collector.records == ['written\n']
+
+
+def test_strings_are_not_sent_to_record_outputs(logger):
+    collector = Collector(logger.root)
+    collector.strings = False
+    logger.root.add('collector', collector)
+    logger.line('plain')
+    assert collector.records == []
@@ -0,0 +1,82 @@
+"""Tests of the durability of the file output."""
+
+import os
+import time
+
+import pytest
+
+
+def content(logger):
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while condition() is False and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def syncs(monkeypatch):
+    """Count the synchronizations of the files."""
+    calls = []
+    fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: calls.append(fd) or fsync(fd))
+    return calls
+
+
+def configure(logger, durability, **kwargs):
+    logger.configure(file=True, format='{rectype} {message}\n')
+    logger.root.file.configure(durability=durability, **kwargs)
+    return logger.root.file
+
+
+def test_unknown_durability(logger):
+    with pytest.raises(ValueError):
+        configure(logger, 'sometimes')
+    assert logger.root.file.durability == 'flush'
+
+
+def test_none_is_buffered(logger, syncs):
+    output = configure(logger, 'none')
+    logger.info('buffered')
+    assert content(logger) == ''
+    output.flush()
+    assert content(logger) == 'INFO buffered\n'
+    assert syncs == []
+
+
+def test_flush_is_passed_at_once(logger, syncs):
+    configure(logger, 'flush')
+    logger.info('passed')
+    assert content(logger) == 'INFO passed\n'
+    assert syncs == []
+
+
+def test_fsync_on_error(logger, syncs):
+    configure(logger, 'fsync-on-error')
+    logger.info('passed')
+    assert content(logger) == 'INFO passed\n'
+    assert syncs == []
+    logger.error('failed')
+    assert len(syncs) == 1
+
+
+def test_always(logger, syncs):
+    configure(logger, 'always')
+    logger.info('first')
+    logger.info('second')
+    assert len(syncs) == 2
+    assert logger.root.file._synced == 2
+
+
+def test_periodic_syncs_the_last_records(logger, syncs):
+    output = configure(logger, 'periodic', period=0.2)
+    logger.info('first')
+    logger.info('second')
+    # Nothing follows, so the timer synchronizes the records.
+    assert wait(lambda: output._synced == 2) is True
+    assert content(logger) == 'INFO first\nINFO second\n'
+    assert len(syncs) == 1
@@ -0,0 +1,81 @@
+"""Tests of the logger in the child process after fork."""
+
+import json
+import os
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(hasattr(os, 'fork') is False,
+                                reason='fork is not available')
+
+
+def in_child(func):
+    # Run the function in the child process and get its result back.
+    reader, writer = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(reader)
+        try:
+            result = func()
+        except BaseException as error:
+            result = repr(error)
+        os.write(writer, json.dumps(result).encode())
+        os._exit(0)
+    os.close(writer)
+    with os.fdopen(reader) as fh:
+        result = json.loads(fh.read())
+    os.waitpid(pid, 0)
+    return result
+
+
+def read(path):
+    with open(path) as fh:
+        return fh.read()
+
+
+def test_records_are_written_once(logger):
+    logger.configure(file=True, format='{message}\n')
+    logger.info('parent')
+
+    def child():
+        logger.info('child')
+        logger.root.file.flush()
+        return os.getpid()
+    in_child(child)
+    logger.root.file.flush()
+    assert read(logger.root.file.path).splitlines() == ['parent', 'child']
+
+
+def test_file_per_process(logger):
+    logger.configure(file=True, format='{message}\n')
+    logger.root.file.configure(perpid=True)
+    logger.info('parent')
+
+    def child():
+        logger.info('child')
+        logger.root.file.flush()
+        return logger.root.file.path
+    path = in_child(child)
+    assert path != logger.root.file.path
+    assert read(path) == 'child\n'
+
+
+def test_header_values_are_resolved_again(logger):
+    header = logger.header
+
+    def slow():
+        time.sleep(0.3)
+        return 'done'
+    header.include(slow=slow)
+    header.timeout = 0
+    header.create()
+    assert 'slow' in header._threads
+
+    def child():
+        deadline = time.monotonic() + 5
+        while 'slow' not in header._values and time.monotonic() < deadline:
+            header.create()
+            time.sleep(0.05)
+        return header._values.get('slow')
+    assert in_child(child) == 'done'
@@ -0,0 +1,59 @@
+"""Tests of the registry limiting the number of open files."""
+
+from pepperoni.output import Handles
+
+
+class Owner():
+    """Output which handler can be released unless it is busy."""
+
+    def __init__(self, handles, busy=False):
+        self.handles = handles
+        self.busy = busy
+        self.released = 0
+
+    def release(self, blocking=True):
+        if self.busy is True and blocking is False:
+            return False
+        self.released += 1
+        self.handles.remove(self)
+        return True
+
+
+def test_least_recently_used_is_released():
+    handles = Handles(maxsize=2)
+    first, second, third = (Owner(handles) for i in range(3))
+    handles.touch(first)
+    handles.touch(second)
+    handles.touch(first)
+    handles.touch(third)
+    assert second.released == 1
+    assert first.released == 0
+    assert third.released == 0
+    assert len(handles) == 2
+
+
+def test_busy_owner_is_skipped():
+    handles = Handles(maxsize=1)
+    busy, idle = Owner(handles, busy=True), Owner(handles)
+    handles.touch(busy)
+    handles.touch(idle)
+    assert busy.released == 0
+    assert len(handles) == 2
+    busy.busy = False
+    last = Owner(handles)
+    handles.touch(last)
+    assert busy.released == 1
+    assert idle.released == 1
+    assert len(handles) == 1
+    assert last.released == 0
+
+
+def test_released_file_is_opened_again(logger):
+    logger.configure(file=True, format='{message}\n')
+    output = logger.root.file
+    logger.info('first')
+    assert output.release() is True
+    logger.info('second')
+    output.flush()
+    with open(output.path) as fh:
+        assert fh.read() == 'first\nsecond\n'
@@ -0,0 +1,43 @@
+"""Tests of the header rendering."""
+
+import threading
+import time
+
+from pepperoni.header import Header
+
+
+def line(header, name):
+    for string in header.create().splitlines():
+        if f'{name.upper()}:' in string:
+            return string.strip(header.div).strip()
+
+
+def test_static_items_are_evaluated_once(logger):
+    calls = []
+    header = Header(logger, *Header(logger).items,
+                    static=lambda: calls.append(1) or 'value')
+    header.include(dynamic=True, counter=lambda: len(calls))
+    assert line(header, 'static') == 'STATIC: value'
+    assert line(header, 'static') == 'STATIC: value'
+    assert len(calls) == 1
+    header.refresh()
+    assert line(header, 'counter') == 'COUNTER: 2'
+
+
+def test_slow_item_is_waited_once(logger):
+    event = threading.Event()
+    header = Header(logger, *Header(logger).items,
+                    slow=lambda: event.wait() and 'ready')
+    header.timeout = 0.1
+    start = time.monotonic()
+    assert line(header, 'slow') == 'SLOW: unknown'
+    assert time.monotonic() - start >= 0.1
+    start = time.monotonic()
+    assert line(header, 'slow') == 'SLOW: unknown'
+    assert time.monotonic() - start < 0.1
+    event.set()
+    deadline = time.monotonic() + 5
+    while 'slow' in header._threads and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert line(header, 'slow') == 'SLOW: ready'
+    assert line(header, 'slow') == 'SLOW: ready'
@@ -0,0 +1,137 @@
+"""Tests of the HTTP output and its spool against the local endpoint."""
+
+import gzip
+import http.server
+import json
+import threading
+import time
+
+import pytest
+
+from pepperoni.output import HTTP, Spool
+
+
+class Endpoint(http.server.ThreadingHTTPServer):
+    """Local endpoint keeping the received records."""
+
+    def __init__(self):
+        self.records = []
+        self.statuses = []
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server_address
+        return f'http://{host}:{port}/logs'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        status = 200
+        if self.server.statuses:
+            status = self.server.statuses.pop(0)
+        if status == 200:
+            self.server.records.extend(json.loads(body))
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    endpoint = Endpoint()
+    yield endpoint
+    endpoint.close()
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while condition() is False and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_delivery(logger, endpoint):
+    output = HTTP(logger.root, status=True, url=endpoint.url)
+    logger.root.add('http', output)
+    with logger.context(request='r1'):
+        for i in range(10):
+            logger.info('record {i}', i=i)
+    logger.flush()
+    assert wait(lambda: len(endpoint.records) == 10) is True
+    record = endpoint.records[-1]
+    assert record['message'] == 'record 9'
+    assert record['request'] == 'r1'
+    assert record['i'] == 9
+
+
+def test_retry_with_spool(logger, endpoint):
+    endpoint.statuses.extend([503, 503])
+    output = HTTP(logger.root, status=True, url=endpoint.url, backoff=0.1)
+    logger.root.add('http', output)
+    logger.info('first')
+    logger.info('second')
+    assert wait(lambda: len(endpoint.records) == 2) is True
+    messages = [record['message'] for record in endpoint.records]
+    assert messages == ['first', 'second']
+    # Spool is committed after the endpoint answered.
+    assert wait(lambda: output.spool.pending is False) is True
+
+
+def test_rejected_batch_is_dropped(logger, endpoint):
+    endpoint.statuses.append(400)
+    output = HTTP(logger.root, status=True, url=endpoint.url)
+    logger.root.add('http', output)
+    logger.info('rejected')
+    assert wait(lambda: output.dropped == 1) is True
+    logger.info('accepted')
+    assert wait(lambda: len(endpoint.records) == 1) is True
+    assert endpoint.records[0]['message'] == 'accepted'
+
+
+def test_spool_with_partial_entry(logger, endpoint, tmp_path):
+    # Spool of the crashed run ends with the cut entry.
+    path = str(tmp_path / 'http.spool')
+    spool = Spool(path)
+    spool.append([json.dumps({'message': 'left'}).encode()])
+    spool.close()
+    with open(path, 'ab') as fh:
+        fh.write(Spool.prefix.pack(100) + b'{"mess')
+    output = HTTP(logger.root, status=True, url=endpoint.url, spool=path)
+    logger.root.add('http', output)
+    logger.info('new')
+    assert wait(lambda: len(endpoint.records) == 2) is True
+    messages = [record['message'] for record in endpoint.records]
+    assert messages == ['left', 'new']
+    assert output._thread.is_alive() is True
+
+
+def test_spool_read_drops_partial_tail(tmp_path):
+    path = str(tmp_path / 'test.spool')
+    spool = Spool(path)
+    spool.append([b'one', b'two'])
+    # Tail is cut after the spool was opened.
+    with open(path, 'ab') as fh:
+        fh.write(Spool.prefix.pack(10) + b'thr')
+    spool._size += Spool.prefix.size + 3
+    entries, offset = spool.read(10)
+    assert entries == [b'one', b'two']
+    spool.commit(offset)
+    assert spool.pending is False
+    spool.close()
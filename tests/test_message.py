@@ -0,0 +1,49 @@
+"""Tests of the limits of the message and record length."""
+
+from pepperoni.utils import shorten, truncate
+
+
+def test_truncate():
+    assert truncate('abcdef', 3) == 'abc...[truncated 3 chars]'
+    assert truncate('abc', 3) == 'abc'
+    assert truncate('abcdef', False) == 'abcdef'
+    assert truncate('abcdef\n', 3) == 'abc...[truncated 3 chars]\n'
+
+
+def test_trailing_new_line_is_not_counted():
+    assert truncate('abc\n', 3) == 'abc\n'
+    assert truncate('abcd\n', 3) == 'abc...[truncated 1 chars]\n'
+
+
+def test_shorten():
+    # Bytes are sliced before they are represented.
+    value = shorten(b'x' * 100, 20)
+    assert value == "b'" + 'x' * 18 + '...[truncated 6 chars]'
+    assert shorten(list(range(100)), 1000).endswith('19, ...]')
+    assert shorten(12345, None) == '12345'
+    assert shorten('x' * 10, 4) == 'xxxx...[truncated 6 chars]'
+
+
+def test_logger_maxmessage(logger):
+    logger.configure(file=True, format='{message}\n', maxmessage=5)
+    logger.info('x' * 10)
+    logger.info({'key': 'y' * 10})
+    logger.info('{v}', v='z' * 10)
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        lines = fh.read().splitlines()
+    assert lines[0] == 'xxxxx...[truncated 5 chars]'
+    assert lines[1].startswith("{'key...[truncated")
+    assert lines[2] == 'zzzzz...[truncated 5 chars]'
+    logger.configure(maxmessage=True)
+    assert logger.maxmessage == logger.messagelength
+
+
+def test_output_maxlength(logger):
+    logger.configure(file=True, format='{message}\n')
+    logger.root.file.maxlength = 4
+    logger.info('abcd')
+    logger.info('abcdefgh')
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        assert fh.read() == 'abcd\nabcd...[truncated 4 chars]\n'
@@ -0,0 +1,91 @@
+"""Tests of the profilers integrated with the logger."""
+
+import os
+import pstats
+import sys
+import time
+
+import pytest
+
+from pepperoni.profiler import Sampler
+
+
+def read(logger):
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def work():
+    return sum(i * i for i in range(10000))
+
+
+def test_cpu_profile(logger):
+    logger.configure(file=True, format='{message}\n')
+    with logger.profile('block', top=5) as profiler:
+        work()
+    assert os.path.exists(profiler.path) is True
+    assert profiler.path.endswith('.block.prof')
+    pstats.Stats(profiler.path)
+    lines = read(logger).splitlines()
+    assert 0 < len(lines) <= 5
+    assert lines[0].startswith('PROFILE block: ')
+    assert profiler.path in logger.root.email.attachments
+
+
+def test_memory_profile_decorator(logger):
+    logger.configure(file=True, format='{message}\n')
+
+    @logger.profile(mode='memory', top=3)
+    def allocate():
+        return [bytes(1024) for i in range(100)]
+    allocate()
+    lines = read(logger).splitlines()
+    assert 0 < len(lines) <= 3
+    assert lines[0].startswith(f'PROFILE {allocate.__qualname__}: ')
+    assert 'KiB in' in lines[0]
+
+
+def test_nested_cpu_profile_does_nothing(logger):
+    with logger.profile('outer'):
+        with logger.profile('inner') as inner:
+            work()
+    assert inner.path is None
+
+
+def test_unknown_mode(logger):
+    with pytest.raises(ValueError):
+        logger.profile('block', mode='disk')
+
+
+def spin(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        work()
+
+
+def test_sampler_trie(logger):
+    sampler = Sampler(logger, depth=2)
+    frame = sys._getframe()
+    sampler._add(frame)
+    sampler._add(frame)
+    stacks = sampler.stacks()
+    assert len(stacks) == 1
+    stack, count = stacks[0]
+    assert count == 2
+    assert len(stack.split(';')) == 2
+    assert stack.endswith(f'test_sampler_trie (test_profiler.py:'
+                          f'{frame.f_code.co_firstlineno})')
+
+
+def test_sampler_reports_hot_stack(logger):
+    logger.configure(file=True, format='{message}\n')
+    sampler = logger.sample(rate=200, interval=60, top=3)
+    spin(0.3)
+    sampler.stop()
+    assert sampler.samples > 0
+    with open(sampler.path) as fh:
+        assert 'spin (test_profiler.py' in fh.read()
+    lines = read(logger).splitlines()
+    assert 0 < len(lines) <= 3
+    assert lines[0].startswith('SAMPLE ')
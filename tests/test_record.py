@@ -0,0 +1,32 @@
+"""Tests of the records and their date strings."""
+
+import datetime as dt
+
+from pepperoni.record import Clock, Record
+
+
+def test_clock_formats_once_per_second():
+    clock = Clock()
+    second = 1700000000 * 1000000000
+    first = clock.isodate(second + 1000)
+    assert clock.isodate(second + 999000000) is first
+    expected = dt.datetime.fromtimestamp(1700000000)
+    assert first == expected.isoformat(sep=' ', timespec='seconds')
+    assert clock.isodate(second + 1000000000) != first
+
+
+def test_clock_milliseconds_and_utc():
+    clock = Clock()
+    timestamp = 1700000000 * 1000000000 + 42000000
+    assert clock.msdate(timestamp).endswith('.042')
+    assert clock.utcdate(timestamp).startswith('2023-11-14 22:13:20')
+
+
+def test_record_lazy_dates(logger):
+    record = Record(logger, 'info', 'message {value}', value=1,
+                    format='{msdate} {rectype} {message}')
+    assert 'msdate' not in record.__dict__
+    string = str(record)
+    assert string.startswith(record.isodate)
+    assert string.endswith(' INFO message 1')
+    assert isinstance(record.datetime, dt.datetime)
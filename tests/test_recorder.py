@@ -0,0 +1,72 @@
+"""Tests of the flight recorder."""
+
+import os
+import signal
+import time
+
+import pytest
+
+
+def read(logger):
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while condition() is False and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_filtered_records_are_released_on_error(logger):
+    logger.configure(file=True, recorder=True,
+                     format='{rectype} {flname} {message}\n')
+    logger.debug('hidden {value}', value=1)
+    logger.info('shown')
+    assert read(logger) == 'INFO test_recorder shown\n'
+    logger.error('failed')
+    lines = read(logger).splitlines()
+    assert 'DEBUG  hidden 1' in lines
+    assert lines[-1] == 'ERROR test_recorder failed'
+    # Released records are not written for the second time.
+    logger.error('failed again')
+    assert read(logger).count('hidden 1') == 1
+
+
+def test_dump_keeps_last_records(logger):
+    logger.configure(recorder=True, format='{message}\n')
+    recorder = logger.root.recorder
+    recorder.configure(size=3)
+    for i in range(5):
+        logger.debug(f'record {i}')
+    assert recorder.dump() == ['record 2\n', 'record 3\n', 'record 4\n']
+
+
+def test_ring_of_the_process_is_removed_on_close(logger):
+    logger.configure(recorder=True)
+    recorder = logger.root.recorder
+    path = recorder.path
+    assert f'.{os.getpid()}.ring' in path
+    assert os.path.exists(path) is True
+    recorder.close()
+    assert os.path.exists(path) is False
+
+
+@pytest.mark.skipif(hasattr(signal, 'SIGUSR2') is False,
+                    reason='signal is not available')
+def test_signal_does_not_lock_the_writer(logger):
+    logger.configure(file=True, recorder=True, format='{message}\n')
+    recorder = logger.root.recorder
+    recorder.configure(signal=signal.SIGUSR2)
+    logger.debug('hidden')
+    path = f'{os.path.splitext(recorder.path)[0]}.flight.log'
+    # Signal comes while the file is being written.
+    with logger.root.file._lock:
+        os.kill(os.getpid(), signal.SIGUSR2)
+        time.sleep(0.1)
+    assert wait(lambda: os.path.exists(path)) is True
+    assert wait(lambda: 'hidden' in read(logger)) is True
+    recorder.close()
+    assert signal.getsignal(signal.SIGUSR2) is signal.SIG_DFL
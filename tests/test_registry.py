@@ -0,0 +1,81 @@
+"""Tests of the registry of loggers and of the exit."""
+
+import gc
+import itertools
+import time
+
+from pepperoni import all_loggers
+from pepperoni.cache import Registry
+from pepperoni.logger import Logger, _exit_all
+from pepperoni.output import Handles, handles
+
+names = itertools.count()
+
+
+class Owner():
+    """Output with the file handler."""
+
+    def release(self, blocking=True):
+        return True
+
+
+def test_strong_and_weak_names():
+    registry = Registry()
+    strong, weak = Owner(), Owner()
+    strong.name, weak.name = 'strong', 'weak'
+    registry.register(strong)
+    registry.register(weak, weak=True)
+    assert set(registry) == {'strong', 'weak'}
+    del weak
+    gc.collect()
+    assert list(registry) == ['strong']
+    assert len(registry) == 1
+    registry.register(strong, weak=True)
+    assert registry['strong'] is strong
+    del registry['strong']
+    assert len(registry) == 0
+
+
+def test_weak_logger_is_freed(tmp_path):
+    name = f'weak{next(names)}'
+    logger = Logger(name=name, console=False, directory=str(tmp_path),
+                    weak=True)
+    logger.configure(format='{message}\n')
+    logger.info('written')
+    path = logger.root.file.path
+    count = len(handles)
+    del logger
+    gc.collect()
+    assert name not in all_loggers
+    assert len(handles) == count - 1
+    with open(path) as fh:
+        assert fh.read() == 'written\n'
+
+
+def test_freed_owners_are_purged():
+    registry = Handles(maxsize=10)
+    owners = [Owner() for i in range(3)]
+    for owner in owners:
+        registry.touch(owner)
+    del owners[0]
+    gc.collect()
+    # Key of the freed owner is removed under the lock.
+    assert len(registry._owners) == 3
+    assert len(registry) == 2
+
+
+def test_exit_finishes_children_first(logger, monkeypatch):
+    child = logger.child('db')
+    finished = []
+    monkeypatch.setattr(Logger, '_finish',
+                        lambda self: finished.append(self.name))
+    _exit_all()
+    assert finished.index(child.name) < finished.index(logger.name)
+
+
+def test_exit_is_not_delayed_by_slow_logger(logger, monkeypatch):
+    monkeypatch.setattr(Logger, 'timeout', 0.2)
+    monkeypatch.setattr(Logger, '_finish', lambda self: time.sleep(5))
+    start = time.monotonic()
+    _exit_all()
+    assert time.monotonic() - start < 2
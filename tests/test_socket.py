@@ -0,0 +1,123 @@
+"""Tests of the socket output against the local collector."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from pepperoni.output import Socket
+
+
+class Collector():
+    """Local TCP collector reading octet-counted frames."""
+
+    def __init__(self, port=0):
+        self.messages = []
+        self.server = socket.create_server(('127.0.0.1', port))
+        self.address = self.server.getsockname()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                conn, address = self.server.accept()
+            except OSError:
+                return
+            with conn:
+                buffer = b''
+                while True:
+                    data = conn.recv(65536)
+                    if not data:
+                        break
+                    buffer += data
+                    while b' ' in buffer:
+                        length, rest = buffer.split(b' ', 1)
+                        if len(rest) < int(length):
+                            break
+                        self.messages.append(rest[:int(length)].decode())
+                        buffer = rest[int(length):]
+
+    def close(self):
+        self.server.close()
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while condition() is False and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_tcp_delivery(logger):
+    collector = Collector()
+    try:
+        output = Socket(logger.root, status=True, protocol='tcp',
+                        address=collector.address)
+        logger.root.add('socket', output)
+        for i in range(50):
+            logger.info(f'record {i}')
+        logger.flush()
+        assert wait(lambda: len(collector.messages) == 50) is True
+        assert collector.messages[0].startswith('<14>1 ')
+        assert collector.messages[-1].endswith('record 49')
+    finally:
+        collector.close()
+
+
+def test_udp_delivery(logger):
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(5)
+    try:
+        output = Socket(logger.root, status=True, protocol='udp',
+                        address=server.getsockname(), syslog=False)
+        logger.root.add('socket', output)
+        logger.warning('over udp')
+        data, address = server.recvfrom(65536)
+        assert data.decode().endswith('WARNING\tover udp')
+    finally:
+        server.close()
+
+
+def test_tcp_outage(logger):
+    # Take a free port and keep nothing listening on it.
+    probe = socket.create_server(('127.0.0.1', 0))
+    address = probe.getsockname()
+    probe.close()
+    output = Socket(logger.root, status=True, protocol='tcp',
+                    address=address, backoff=0.1)
+    logger.root.add('socket', output)
+    logger.info('sent after outage')
+    assert wait(lambda: output._failures > 0) is True
+    collector = Collector(port=address[1])
+    try:
+        assert wait(lambda: len(collector.messages) == 1) is True
+        assert collector.messages[0].endswith('sent after outage')
+    finally:
+        collector.close()
+
+
+def test_unnamed_logger_and_facility(logger):
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(5)
+    try:
+        output = Socket(logger.root, status=True, protocol='udp',
+                        address=server.getsockname(), facility='local0')
+        logger.root.add('socket', output)
+        child = logger.child('db')
+        child._name = None
+        child.info('unnamed')
+        data, address = server.recvfrom(65536)
+        assert data.decode().startswith('<134>1 ')
+        assert ' - unnamed' in data.decode()
+        assert data.decode().split(' ')[3] == '-'
+    finally:
+        server.close()
+    with pytest.raises(ValueError):
+        Socket(logger.root, facility='unknown')
+    with pytest.raises(ValueError):
+        output.configure(facility='unknown')
+    assert output.facility == 'local0'
@@ -0,0 +1,65 @@
+"""Tests of the outputs keeping undelivered data in the spool."""
+
+import json
+import uuid
+
+import pytest
+
+from pepperoni.output import Spooled
+
+
+class Backend(Spooled):
+    """Output delivering the values to the list."""
+
+    def __init__(self, root, status=True):
+        super().__init__(root, status=status)
+        self.received = []
+        self.down = False
+
+    def deliver(self, entries):
+        if self.down is True:
+            raise OSError('backend is down')
+        for values in entries:
+            if values.get('bad') is True:
+                raise ValueError('rejected')
+        self.received.extend(entries)
+
+    def encode(self, values):
+        return json.dumps(values).encode('utf-8')
+
+    def decode(self, entry):
+        return json.loads(entry)
+
+
+def test_values_are_delivered_as_they_are(logger):
+    output = Backend(logger.root)
+    key = uuid.uuid4()
+    output.put({'key': key, 'pair': (1, 2)})
+    assert output.received == [{'key': key, 'pair': (1, 2)}]
+    assert output.spool is None
+
+
+def test_spool_is_replayed_in_order(logger):
+    output = Backend(logger.root)
+    output.down = True
+    output.put({'i': 0})
+    assert output.pending is True
+    output.down = False
+    output.put({'i': 1})
+    assert output.received == []
+    assert output.drain() is True
+    assert output.received == [{'i': 0}, {'i': 1}]
+    assert output.pending is False
+
+
+def test_rejected_entries_are_dropped(logger):
+    output = Backend(logger.root)
+    with pytest.raises(ValueError):
+        output.put({'bad': True})
+    output.down = True
+    for values in ({'i': 0}, {'bad': True}, {'i': 2}):
+        output.put(values)
+    output.down = False
+    assert output.drain() is True
+    assert output.received == [{'i': 0}, {'i': 2}]
+    assert output.dropped == 1
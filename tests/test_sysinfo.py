@@ -0,0 +1,45 @@
+"""Tests of the process resources and their monitoring."""
+
+import time
+
+from pepperoni.record import Record
+from pepperoni.sysinfo import Resources
+
+
+def read(logger):
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def test_resources_are_cached():
+    resources = Resources(ttl=60)
+    values = resources.read()
+    assert resources.read() is values
+    assert values['threads'] >= 1
+    assert values['rss'] is None or values['rss'] > 0
+    resources.clear()
+    assert resources.read() is not values
+
+
+def test_resources_are_lazy_forms(logger):
+    record = Record(logger, 'info', 'message', format='{threads}')
+    assert 'threads' not in record.__dict__
+    assert int(str(record)) >= 1
+
+
+def test_monitor_and_sampler_run_together(logger):
+    logger.configure(file=True, format='{message}\n')
+    monitor = logger.monitor(interval=0.05)
+    sampler = logger.sample(rate=50, interval=60)
+    try:
+        time.sleep(0.2)
+        assert monitor.is_alive() is True
+        logger.sample(rate=50, interval=60)
+        assert monitor.is_alive() is True
+        assert sampler.is_alive() is False
+    finally:
+        logger._sampler.stop()
+        monitor.stop()
+        monitor.join()
+    assert 'RESOURCES rss=' in read(logger)
@@ -0,0 +1,74 @@
+"""Tests of the database table output."""
+
+import time
+import uuid
+
+import pytest
+import sqlalchemy as sql
+
+from pepperoni.database import Database
+
+
+@pytest.fixture
+def table(logger, tmp_path):
+    """Get the table output writing to the SQLite database."""
+    path = str(tmp_path / 'jobs.db')
+    engine = sql.create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        conn.execute(sql.text('create table jobs (id integer primary key, '
+                              'status text, progress integer)'))
+    logger.configure(table=True, db={'name': 'jobs',
+                                     'database': Database('sqlite',
+                                                          path=path)})
+    yield logger.root.table
+    engine.dispose()
+
+
+def rows(table):
+    conn = table.database.connect()
+    try:
+        query = sql.text('select id, status, progress from jobs order by id')
+        return [tuple(row) for row in conn.execute(query)]
+    finally:
+        conn.close()
+
+
+def test_each_write_without_interval(table):
+    table.write(status='start')
+    assert table.primary_key == 1
+    table.write(progress=1)
+    assert rows(table) == [(1, 'start', 1)]
+    table.new()
+    table.write(status='second')
+    assert rows(table) == [(1, 'start', 1), (2, 'second', None)]
+
+
+def test_updates_are_coalesced(logger, table):
+    logger.configure(db={'interval': 0.2})
+    assert table.interval == 0.2
+    table.write(status='start')
+    # The first values are inserted at once.
+    assert rows(table) == [(1, 'start', None)]
+    for i in range(5):
+        table.write(progress=i)
+    assert rows(table) == [(1, 'start', None)]
+    time.sleep(0.5)
+    assert rows(table) == [(1, 'start', 4)]
+    table.write(status='done')
+    table.new()
+    assert rows(table) == [(1, 'done', 4)]
+
+
+def test_merged_values_are_checked(logger, table):
+    logger.configure(db={'interval': 60})
+    table.write(status='start')
+    with pytest.raises(TypeError):
+        table.write(status=uuid.uuid4())
+    table.flush()
+    assert rows(table) == [(1, 'start', None)]
+
+
+def test_table_is_required_to_declare(logger, tmp_path):
+    database = Database('sqlite', path=str(tmp_path / 'other.db'))
+    with pytest.raises(TypeError):
+        logger.configure(db={'database': database})
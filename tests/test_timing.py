@@ -0,0 +1,56 @@
+"""Tests of the timers and their summaries."""
+
+from pepperoni.timing import Histogram
+
+
+def read(logger):
+    logger.root.file.flush()
+    with open(logger.root.file.path) as fh:
+        return fh.read()
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.add(value * 1000)
+    assert abs(histogram.percentile(0.5) - 500000) / 500000 < 0.07
+    assert abs(histogram.percentile(0.99) - 990000) / 990000 < 0.07
+    assert Histogram().percentile(0.5) is None
+
+
+def test_timer_and_timed(logger):
+    @logger.timed
+    def work():
+        return 'done'
+
+    @logger.timed(name='named')
+    def other():
+        pass
+    with logger.timer('block'):
+        pass
+    assert work() == 'done'
+    work()
+    other()
+    assert logger.timings['block'].count == 1
+    assert logger.timings[work.__qualname__].count == 2
+    assert logger.timings['named'].count == 1
+    assert work.__name__ == 'work'
+
+
+def test_summary_resets_timings(logger):
+    logger.configure(file=True, format='{message}\n')
+    with logger.timer('block'):
+        pass
+    logger.summary()
+    logger.summary()
+    lines = read(logger).splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith('TIMER block: count=1, total=')
+    assert logger.timings['block'].count == 0
+
+
+def test_periodic_summary(logger):
+    logger.configure(file=True, format='{message}\n', timing=0)
+    with logger.timer('block'):
+        pass
+    assert read(logger).startswith('TIMER block: count=1')
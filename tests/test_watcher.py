@@ -0,0 +1,89 @@
+"""Tests of the runtime reconfiguration."""
+
+import json
+import os
+import signal
+import time
+
+import pytest
+
+from pepperoni.watcher import Watcher
+
+
+def save(path, config):
+    with open(path, 'w') as fh:
+        json.dump(config, fh)
+
+
+def wait(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while condition() is False and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_apply_only_changes(logger, tmp_path):
+    path = str(tmp_path / 'config.json')
+    calls = []
+    new = logger.root.file.new
+    logger.root.file.new = lambda: calls.append(1) or new()
+    save(path, {'debug': True, 'file': True})
+    watcher = Watcher(logger, path, signals=False)
+    watcher.apply()
+    assert logger.filters['debug'] is True
+    assert logger.root.file.status is True
+    watcher.apply()
+    assert len(calls) == 1
+    save(path, {'debug': False, 'file': True})
+    watcher.apply()
+    assert logger.filters['debug'] is False
+    assert len(calls) == 1
+
+
+def test_bad_config_is_not_applied(logger, tmp_path):
+    path = str(tmp_path / 'config.json')
+    child = logger.child('db')
+    save(path, {'debug': True, 'loggers': {child.name: {'unknown': 1}}})
+    Watcher(logger, path, signals=False).apply()
+    assert logger.filters['debug'] is False
+
+
+def test_named_loggers(logger, tmp_path):
+    path = str(tmp_path / 'config.json')
+    child = logger.child('db')
+    save(path, {'loggers': {child.name: {'debug': True}}})
+    Watcher(logger, path, signals=False).apply()
+    assert child.filters['debug'] is True
+    assert logger.filters['debug'] is False
+
+
+def test_check_by_modification_time(logger, tmp_path):
+    path = str(tmp_path / 'config.json')
+    watcher = Watcher(logger, path, signals=False)
+    watcher.check()
+    save(path, {'debug': True})
+    watcher.check()
+    assert logger.filters['debug'] is True
+    logger.configure(debug=False)
+    watcher.check()
+    assert logger.filters['debug'] is False
+    save(path, {'debug': True, 'info': False})
+    os.utime(path, ns=(0, time.time_ns() + 1000000000))
+    watcher.check()
+    assert logger.filters['info'] is False
+
+
+@pytest.mark.skipif(hasattr(signal, 'SIGUSR1') is False,
+                    reason='signal is not available')
+def test_signal_forces_reload(logger, tmp_path):
+    path = str(tmp_path / 'config.json')
+    save(path, {})
+    watcher = logger.watch(path, interval=60)
+    try:
+        assert wait(lambda: watcher._mtime is not None) is True
+        save(path, {'debug': True})
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert wait(lambda: logger.filters['debug'] is True) is True
+    finally:
+        watcher.stop()
+    assert signal.getsignal(signal.SIGUSR1) is signal.SIG_DFL